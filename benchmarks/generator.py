@@ -0,0 +1,76 @@
+import random
+from typing import Any, Dict, Iterator, List
+
+CITIES: List[str] = ["Москва", "Санкт-Петербург", "Казань", "Новосибирск", "Екатеринбург", "Калининград"]
+TITLES: List[str] = ["Python разработчик", "Java Developer", "Data Scientist", "Аналитик данных",
+                     "Backend-разработчик", "Frontend Developer", "DevOps-инженер", "QA Engineer"]
+SKILLS: List[str] = ["Python", "Django", "SQL", "Docker", "Kubernetes", "Java", "Spring", "React", "Linux", "Git"]
+
+
+def make_item(number: int, rng: random.Random) -> Dict[str, Any]:
+    """
+    Создает одну вакансию в формате ответа hh.ru.
+
+    :param number: Порядковый номер вакансии, из него строится id.
+    :param rng: Генератор случайных чисел.
+    :return: Словарь с данными вакансии.
+    """
+    salary = None
+    if rng.random() < 0.7:
+        salary_from = rng.randrange(30, 400) * 1000 if rng.random() < 0.9 else None
+        salary_to = salary_from + rng.randrange(0, 150) * 1000 if salary_from and rng.random() < 0.6 else None
+        salary = {"from": salary_from, "to": salary_to, "currency": "RUR", "gross": False}
+    skill = rng.choice(SKILLS)
+    city_number = rng.randrange(len(CITIES))
+    vacancy_id = str(90000000 + number)
+    return {
+        "id": vacancy_id,
+        "name": f"{rng.choice(TITLES)} ({skill})",
+        "alternate_url": f"https://hh.ru/vacancy/{vacancy_id}",
+        "salary": salary,
+        "snippet": {
+            "requirement": f"Опыт работы с <highlighttext>{skill}</highlighttext> от {rng.randrange(1, 6)} лет.",
+            "responsibility": f"Разработка и поддержка сервисов на {rng.choice(SKILLS)}.",
+        },
+        "area": {"id": str(city_number + 1), "name": CITIES[city_number]},
+        "published_at": f"2024-05-{rng.randrange(1, 29):02d}T{rng.randrange(0, 24):02d}:00:00+0300",
+    }
+
+
+def iter_items(count: int, seed: int = 0) -> Iterator[Dict[str, Any]]:
+    """
+    Генерирует count вакансий в формате ответа hh.ru.
+
+    :param count: Количество вакансий.
+    :param seed: Начальное значение генератора случайных чисел.
+    :return: Итератор словарей с данными вакансий.
+    """
+    rng = random.Random(seed)
+    for number in range(count):
+        yield make_item(number, rng)
+
+
+def make_items(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    Создает список из count вакансий в формате ответа hh.ru.
+
+    :param count: Количество вакансий.
+    :param seed: Начальное значение генератора случайных чисел.
+    :return: Список словарей с данными вакансий.
+    """
+    return list(iter_items(count, seed))
+
+
+def make_page(items: List[Dict[str, Any]], page: int, per_page: int, found: int, pages: int) -> Dict[str, Any]:
+    """
+    Собирает страницу ответа /vacancies.
+
+    :param items: Вакансии страницы.
+    :param page: Номер страницы.
+    :param per_page: Размер страницы.
+    :param found: Общее количество найденных вакансий.
+    :param pages: Количество доступных страниц.
+    :return: Словарь в формате ответа hh.ru.
+    """
+    return {"items": items, "found": found, "pages": pages, "page": page, "per_page": per_page,
+            "clusters": None, "arguments": None, "alternate_url": "https://hh.ru/search/vacancy"}
@@ -0,0 +1,188 @@
+import argparse
+import json
+import os
+import platform
+import re
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.generator import make_items
+from benchmarks.stub_server import StubHHServer
+from config import ROOT_DIR
+from src.api import HHApi
+from src.bulk_import import import_pages
+from src.binary_worker import BinaryWorker
+from src.hh import HH
+from src.sharded_worker import ShardedWorker
+from src.vacancy import Vacancy
+from src.worker import JSONWorker
+
+DEFAULT_SIZES: List[int] = [1000, 10000, 100000]
+
+
+def project_version() -> str:
+    """
+    Версия проекта из pyproject.toml.
+
+    :return: Строка версии или "unknown".
+    """
+    with open(os.path.join(ROOT_DIR, "pyproject.toml"), encoding="utf-8") as f:
+        match = re.search(r'^version\s*=\s*"([^"]+)"', f.read(), re.MULTILINE)
+    return match.group(1) if match else "unknown"
+
+
+def measure(results: List[Dict[str, Any]], operation: str, size: int, func: Callable[[], Any],
+            items: Optional[Callable[[Any], int]] = None) -> Any:
+    """
+    Измеряет время выполнения функции и добавляет результат в список.
+
+    :param results: Список результатов.
+    :param operation: Название операции.
+    :param size: Размер набора данных.
+    :param func: Измеряемая функция без аргументов.
+    :param items: Функция, возвращающая по результату количество обработанных элементов,
+                  по умолчанию - size.
+    :return: Результат функции.
+    """
+    start = time.perf_counter()
+    value = func()
+    seconds = time.perf_counter() - start
+    count = size if items is None else items(value)
+    results.append({
+        "operation": operation,
+        "size": size,
+        "seconds": round(seconds, 6),
+        "items_per_second": round(count / seconds, 1) if seconds else None,
+    })
+    return value
+
+
+def bench_api(results: List[Dict[str, Any]], size: int, latency: float, max_workers: int) -> None:
+    """
+    Измеряет загрузку вакансий через HHApi и HH с локального сервера-заглушки.
+
+    :param results: Список результатов.
+    :param size: Количество вакансий в выдаче.
+    :param latency: Задержка ответа сервера в секундах.
+    :param max_workers: Количество потоков для загрузки страниц.
+    """
+    with StubHHServer(size, latency=latency) as server:
+        api = HHApi(max_workers=max_workers, url=server.url)
+        measure(results, "HHApi.get_vacancies", size, lambda: api.get_vacancies("python"), len)
+        measure(results, "HHApi.get_vacancies(all_pages)", size,
+                lambda: api.get_vacancies("python", all_pages=True), len)
+        parser = HH(None, max_workers=max_workers, url=server.url)
+        measure(results, "HH.load_vacancies", size, lambda: parser.load_vacancies("python"),
+                lambda _: len(parser.vacancies))
+
+
+def bench_storage(results: List[Dict[str, Any]], size: int, data_path: str) -> None:
+    """
+    Измеряет создание вакансий и операции JSONWorker, BinaryWorker и ShardedWorker.
+
+    :param results: Список результатов.
+    :param size: Количество вакансий.
+    :param data_path: Папка для временных файлов.
+    """
+    items = make_items(size)
+    vacancies = measure(results, "Vacancy.create_vacancies", size, lambda: Vacancy.create_vacancies(items))
+    worker = JSONWorker("bench_vacancies.json", data_path=data_path)
+    measure(results, "JSONWorker.add_vacancies", size, lambda: worker.add_vacancies(vacancies))
+    measure(results, "JSONWorker.return_list_vacancies", size, worker.return_list_vacancies)
+    measure(results, "JSONWorker.select_vacancy", size, lambda: worker.select_vacancy("python"))
+    measure(results, "JSONWorker.query", size, lambda: worker.query(["python", "data"], 100000, None, 10))
+    to_delete = vacancies[:min(100, size)]
+    measure(results, "JSONWorker.del_vacancy", size,
+            lambda: [worker.del_vacancy(vacancy) for vacancy in to_delete], len)
+
+    binary = BinaryWorker("bench_vacancies.bin", data_path=data_path, reset=True)
+    measure(results, "BinaryWorker.add_vacancies", size, lambda: binary.add_vacancies(vacancies))
+    measure(results, "BinaryWorker.select_by_salary", size, lambda: binary.select_by_salary(200000))
+    measure(results, "BinaryWorker.query", size, lambda: binary.query(["python", "data"], 100000, None, 10))
+
+    # Без пула и с пулом по числу ядер; первый просмотр включает запуск пула и чтение частей
+    for label, max_workers in (("serial", 1), ("pool", None)):
+        with ShardedWorker(f"bench_shards_{label}", data_path=data_path, partition="hash",
+                           max_workers=max_workers) as sharded:
+            measure(results, f"ShardedWorker.add_vacancies({label})", size, lambda: sharded.add_vacancies(vacancies))
+            for attempt in ("cold", "warm"):
+                measure(results, f"ShardedWorker.select_vacancy({label}, {attempt})", size,
+                        lambda: sharded.select_vacancy("python"))
+                measure(results, f"ShardedWorker.select_by_salary({label}, {attempt})", size,
+                        lambda: sharded.select_by_salary(200000))
+
+
+def bench_import(results: List[Dict[str, Any]], size: int, data_path: str) -> None:
+    """
+    Измеряет импорт сохраненных страниц выдачи без пула и с пулом процессов по числу ядер.
+
+    :param results: Список результатов.
+    :param size: Количество вакансий.
+    :param data_path: Папка для временных файлов.
+    """
+    items = make_items(size)
+    pages_path = os.path.join(data_path, f"bench_pages_{size}")
+    os.makedirs(pages_path, exist_ok=True)
+    for number, start in enumerate(range(0, size, 100)):
+        with open(os.path.join(pages_path, f"page_{number:05d}.json"), "w", encoding="utf-8") as f:
+            json.dump({"items": items[start:start + 100], "page": number}, f, ensure_ascii=False)
+    for label, max_workers in (("serial", 1), ("pool", None)):
+        store = JSONWorker(f"bench_import_{label}.json", data_path=data_path)
+        measure(results, f"bulk_import.import_pages({label})", size,
+                lambda: import_pages(pages_path, store, max_workers=max_workers), lambda report: report["parsed"])
+
+
+def run(sizes: List[int], latency: float, max_workers: int, skip_api: bool = False) -> Dict[str, Any]:
+    """
+    Запускает все замеры.
+
+    :param sizes: Размеры наборов данных.
+    :param latency: Задержка ответа сервера-заглушки в секундах.
+    :param max_workers: Количество потоков для загрузки страниц.
+    :param skip_api: Не измерять загрузку по HTTP.
+    :return: Словарь с описанием окружения и результатами замеров.
+    """
+    results: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory() as data_path:
+        for size in sizes:
+            if not skip_api:
+                bench_api(results, size, latency, max_workers)
+            bench_storage(results, size, data_path)
+            bench_import(results, size, data_path)
+    return {
+        "version": project_version(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "latency": latency,
+        "max_workers": max_workers,
+        "results": results,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Точка входа: python -m benchmarks.run --sizes 1000,10000 --output bench.json
+    """
+    parser = argparse.ArgumentParser(description="Замеры производительности поиска и хранения вакансий")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="размеры наборов данных через запятую, например 1000,10000,1000000")
+    parser.add_argument("--latency", type=float, default=0.05, help="задержка ответа сервера-заглушки, с")
+    parser.add_argument("--workers", type=int, default=8, help="количество потоков загрузки страниц")
+    parser.add_argument("--skip-api", action="store_true", help="не измерять загрузку по HTTP")
+    parser.add_argument("--output", help="файл для сохранения результатов в JSON, по умолчанию stdout")
+    args = parser.parse_args(argv)
+
+    report = run([int(size) for size in args.sizes.split(",")], args.latency, args.workers, args.skip_api)
+    text = json.dumps(report, ensure_ascii=False, indent=4)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        sys.stdout.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+from benchmarks.generator import make_items
+from config import ROOT_DIR
+from src.vacancy import Vacancy
+from src.worker import JSONWorker
+
+# Целевое время холодного офлайн-запроса
+TARGET_SECONDS: float = 0.1
+
+
+def time_command(command: List[str], runs: int) -> List[float]:
+    """
+    Измеряет время выполнения команды в отдельном процессе.
+
+    Замер идет с кэшем байт-кода, как при обычных запусках программы:
+    PYTHONDONTWRITEBYTECODE снимается, а первый, непрогретый запуск,
+    который компилирует модули и пишет файлы .pyc, не учитывается.
+
+    :param command: Команда с аргументами.
+    :param runs: Количество запусков.
+    :return: Время каждого запуска в секундах.
+    """
+    env = {key: value for key, value in os.environ.items() if key != "PYTHONDONTWRITEBYTECODE"}
+    subprocess.run(command, cwd=ROOT_DIR, check=True, stdout=subprocess.DEVNULL, env=env)
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=ROOT_DIR, check=True, stdout=subprocess.DEVNULL, env=env)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def summary(timings: List[float]) -> Dict[str, float]:
+    """
+    Сводка по замерам.
+
+    :param timings: Время запусков в секундах.
+    :return: Минимум, медиана и максимум.
+    """
+    return {"min": round(min(timings), 4), "median": round(statistics.median(timings), 4),
+            "max": round(max(timings), 4)}
+
+
+def run(size: int, runs: int) -> Dict[str, Any]:
+    """
+    Измеряет время запуска интерпретатора и офлайн-запроса python main.py --offline.
+
+    :param size: Количество вакансий в хранилище.
+    :param runs: Количество запусков каждой команды.
+    :return: Словарь с результатами замеров.
+    """
+    with tempfile.TemporaryDirectory() as data_path:
+        JSONWorker("vacancies.json", data_path=data_path).add_vacancies(Vacancy.create_vacancies(make_items(size)))
+        store_path = os.path.join(data_path, "vacancies.json")
+        interpreter = time_command([sys.executable, "-c", "pass"], runs)
+        offline = time_command([sys.executable, "main.py", "--offline", "--store", store_path,
+                                "--keywords", "python", "--salary", "100000", "--top", "10"], runs)
+    return {
+        "size": size,
+        "runs": runs,
+        "python": summary(interpreter),
+        "offline_query": summary(offline),
+        "target": TARGET_SECONDS,
+        "within_target": statistics.median(offline) < TARGET_SECONDS,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Точка входа: python -m benchmarks.startup --size 1000 --runs 10
+    """
+    parser = argparse.ArgumentParser(description="Замер времени холодного запуска офлайн-запроса")
+    parser.add_argument("--size", type=int, default=1000, help="количество вакансий в хранилище")
+    parser.add_argument("--runs", type=int, default=10, help="количество запусков")
+    args = parser.parse_args(argv)
+    sys.stdout.write(json.dumps(run(args.size, args.runs), ensure_ascii=False, indent=4) + "\n")
+
+
+if __name__ == "__main__":
+    main()
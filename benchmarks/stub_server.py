@@ -0,0 +1,134 @@
+import hashlib
+import json
+import math
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List
+from urllib.parse import parse_qs, urlparse
+
+from benchmarks.generator import make_items, make_page
+from src.api import MAX_DEPTH
+
+
+class StubHHServer:
+    """
+    Локальный HTTP-сервер, имитирующий метод /vacancies API hh.ru.
+
+    Поддерживает параметры page и per_page, ограничение глубины выдачи,
+    заголовки ETag/If-None-Match и искусственную задержку ответа.
+    Считает запросы и наибольшее количество одновременно обрабатываемых запросов.
+    """
+
+    def __init__(self, count: int, latency: float = 0.0, seed: int = 0) -> None:
+        """
+        Инициализация сервера.
+
+        :param count: Количество вакансий в выдаче.
+        :param latency: Задержка каждого ответа в секундах.
+        :param seed: Начальное значение генератора вакансий.
+        """
+        self.items: List[Dict[str, Any]] = make_items(min(count, MAX_DEPTH), seed)
+        self.found: int = count
+        self.latency: float = latency
+        self.requests: int = 0
+        self.active: int = 0
+        self.peak_active: int = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        """
+        Адрес метода /vacancies на запущенном сервере.
+        """
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/vacancies"
+
+    def page(self, page: int, per_page: int) -> Dict[str, Any]:
+        """
+        Формирует ответ для страницы выдачи.
+
+        :param page: Номер страницы.
+        :param per_page: Размер страницы.
+        :return: Словарь в формате ответа hh.ru.
+        """
+        pages = math.ceil(min(self.found, MAX_DEPTH) / per_page)
+        items = self.items[page * per_page:(page + 1) * per_page]
+        return make_page(items, page, per_page, self.found, pages)
+
+    def _make_handler(self) -> type:
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Заголовки и тело пишутся отдельно, без этого keep-alive упирается в задержку ACK
+            disable_nagle_algorithm = True
+
+            def do_GET(self) -> None:
+                with stub._lock:
+                    stub.requests += 1
+                    stub.active += 1
+                    stub.peak_active = max(stub.peak_active, stub.active)
+                try:
+                    self._handle()
+                finally:
+                    with stub._lock:
+                        stub.active -= 1
+
+            def _handle(self) -> None:
+                parsed = urlparse(self.path)
+                if parsed.path.rstrip("/") != "/vacancies":
+                    self.send_error(404)
+                    return
+                query = parse_qs(parsed.query)
+                page = int(query.get("page", ["0"])[0])
+                per_page = int(query.get("per_page", ["20"])[0])
+                if (page + 1) * per_page > MAX_DEPTH:
+                    self._send(400, json.dumps({"errors": [{"type": "bad_argument", "value": "page"}]}).encode())
+                    return
+                body = json.dumps(stub.page(page, per_page), ensure_ascii=False).encode("utf-8")
+                etag = '"' + hashlib.md5(body).hexdigest() + '"'
+                time.sleep(stub.latency)
+                if self.headers.get("If-None-Match") == etag:
+                    self._send(304, b"", etag)
+                else:
+                    self._send(200, body, etag)
+
+            def _send(self, status: int, body: bytes, etag: str = "") -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                if etag:
+                    self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        return Handler
+
+    def start(self) -> 'StubHHServer':
+        """
+        Запускает сервер в фоновом потоке.
+
+        :return: Этот же объект сервера.
+        """
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """
+        Останавливает сервер.
+        """
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> 'StubHHServer':
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
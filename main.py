@@ -1,5 +1,93 @@
-from src.utils import user_interaction
+import argparse
+from typing import List, Optional
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Разбор аргументов командной строки.
+
+    :param argv: Список аргументов, по умолчанию - sys.argv.
+    :return: Разобранные аргументы.
+    """
+    parser = argparse.ArgumentParser(description="Поиск вакансий на hh.ru")
+    parser.add_argument("--batch", metavar="FILE",
+                        help="выполнить без диалога все запросы из файла JSON или CSV")
+    parser.add_argument("--output-dir", help="папка для результатов пакетного режима")
+    parser.add_argument("--workers", type=int, help="количество процессов пакетного режима и импорта")
+    parser.add_argument("--sync", metavar="QUERY", action="append",
+                        help="обновить data/vacancies.json только новыми вакансиями по запросу, можно повторять")
+    parser.add_argument("--import", dest="import_dir", metavar="DIR",
+                        help="загрузить в data/vacancies.json сохраненные ответы hh.ru из папки DIR")
+    parser.add_argument("--profile", action="store_true",
+                        help="вывести разбивку времени по этапам после поиска")
+    parser.add_argument("--offline", action="store_true",
+                        help="без диалога и без обращения к hh.ru выбрать вакансии из сохраненного хранилища")
+    parser.add_argument("--keywords", nargs="*", default=[], metavar="WORD",
+                        help="ключевые слова для офлайн-режима")
+    parser.add_argument("--salary", type=int, default=0, help="желаемая зарплата для офлайн-режима")
+    parser.add_argument("--top", type=int, default=10, help="количество вакансий для вывода в офлайн-режиме")
+    parser.add_argument("--store", metavar="FILE",
+                        help="файл хранилища для офлайн-режима, по умолчанию data/vacancies.json")
+    parser.add_argument("--pstats", metavar="FILE",
+                        help="вместе с --profile сохранить профиль cProfile в FILE")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Точка входа программы.
+
+    :param argv: Список аргументов, по умолчанию - sys.argv.
+    """
+    args = parse_args(argv)
+    # Режимы импортируются по мере надобности, чтобы офлайн-запрос запускался быстро
+    if args.batch:
+        def run() -> None:
+            from src.batch_search import batch_interaction
+            batch_kwargs = {"output_dir": args.output_dir} if args.output_dir else {}
+            batch_interaction(args.batch, max_workers=args.workers, **batch_kwargs)
+    elif args.sync:
+        def run() -> None:
+            from src.sync import sync_interaction
+            sync_interaction(args.sync)
+    elif args.import_dir:
+        def run() -> None:
+            from src.bulk_import import import_interaction
+            import_interaction(args.import_dir, max_workers=args.workers)
+    elif args.offline:
+        def run() -> None:
+            from src.utils import offline_interaction
+            store_kwargs = {"store_path": args.store} if args.store else {}
+            offline_interaction(args.keywords, args.salary, args.top, **store_kwargs)
+    else:
+        def run() -> None:
+            from src.utils import user_interaction
+            user_interaction()
+    if not args.profile:
+        run()
+        return
+
+    import cProfile
+    import pstats
+
+    from src.profiling import metrics
+
+    metrics.enabled = True
+    profiler = cProfile.Profile() if args.pstats else None
+    if profiler is not None:
+        profiler.enable()
+    try:
+        run()
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(args.pstats)
+        print("\nРазбивка времени по этапам:")
+        print(metrics.report())
+        if profiler is not None:
+            print(f"\nПрофиль cProfile сохранен в {args.pstats}, самые затратные функции:")
+            pstats.Stats(profiler).sort_stats("cumulative").print_stats(15)
 
 
 if __name__ == "__main__":
-    user_interaction()
\ No newline at end of file
+    main()
@@ -1,6 +1,137 @@
-import requests
+import math
+import threading
 from abc import ABC, abstractmethod
-from typing import List, Dict
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, List, Dict, Any, Callable, Deque, Iterator, Optional
+from src.cache import ResponseCache
+from src.profiling import instrumented, timer
+
+if TYPE_CHECKING:
+    import requests
+
+# hh.ru отдает не более 2000 вакансий на один запрос (20 страниц по 100)
+MAX_DEPTH: int = 2000
+DEFAULT_MAX_WORKERS: int = 8
+
+_session: Optional['requests.Session'] = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> 'requests.Session':
+    """
+    Возвращает общую HTTP-сессию с пулом keep-alive соединений.
+
+    Модуль requests импортируется здесь, при первом сетевом запросе,
+    а не при импорте модуля: он заметно замедляет запуск программы.
+
+    :return: Объект requests.Session, общий для всех клиентов API.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                import requests
+                session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=DEFAULT_MAX_WORKERS * 2)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _session = session
+    return _session
+
+
+def get_json(url: str, params: Dict[str, Any], headers: Optional[Dict[str, str]] = None,
+             cache: Optional[ResponseCache] = None) -> Dict[str, Any]:
+    """
+    Выполняет GET-запрос через общую сессию с учетом кэша ответов.
+
+    Свежая запись кэша отдается без обращения к серверу. Устаревшая запись
+    перепроверяется заголовком If-None-Match, и при ответе 304 используется
+    сохраненное тело. Ответ 304 без записи в кэше считается промахом,
+    запрос повторяется без If-None-Match.
+
+    :param url: URL запроса.
+    :param params: Параметры запроса.
+    :param headers: Дополнительные заголовки запроса.
+    :param cache: Кэш ответов или None, чтобы не использовать кэш.
+    :return: Разобранное тело ответа.
+    """
+    if cache is None:
+        with timer("http.request"):
+            response = get_session().get(url, params=params, headers=headers)
+        with timer("http.parse_json"):
+            return response.json()
+    entry = cache.get(url, params)
+    if entry is not None and cache.is_fresh(entry):
+        cache.record("hits")
+        return entry["body"]
+    request_headers: Dict[str, str] = dict(headers or {})
+    if entry is not None and entry.get("etag"):
+        request_headers["If-None-Match"] = entry["etag"]
+    with timer("http.request"):
+        response = get_session().get(url, params=params, headers=request_headers)
+    if response.status_code == 304 and entry is not None:
+        cache.record("revalidated")
+        cache.refresh(url, params, entry)
+        return entry["body"]
+    if response.status_code == 304:
+        # Сохраненного тела нет (условие пришло в headers вызывающего): повторяем запрос без условия
+        request_headers = {name: value for name, value in request_headers.items()
+                           if name.lower() != "if-none-match"}
+        with timer("http.request"):
+            response = get_session().get(url, params=params, headers=request_headers)
+    cache.record("misses")
+    with timer("http.parse_json"):
+        body: Dict[str, Any] = response.json()
+    if response.status_code == 200:
+        cache.put(url, params, body, response.headers.get("ETag"))
+    return body
+
+
+def iter_pages(fetch_page: Callable[[int], Dict[str, Any]], per_page: int = 100,
+               max_workers: int = DEFAULT_MAX_WORKERS) -> Iterator[Dict[str, Any]]:
+    """
+    Загружает страницы выдачи и отдает их по одной в порядке номеров.
+
+    Первая страница загружается сразу и отдается до загрузки остальных.
+    Количество страниц определяется по полям pages/found первого ответа
+    с учетом ограничения глубины выдачи hh.ru. Остальные страницы
+    загружаются параллельно, при этом одновременно в памяти находится
+    не больше max_workers загруженных, но еще не отданных страниц.
+
+    :param fetch_page: Функция, возвращающая ответ API для номера страницы.
+    :param per_page: Количество вакансий на странице.
+    :param max_workers: Максимальное количество потоков для загрузки.
+    :return: Итератор ответов API в порядке номеров страниц.
+    """
+    first_page: Dict[str, Any] = fetch_page(0)
+    yield first_page
+    found: int = min(int(first_page.get("found", MAX_DEPTH)), MAX_DEPTH)
+    pages: int = min(int(first_page.get("pages", 1)), math.ceil(found / per_page))
+    if pages <= 1:
+        return
+    with ThreadPoolExecutor(max_workers=min(max_workers, pages - 1)) as executor:
+        window: Deque[Future] = deque()
+        for page in range(1, pages):
+            window.append(executor.submit(fetch_page, page))
+            if len(window) >= max_workers:
+                yield window.popleft().result()
+        while window:
+            yield window.popleft().result()
+
+
+def fetch_all_pages(fetch_page: Callable[[int], Dict[str, Any]], per_page: int = 100,
+                    max_workers: int = DEFAULT_MAX_WORKERS) -> List[Dict[str, Any]]:
+    """
+    Загружает все страницы выдачи: первую последовательно, остальные параллельно.
+
+    :param fetch_page: Функция, возвращающая ответ API для номера страницы.
+    :param per_page: Количество вакансий на странице.
+    :param max_workers: Максимальное количество потоков для загрузки.
+    :return: Список ответов API в порядке номеров страниц.
+    """
+    return list(iter_pages(fetch_page, per_page, max_workers))
+
 
 class BaseAPI(ABC):
     """
@@ -24,28 +155,75 @@ class HHApi(BaseAPI):
 
     Используется для поиска вакансий по заданному ключевому слову.
     """
-    def __init__(self):
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS, cache: Optional[ResponseCache] = None,
+                 url: str = "http://api.hh.ru/vacancies/"):
         """
         Инициализация HHApi.
 
         Устанавливает URL и параметры по умолчанию для запросов.
+
+        :param max_workers: Максимальное количество потоков для постраничной загрузки.
+        :param cache: Кэш ответов API или None, чтобы всегда обращаться к серверу.
+        :param url: Адрес метода поиска вакансий.
         """
-        self.url: str = "http://api.hh.ru/vacancies/"
+        self.url: str = url
         self.params: Dict[str, str] = {'text': '', 'page': 0, 'per_page': 100}
+        self.max_workers: int = max_workers
+        self.cache: Optional[ResponseCache] = cache
+        # Значение found из первой страницы последней выдачи iter_vacancies
+        self.last_found: Optional[int] = None
 
-    def get_vacancies(self, keyword: str) -> List[Dict[str, str]]:
+    @instrumented("HHApi.get_page")
+    def get_page(self, keyword: str, page: int, extra_params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Получает одну страницу выдачи.
+
+        :param keyword: Ключевое слово для поиска вакансий.
+        :param page: Номер страницы.
+        :param extra_params: Дополнительные параметры запроса, например date_from.
+        :return: Ответ API для страницы.
+        """
+        params: Dict[str, Any] = dict(self.params, **(extra_params or {}), text=keyword, page=page)
+        return get_json(self.url, params, cache=self.cache)
+
+    def get_vacancies(self, keyword: str, all_pages: bool = False) -> List[Dict[str, str]]:
         """
         Получает вакансии по заданному ключевому слову.
 
         :param keyword: Ключевое слово для поиска вакансий.
+        :param all_pages: Загрузить все страницы выдачи параллельно, а не только первую.
         :return: Список словарей с данными о вакансиях.
         """
         self.params.update({'text': keyword})
-        response = requests.get(self.url, params=self.params)
-        return response.json()["items"]
+        if not all_pages:
+            return self.get_page(keyword, 0)["items"]
+        pages = fetch_all_pages(lambda page: self.get_page(keyword, page),
+                                int(self.params['per_page']), self.max_workers)
+        return [item for page in pages for item in page["items"]]
+
+    def iter_vacancies(self, keyword: str,
+                       extra_params: Optional[Dict[str, Any]] = None) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Постранично отдает вакансии по заданному ключевому слову.
+
+        Первая страница отдается сразу после получения, следующие
+        загружаются в фоне, пока вызывающий код обрабатывает предыдущие.
+        Общее количество найденных вакансий сохраняется в last_found: если оно
+        больше MAX_DEPTH, выдача неполная.
+
+        :param keyword: Ключевое слово для поиска вакансий.
+        :param extra_params: Дополнительные параметры запроса, например date_from.
+        :return: Итератор списков словарей с данными о вакансиях, по одному на страницу.
+        """
+        pages = iter_pages(lambda page: self.get_page(keyword, page, extra_params),
+                           int(self.params['per_page']), self.max_workers)
+        self.last_found = None
+        for page in pages:
+            if self.last_found is None:
+                self.last_found = int(page.get("found", 0))
+            yield page.get("items", [])
 
 if __name__ == "__main__":
     my_api: HHApi = HHApi()
     response: List[Dict[str, str]] = my_api.get_vacancies("крановщик")
     print(response)
-
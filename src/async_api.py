@@ -0,0 +1,228 @@
+import asyncio
+import random
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+import requests
+
+from src.api import BaseAPI, MAX_DEPTH, get_session
+from src.profiling import metrics
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class HHApiError(Exception):
+    """
+    Ошибка запроса к API hh.ru, которую нельзя исправить повтором.
+    """
+
+    def __init__(self, status_code: int, body: str) -> None:
+        super().__init__(f"API hh.ru вернул {status_code}: {body[:200]}")
+        self.status_code: int = status_code
+
+
+class TokenBucket:
+    """
+    Ограничитель частоты запросов "корзина с токенами" с адаптивной скоростью.
+
+    После ответа 429 скорость уменьшается вдвое, а выдача токенов
+    приостанавливается на время из Retry-After. После каждого успешного
+    ответа скорость понемногу растет обратно до максимальной.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None, min_rate: float = 0.5,
+                 increase: float = 0.1) -> None:
+        """
+        Инициализация ограничителя.
+
+        :param rate: Максимальная скорость, запросов в секунду.
+        :param capacity: Размер корзины (допустимый всплеск), по умолчанию равен rate.
+        :param min_rate: Минимальная скорость после снижений.
+        :param increase: Прибавка к скорости после успешного запроса.
+        """
+        self.max_rate: float = rate
+        self.rate: float = rate
+        self.capacity: float = capacity or max(rate, 1.0)
+        self.min_rate: float = min_rate
+        self.increase: float = increase
+        self.tokens: float = self.capacity
+        self.paused_until: float = 0.0
+        self._updated: float = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        """
+        Дождаться токена на один запрос.
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+                self._refill(now)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def on_throttle(self, retry_after: Optional[float] = None) -> None:
+        """
+        Снизить скорость после ответа 429.
+
+        :param retry_after: Пауза из заголовка Retry-After в секундах или None.
+        """
+        self._refill(time.monotonic())
+        self.rate = max(self.min_rate, self.rate / 2)
+        self.tokens = min(self.tokens, 0.0)
+        if retry_after:
+            self.paused_until = max(self.paused_until, time.monotonic() + retry_after)
+
+    def on_success(self) -> None:
+        """
+        Немного увеличить скорость после успешного запроса.
+        """
+        if self.rate < self.max_rate:
+            self._refill(time.monotonic())
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 30.0) -> float:
+    """
+    Задержка перед повтором: экспоненциальная с полным случайным разбросом.
+
+    :param attempt: Номер повтора, начиная с 0.
+    :param base: Базовая задержка в секундах.
+    :param cap: Максимальная задержка в секундах.
+    :return: Случайная задержка от 0 до min(cap, base * 2^attempt).
+    """
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Разбирает заголовок Retry-After, заданный в секундах.
+
+    :param value: Значение заголовка или None.
+    :return: Пауза в секундах или None.
+    """
+    try:
+        return max(0.0, float(value)) if value else None
+    except ValueError:
+        return None
+
+
+class AsyncHHApi(BaseAPI):
+    """
+    Асинхронный клиент API HeadHunter для большого числа одновременных запросов.
+
+    Количество одновременных запросов ограничено семафором, частота -
+    адаптивной корзиной токенов. Ответы 429 и 5xx, таймауты и ошибки
+    соединения повторяются с экспоненциальной задержкой со случайным разбросом.
+    HTTP-запросы выполняются в потоках через общую keep-alive сессию.
+    """
+
+    def __init__(self, concurrency: int = 8, rate: float = 5.0, max_retries: int = 5, timeout: float = 10.0,
+                 backoff_base: float = 0.5, url: str = "https://api.hh.ru/vacancies") -> None:
+        """
+        Инициализация AsyncHHApi.
+
+        :param concurrency: Максимальное количество одновременных запросов.
+        :param rate: Максимальная частота запросов в секунду.
+        :param max_retries: Количество повторов одного запроса.
+        :param timeout: Таймаут одного запроса в секундах.
+        :param backoff_base: Базовая задержка перед повтором в секундах.
+        :param url: Адрес метода поиска вакансий.
+        """
+        self.url: str = url
+        self.params: Dict[str, Any] = {'text': '', 'page': 0, 'per_page': 100}
+        self.concurrency: int = concurrency
+        self.bucket: TokenBucket = TokenBucket(rate)
+        self.max_retries: int = max_retries
+        self.timeout: float = timeout
+        self.backoff_base: float = backoff_base
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def fetch_page(self, keyword: str, page: int) -> Dict[str, Any]:
+        """
+        Получает одну страницу выдачи с ограничением частоты и повторами.
+
+        :param keyword: Ключевое слово для поиска вакансий.
+        :param page: Номер страницы.
+        :return: Ответ API для страницы.
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        params = dict(self.params, text=keyword, page=page)
+        for attempt in range(self.max_retries + 1):
+            retry_after: Optional[float] = None
+            async with self._semaphore:
+                await self.bucket.acquire()
+                try:
+                    response = await asyncio.to_thread(get_session().get, self.url, params=params,
+                                                       timeout=self.timeout)
+                except (requests.Timeout, requests.ConnectionError):
+                    metrics.count("AsyncHHApi.network_errors")
+                    if attempt == self.max_retries:
+                        raise
+                    response = None
+            if response is not None:
+                if response.status_code == 200:
+                    self.bucket.on_success()
+                    return response.json()
+                if response.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                    raise HHApiError(response.status_code, response.text)
+                if response.status_code == 429:
+                    metrics.count("AsyncHHApi.throttled")
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                    self.bucket.on_throttle(retry_after)
+            await asyncio.sleep(max(retry_after or 0.0, backoff_delay(attempt, self.backoff_base)))
+        raise AssertionError("unreachable")
+
+    async def aget_vacancies(self, keyword: str, all_pages: bool = True) -> List[Dict[str, Any]]:
+        """
+        Асинхронно получает вакансии по заданному ключевому слову.
+
+        :param keyword: Ключевое слово для поиска вакансий.
+        :param all_pages: Загрузить все страницы выдачи, а не только первую.
+        :return: Список словарей с данными о вакансиях в порядке страниц.
+        """
+        first_page = await self.fetch_page(keyword, 0)
+        pages = [first_page]
+        if all_pages:
+            per_page = int(self.params['per_page'])
+            found = min(int(first_page.get("found", MAX_DEPTH)), MAX_DEPTH)
+            count = min(int(first_page.get("pages", 1)), -(-found // per_page))
+            pages += await asyncio.gather(*(self.fetch_page(keyword, page) for page in range(1, count)))
+        return [item for page in pages for item in page.get("items", [])]
+
+    async def search_many(self, keywords: Iterable[str], all_pages: bool = True) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Выполняет поиск по многим ключевым словам одновременно.
+
+        :param keywords: Ключевые слова для поиска вакансий.
+        :param all_pages: Загружать все страницы выдачи каждого запроса.
+        :return: Словарь ключевое слово -> список вакансий.
+        """
+        keywords = list(keywords)
+        results = await asyncio.gather(*(self.aget_vacancies(keyword, all_pages) for keyword in keywords))
+        return dict(zip(keywords, results))
+
+    def get_vacancies(self, keyword: str, all_pages: bool = False) -> List[Dict[str, Any]]:
+        """
+        Получает вакансии по заданному ключевому слову (синхронная обертка).
+
+        :param keyword: Ключевое слово для поиска вакансий.
+        :param all_pages: Загрузить все страницы выдачи, а не только первую.
+        :return: Список словарей с данными о вакансиях.
+        """
+        # Примитивы asyncio привязаны к циклу событий, asyncio.run создает новый
+        self._semaphore = None
+        self.bucket._lock = None
+        return asyncio.run(self.aget_vacancies(keyword, all_pages))
@@ -0,0 +1,216 @@
+import csv
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import DATA_PATH
+from src.api import DEFAULT_MAX_WORKERS, HHApi
+from src.cache import ResponseCache
+from src.utils import filter_vacancies, top_vacancies
+from src.vacancy import Vacancy
+from src.worker import JSONWorker
+
+# Общий лимит одновременных запросов к hh.ru на весь пакет, а не на каждый процесс
+MAX_CONCURRENT_REQUESTS: int = DEFAULT_MAX_WORKERS
+
+
+class SearchQuery:
+    """
+    Сохраненный поисковый запрос для пакетного режима.
+
+    Attributes:
+        name (str): Имя запроса, используется для файла с результатами.
+        query (str): Поисковый запрос к hh.ru.
+        keywords (List[str]): Ключевые слова для фильтрации по названию, требованиям и обязанностям.
+        salary (int): Желаемая зарплата.
+        top_n (int): Количество вакансий в результате.
+    """
+
+    def __init__(self, name: str, query: str, keywords: Optional[List[str]] = None, salary: int = 0,
+                 top_n: int = 10) -> None:
+        self.name: str = name
+        self.query: str = query
+        self.keywords: List[str] = keywords or []
+        self.salary: int = salary
+        self.top_n: int = top_n
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'SearchQuery':
+        """
+        Создает запрос из словаря (строки JSON или CSV).
+
+        Ключевые слова можно передать списком или строкой через пробел.
+
+        :param data: Словарь с полями query, name, keywords, salary, top_n.
+        :return: Объект SearchQuery.
+        """
+        keywords = data.get("keywords") or []
+        if isinstance(keywords, str):
+            keywords = keywords.split()
+        return cls(
+            name=data.get("name") or data["query"],
+            query=data["query"],
+            keywords=keywords,
+            salary=int(data.get("salary") or 0),
+            top_n=int(data.get("top_n") or 10)
+        )
+
+
+def load_queries(file_path: str) -> List[SearchQuery]:
+    """
+    Загружает запросы из файла JSON (список объектов) или CSV (с заголовком).
+
+    :param file_path: Путь к файлу с запросами.
+    :return: Список запросов.
+    """
+    with open(file_path, encoding="utf-8") as f:
+        if file_path.lower().endswith(".csv"):
+            rows: List[Dict[str, Any]] = list(csv.DictReader(f))
+        else:
+            rows = json.load(f)
+    return [SearchQuery.from_dict(row) for row in rows]
+
+
+def _row(vacancy: Vacancy) -> tuple:
+    """
+    Аргументы конструктора Vacancy в порядке полей.
+
+    Процесс пула возвращает найденные вакансии кортежами: кортеж без имен полей
+    передается между процессами быстрее словаря, а родительский процесс создает
+    из него вакансию без повторного разбора словаря.
+
+    :param vacancy: Вакансия.
+    :return: Кортеж аргументов Vacancy.
+    """
+    return tuple(getattr(vacancy, name) for name in Vacancy.__slots__)
+
+
+def run_search(search: SearchQuery, url: Optional[str] = None, cache_dir: Optional[str] = None,
+               max_threads: int = DEFAULT_MAX_WORKERS) -> Tuple[SearchQuery, List[tuple], List[Dict[str, Any]]]:
+    """
+    Выполняет один поиск: загрузку всех страниц, фильтрацию и выбор лучших вакансий.
+
+    Функция запускается в отдельном процессе, поэтому принимает и возвращает
+    только сериализуемые данные. Повторы по URL (вакансия, сдвинувшаяся между
+    страницами выдачи) убираются здесь же, до передачи в родительский процесс.
+
+    :param search: Поисковый запрос.
+    :param url: Адрес метода поиска вакансий или None для hh.ru.
+    :param cache_dir: Папка кэша ответов API или None без кэша.
+    :param max_threads: Количество потоков для загрузки страниц в этом процессе.
+    :return: Запрос, найденные вакансии без повторов кортежами аргументов Vacancy
+             и лучшие вакансии в виде словарей.
+    """
+    api_kwargs: Dict[str, Any] = {"cache": ResponseCache(cache_dir) if cache_dir else None,
+                                  "max_workers": max_threads}
+    if url:
+        api_kwargs["url"] = url
+    api = HHApi(**api_kwargs)
+    found: Dict[str, Vacancy] = {}
+    for page in api.iter_vacancies(search.query.lower()):
+        for vacancy in Vacancy.iter_create(page):
+            found[vacancy.url] = vacancy
+    vacancies = list(found.values())
+    top = top_vacancies(filter_vacancies(vacancies, search.keywords, search.salary), search.top_n)
+    return search, [_row(vacancy) for vacancy in vacancies], [vacancy.to_dict() for vacancy in top]
+
+
+def result_file_name(name: str) -> str:
+    """
+    Имя файла с результатами запроса.
+
+    :param name: Имя запроса.
+    :return: Безопасное имя файла.
+    """
+    return re.sub(r"[^\w-]+", "_", name).strip("_") + ".json"
+
+
+def check_unique_names(queries: List[SearchQuery]) -> None:
+    """
+    Проверяет, что результаты запросов не перезапишут друг друга.
+
+    :param queries: Список запросов.
+    :raises ValueError: Если у запросов совпадают имена или имена файлов с результатами.
+    """
+    names: Dict[str, str] = {}
+    for search in queries:
+        file_name = result_file_name(search.name)
+        if file_name in names:
+            raise ValueError(f"Запросы {names[file_name]!r} и {search.name!r} пишут результат в один файл "
+                             f"{file_name}, задайте им разные имена (поле name)")
+        names[file_name] = search.name
+
+
+def run_batch(queries: List[SearchQuery], output_dir: str = os.path.join(DATA_PATH, "batch_results"),
+              store: Optional[JSONWorker] = None, max_workers: Optional[int] = None, url: Optional[str] = None,
+              cache_dir: Optional[str] = os.path.join(DATA_PATH, "http_cache"),
+              max_requests: int = MAX_CONCURRENT_REQUESTS) -> Dict[str, Dict[str, int]]:
+    """
+    Выполняет поиски параллельно в пуле процессов.
+
+    Процессы только загружают и фильтруют вакансии. Родительский процесс
+    пишет результат каждого запроса в отдельный файл и добавляет найденные
+    вакансии в общее хранилище без дубликатов, одной транзакцией на весь пакет.
+
+    Потоки загрузки делятся между процессами так, чтобы одновременно
+    выполнялось не больше max_requests запросов к API на весь пакет.
+
+    :param queries: Список запросов.
+    :param output_dir: Папка для файлов с результатами.
+    :param store: Общее хранилище вакансий или None, чтобы использовать data/vacancies.json.
+    :param max_workers: Количество процессов, по умолчанию - количество ядер.
+    :param url: Адрес метода поиска вакансий или None для hh.ru.
+    :param cache_dir: Папка кэша ответов API или None без кэша.
+    :param max_requests: Максимальное количество одновременных запросов к API во всех процессах.
+    :return: Словарь имя запроса -> количество найденных (без повторов), отобранных и новых вакансий;
+             для запросов, завершившихся ошибкой, - {"error": 1}.
+    :raises ValueError: Если у запросов совпадают имена.
+    """
+    check_unique_names(queries)
+    os.makedirs(output_dir, exist_ok=True)
+    if store is None:
+        store = JSONWorker("vacancies.json", reset=False)
+    processes = max(1, min(max_workers or os.cpu_count() or 1, len(queries), max_requests))
+    threads = max(1, max_requests // processes)
+    summary: Dict[str, Dict[str, int]] = {}
+    with ProcessPoolExecutor(max_workers=processes) as executor, store.transaction():
+        futures = {executor.submit(run_search, search, url, cache_dir, threads): search for search in queries}
+        for future in as_completed(futures):
+            try:
+                search, found, top = future.result()
+            except Exception as error:
+                # Ошибка одного запроса не должна отменять весь ночной пакет
+                print(f"{futures[future].name}: ошибка {error!r}")
+                summary[futures[future].name] = {"error": 1}
+                continue
+            with open(os.path.join(output_dir, result_file_name(search.name)), "w", encoding="utf-8") as f:
+                json.dump(top, f, ensure_ascii=False, indent=4)
+            stats = store.upsert_vacancies([Vacancy(*row) for row in found])
+            summary[search.name] = {"found": len(found), "selected": len(top), "new": stats["inserted"]}
+    return {search.name: summary[search.name] for search in queries}
+
+
+def batch_interaction(file_path: str, output_dir: str = os.path.join(DATA_PATH, "batch_results"),
+                      max_workers: Optional[int] = None) -> None:
+    """
+    Пакетный режим: выполнить все запросы из файла и вывести сводку.
+
+    :param file_path: Путь к файлу с запросами JSON или CSV.
+    :param output_dir: Папка для файлов с результатами.
+    :param max_workers: Количество процессов, по умолчанию - количество ядер.
+    """
+    queries = load_queries(file_path)
+    start = time.perf_counter()
+    try:
+        summary = run_batch(queries, output_dir, max_workers=max_workers)
+    except ValueError as error:
+        print(error)
+        return
+    for name, stats in summary.items():
+        if "error" in stats:
+            continue
+        print(f"{name}: найдено {stats['found']}, отобрано {stats['selected']}, новых {stats['new']}")
+    print(f"Выполнено запросов: {len(summary)} за {time.perf_counter() - start:.1f} с, результаты в {output_dir}")
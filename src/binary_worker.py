@@ -0,0 +1,495 @@
+import mmap
+import os
+import shutil
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from config import DATA_PATH
+from src.matcher import KeywordMatcher, normalize_city, record_search_text
+from src.profiling import instrumented
+from src.salary_index import normalize_salary
+from src.vacancy import Vacancy
+from src.worker import BaseWorker
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+NUMERIC_FIELDS: tuple = ("salary_from", "salary_to")
+STRING_FIELDS: tuple = ("title", "url", "requirements", "responsibility", "city", "currency")
+DELETED_FILE: str = "deleted.u8"
+# Производная колонка: минимальная зарплата в рублях, 0 - не указана. По ней фильтруют и сортируют
+SALARY_FIELD: str = "salary_rub"
+# Производная строковая колонка: текст для поиска по словам
+SEARCH_FIELD: str = "search_text"
+
+
+def _map_file(file_path: str) -> Optional[mmap.mmap]:
+    """
+    Отображает файл в память только для чтения.
+
+    :param file_path: Путь к файлу.
+    :return: Объект mmap или None для пустого файла (пустой файл отобразить нельзя).
+    """
+    with open(file_path, "rb") as f:
+        if not os.fstat(f.fileno()).st_size:
+            return None
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class _Columns:
+    """
+    Снимок колонок хранилища, отображенных в память.
+
+    Числовые колонки и таблицы смещений доступны как memoryview с форматом 'q'
+    поверх mmap, без копирования. Итераторы держат ссылку на свой снимок,
+    поэтому запись в хранилище во время перебора их не ломает.
+    """
+
+    def __init__(self, dir_path: str) -> None:
+        """
+        Отображает в память все файлы колонок.
+
+        :param dir_path: Папка хранилища.
+        """
+        self.maps: Dict[str, Optional[mmap.mmap]] = {}
+        for name in os.listdir(dir_path):
+            self.maps[name] = _map_file(os.path.join(dir_path, name))
+        deleted = self.maps.get(DELETED_FILE)
+        # Строка считается записанной, только когда записан ее флаг удаления (он пишется последним)
+        self.rows: int = len(deleted) if deleted is not None else 0
+        self.deleted: memoryview = memoryview(deleted or b"")[:self.rows]
+        self.numbers: Dict[str, memoryview] = {field: self._view(f"{field}.i64")
+                                               for field in NUMERIC_FIELDS + (SALARY_FIELD,)}
+        self.offsets: Dict[str, memoryview] = {field: self._view(f"{field}.off")
+                                               for field in STRING_FIELDS + (SEARCH_FIELD,)}
+        self.blobs: Dict[str, memoryview] = {field: memoryview(self.maps.get(f"{field}.str") or b"")
+                                             for field in STRING_FIELDS + (SEARCH_FIELD,)}
+
+    def _view(self, name: str) -> memoryview:
+        data = self.maps.get(name)
+        if data is None:
+            return memoryview(array("q"))
+        return memoryview(data).cast("q")[:self.rows]
+
+    def string(self, field: str, row: int) -> str:
+        """
+        Декодирует одно строковое значение.
+
+        :param field: Название поля.
+        :param row: Номер строки.
+        :return: Значение поля.
+        """
+        offsets = self.offsets[field]
+        start = offsets[row - 1] if row else 0
+        return str(self.blobs[field][start:offsets[row]], "utf-8")
+
+    def record(self, row: int) -> Dict[str, Any]:
+        """
+        Собирает словарь со всеми полями одной строки.
+
+        :param row: Номер строки.
+        :return: Словарь с данными вакансии.
+        """
+        record: Dict[str, Any] = {field: self.string(field, row) for field in STRING_FIELDS + (SEARCH_FIELD,)}
+        for field in NUMERIC_FIELDS:
+            record[field] = self.numbers[field][row]
+        return record
+
+    def live_rows(self) -> Iterator[int]:
+        """
+        Перебирает номера неудаленных строк.
+
+        :return: Итератор номеров строк.
+        """
+        deleted = self.deleted
+        return (row for row in range(self.rows) if not deleted[row])
+
+
+class BinaryWorker(BaseWorker):
+    """
+    Класс для работы с вакансиями в двоичном колоночном формате.
+
+    Хранилище - папка с файлом на каждую колонку: зарплаты записаны
+    64-битными целыми фиксированной ширины, строковые поля - таблицей
+    смещений концов строк и общим блоком текста в UTF-8, удаление -
+    флагом в отдельном байтовом файле. Для запросов хранятся производные
+    колонки: минимальная зарплата в рублях и текст для поиска по словам. Файлы читаются через mmap,
+    поэтому фильтр по зарплате читает только страницы числовой колонки,
+    а строки декодируются лишь для подходящих вакансий.
+    Новые вакансии дописываются в конец файлов.
+    """
+
+    def __init__(self, file_name: str = "vacancies.bin", data_path: str = DATA_PATH, reset: bool = False) -> None:
+        """
+        Инициализация BinaryWorker с именем папки хранилища.
+
+        :param file_name: Имя папки для хранения колонок.
+        :param data_path: Папка для хранения хранилища.
+        :param reset: Удалить все вакансии при инициализации.
+        """
+        self.dir_path: str = os.path.join(data_path, file_name)
+        self._columns: Optional[_Columns] = None
+        self._rows_by_url: Dict[str, int] = {}
+        self._file_state: tuple = ()
+        self.prepare(reset)
+
+    def prepare(self, reset: bool = False) -> None:
+        """
+        Подготовка папки хранилища: создание или очистка и загрузка индекса URL.
+
+        :param reset: Удалить все вакансии.
+        """
+        self._recover()
+        if reset and os.path.isdir(self.dir_path):
+            shutil.rmtree(self.dir_path)
+        os.makedirs(self.dir_path, exist_ok=True)
+        names = [f"{field}.i64" for field in NUMERIC_FIELDS + (SALARY_FIELD,)] + [DELETED_FILE]
+        names += [f"{field}.{suffix}" for field in STRING_FIELDS + (SEARCH_FIELD,) for suffix in ("off", "str")]
+        for name in names:
+            open(os.path.join(self.dir_path, name), "ab").close()
+        self._columns = None
+        self._truncate(self._load())
+        self._fill_salaries(self._load())
+        self._fill_search_text(self._load())
+        columns = self._load()
+        self._rows_by_url = {columns.string("url", row): row for row in columns.live_rows()}
+        self.bump_generation()
+
+    def _recover(self) -> None:
+        """
+        Убрать следы прерванного compact.
+
+        Если процесс упал между подменами папок, хранилища нет, а старая копия лежит
+        в папке .old - она возвращается на место. Недописанная папка .compact и папка
+        .old, оставшаяся после успешной подмены, удаляются.
+        """
+        old_path = self.dir_path + ".old"
+        if not os.path.isdir(self.dir_path) and os.path.isdir(old_path):
+            os.replace(old_path, self.dir_path)
+        for path in (old_path, self.dir_path + ".compact"):
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.dir_path, name)
+
+    def _stat(self) -> tuple:
+        # Файл флагов удаления меняется при любой записи и пишется последним
+        stat = os.stat(self._path(DELETED_FILE))
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def bump_generation(self) -> None:
+        """
+        Отметить изменение хранилища и запомнить состояние файлов после собственной записи.
+        """
+        super().bump_generation()
+        self._file_state = self._stat()
+
+    def current_generation(self) -> int:
+        """
+        Текущее поколение хранилища с учетом записи другим процессом.
+
+        Если хранилище изменилось извне, колонки отображаются заново
+        и индекс URL строится по новому снимку.
+
+        :return: Номер поколения.
+        """
+        if self._stat() != self._file_state:
+            self._columns = None
+            columns = self._load()
+            self._rows_by_url = {columns.string("url", row): row for row in columns.live_rows()}
+            self.bump_generation()
+        return self._generation
+
+    def _load(self) -> _Columns:
+        """
+        Вернуть отображенные в память колонки, заново отобразив их после записи.
+
+        :return: Снимок колонок.
+        """
+        if self._columns is None:
+            self._columns = _Columns(self.dir_path)
+        return self._columns
+
+    def _truncate(self, columns: _Columns) -> None:
+        """
+        Обрезать колонки до количества записанных строк после прерванной записи.
+
+        :param columns: Снимок колонок.
+        """
+        rows = columns.rows
+        sizes = {f"{field}.i64": rows * 8 for field in NUMERIC_FIELDS}
+        for field in STRING_FIELDS:
+            sizes[f"{field}.off"] = rows * 8
+            sizes[f"{field}.str"] = columns.offsets[field][rows - 1] if rows else 0
+        changed = False
+        for name, size in sizes.items():
+            if os.path.getsize(self._path(name)) != size:
+                os.truncate(self._path(name), size)
+                changed = True
+        if changed:
+            self._columns = None
+
+    def _fill_salaries(self, columns: _Columns) -> None:
+        """
+        Пересчитать колонку зарплат в рублях, если ее длина не совпадает с количеством строк.
+
+        Так дополняются хранилища, созданные до появления колонки, и колонка,
+        запись которой была прервана.
+
+        :param columns: Снимок колонок.
+        """
+        path = self._path(f"{SALARY_FIELD}.i64")
+        if os.path.getsize(path) == columns.rows * 8:
+            return
+        salaries = array("q", (normalize_salary(columns.numbers["salary_from"][row],
+                                                columns.string("currency", row)) or 0
+                               for row in range(columns.rows)))
+        with open(path, "wb") as f:
+            salaries.tofile(f)
+        self._columns = None
+
+    def _fill_search_text(self, columns: _Columns) -> None:
+        """
+        Пересчитать колонку текста для поиска, если она не совпадает с количеством строк
+        (хранилище создано до появления колонки или ее запись была прервана).
+
+        :param columns: Снимок колонок.
+        """
+        offsets_path = self._path(f"{SEARCH_FIELD}.off")
+        blob_path = self._path(f"{SEARCH_FIELD}.str")
+        rows = columns.rows
+        if os.path.getsize(offsets_path) == rows * 8 and \
+                os.path.getsize(blob_path) == (columns.offsets[SEARCH_FIELD][rows - 1] if rows else 0):
+            return
+        offsets = array("q")
+        blobs: List[bytes] = []
+        end = 0
+        for row in range(rows):
+            data = record_search_text({field: columns.string(field, row) for field in STRING_FIELDS}).encode("utf-8")
+            end += len(data)
+            offsets.append(end)
+            blobs.append(data)
+        with open(blob_path, "wb") as f:
+            f.write(b"".join(blobs))
+        with open(offsets_path, "wb") as f:
+            offsets.tofile(f)
+        self._columns = None
+
+    @instrumented("BinaryWorker.add_vacancies")
+    def add_vacancies(self, vacancies: List[Vacancy]) -> int:
+        """
+        Дописать вакансии в конец колонок, пропуская уже сохраненные URL.
+
+        :param vacancies: Список объектов вакансий.
+        :return: Количество пропущенных дубликатов.
+        """
+        columns = self._load()
+        row = columns.rows
+        numbers = {field: array("q") for field in NUMERIC_FIELDS + (SALARY_FIELD,)}
+        offsets = {field: array("q") for field in STRING_FIELDS + (SEARCH_FIELD,)}
+        blobs: Dict[str, List[bytes]] = {field: [] for field in STRING_FIELDS + (SEARCH_FIELD,)}
+        ends = {field: columns.offsets[field][row - 1] if row else 0 for field in STRING_FIELDS + (SEARCH_FIELD,)}
+        skipped = 0
+        for vacancy in vacancies:
+            if vacancy.url in self._rows_by_url:
+                skipped += 1
+                continue
+            self._rows_by_url[vacancy.url] = row
+            row += 1
+            for field in NUMERIC_FIELDS:
+                numbers[field].append(int(getattr(vacancy, field) or 0))
+            numbers[SALARY_FIELD].append(normalize_salary(vacancy.salary_from, vacancy.currency) or 0)
+            for field in STRING_FIELDS + (SEARCH_FIELD,):
+                data = (getattr(vacancy, field) or "").encode("utf-8")
+                ends[field] += len(data)
+                offsets[field].append(ends[field])
+                blobs[field].append(data)
+        added = row - columns.rows
+        if not added:
+            return skipped
+        for field in STRING_FIELDS + (SEARCH_FIELD,):
+            with open(self._path(f"{field}.str"), "ab") as f:
+                f.write(b"".join(blobs[field]))
+            with open(self._path(f"{field}.off"), "ab") as f:
+                offsets[field].tofile(f)
+        for field in NUMERIC_FIELDS + (SALARY_FIELD,):
+            with open(self._path(f"{field}.i64"), "ab") as f:
+                numbers[field].tofile(f)
+        with open(self._path(DELETED_FILE), "ab") as f:
+            f.write(bytes(added))
+        self._columns = None
+        self.bump_generation()
+        return skipped
+
+    @instrumented("BinaryWorker.del_vacancy")
+    def del_vacancy(self, vacancy: Vacancy) -> None:
+        """
+        Удалить вакансию по ее URL.
+
+        :param vacancy: Объект вакансии для удаления.
+        """
+        self.delete_many([vacancy.url])
+
+    @instrumented("BinaryWorker.delete_many")
+    def delete_many(self, urls: Iterable[str]) -> int:
+        """
+        Удалить вакансии по их URL, установив флаг удаления.
+
+        :param urls: URL вакансий для удаления.
+        :return: Количество удаленных вакансий.
+        """
+        rows = [row for row in (self._rows_by_url.pop(url, None) for url in urls) if row is not None]
+        if rows:
+            with open(self._path(DELETED_FILE), "r+b") as f:
+                for row in rows:
+                    f.seek(row)
+                    f.write(b"\x01")
+            self._columns = None
+            self.bump_generation()
+        return len(rows)
+
+    def iter_records(self) -> Iterator[Dict[str, Any]]:
+        """
+        Перебрать вакансии в виде словарей.
+
+        :return: Итератор словарей с данными вакансий.
+        """
+        columns = self._load()
+        return (columns.record(row) for row in columns.live_rows())
+
+    @instrumented("BinaryWorker.return_list_vacancies")
+    def return_list_vacancies(self) -> List[Vacancy]:
+        """
+        Вернуть список всех вакансий.
+
+        :return: Список объектов вакансий.
+        """
+        return [Vacancy.from_dict(record) for record in self.iter_records()]
+
+    @instrumented("BinaryWorker.select_vacancy")
+    def select_vacancy(self, keyword: str) -> List[Vacancy]:
+        """
+        Выбрать вакансии по ключевому слову в названии, требованиях или обязанностях.
+
+        Для проверки декодируется только колонка текста для поиска.
+
+        :param keyword: Ключевое слово для поиска вакансий.
+        :return: Список объектов вакансий, соответствующих ключевому слову.
+        """
+        columns = self._load()
+        matcher = KeywordMatcher([keyword])
+        return [Vacancy.from_dict(columns.record(row)) for row in columns.live_rows()
+                if not matcher or matcher.matches_any(columns.string(SEARCH_FIELD, row))]
+
+    def salary_rows(self, min_salary: Optional[int] = None, max_salary: Optional[int] = None) -> List[int]:
+        """
+        Номера неудаленных строк с минимальной зарплатой в рублях в заданном диапазоне.
+
+        Читаются только колонка зарплат в рублях и флаги удаления.
+
+        :param min_salary: Нижняя граница минимальной зарплаты в рублях или None.
+        :param max_salary: Верхняя граница минимальной зарплаты в рублях или None.
+        :return: Список номеров строк.
+        """
+        columns = self._load()
+        if not columns.rows:
+            return []
+        column = columns.numbers[SALARY_FIELD]
+        if numpy is not None:
+            values = numpy.frombuffer(column, dtype=numpy.int64)
+            result = numpy.frombuffer(columns.deleted, dtype=numpy.uint8) == 0
+            if min_salary is not None:
+                result &= values >= min_salary
+            if max_salary is not None:
+                result &= values <= max_salary
+            return numpy.flatnonzero(result).tolist()
+        low = min_salary if min_salary is not None else -2 ** 63
+        high = max_salary if max_salary is not None else 2 ** 63 - 1
+        deleted = columns.deleted
+        return [row for row in range(columns.rows) if low <= column[row] <= high and not deleted[row]]
+
+    @instrumented("BinaryWorker.select_by_salary")
+    def select_by_salary(self, min_salary: int, max_salary: Optional[int] = None) -> List[Vacancy]:
+        """
+        Выбрать вакансии с минимальной зарплатой в заданном диапазоне.
+
+        Зарплаты сравниваются в рублях, вакансии без минимальной зарплаты не выбираются.
+
+        :param min_salary: Нижняя граница минимальной зарплаты в рублях.
+        :param max_salary: Верхняя граница минимальной зарплаты в рублях или None.
+        :return: Список объектов вакансий по возрастанию минимальной зарплаты.
+        """
+        columns = self._load()
+        column = columns.numbers[SALARY_FIELD]
+        rows = sorted(self.salary_rows(max(min_salary, 1), max_salary), key=column.__getitem__)
+        return [Vacancy.from_dict(columns.record(row)) for row in rows]
+
+    @instrumented("BinaryWorker.query")
+    def _query(self, keywords: Optional[List[str]], min_salary: Optional[int], city: Optional[str],
+               limit: Optional[int]) -> List[Vacancy]:
+        """
+        Найти вакансии по условиям и вернуть лучшие по минимальной зарплате.
+
+        Строки отбираются по колонке зарплат в рублях и упорядочиваются по ней,
+        затем город и текст для поиска декодируются по порядку, пока не наберется limit
+        вакансий, а полные записи собираются только для результата.
+
+        :param keywords: Слова в нижнем регистре, хотя бы одно из которых должно быть в тексте вакансии, или None.
+        :param min_salary: Минимальная зарплата в рублях или None.
+        :param city: Город, приведенный normalize_city, или None.
+        :param limit: Количество вакансий или None для всех подходящих.
+        :return: Список вакансий по убыванию минимальной зарплаты в рублях.
+        """
+        columns = self._load()
+        matcher = KeywordMatcher(keywords or [])
+        rows = self.salary_rows(min_salary)
+        column = columns.numbers[SALARY_FIELD]
+        # При равной зарплате порядок - как в хранилище, как у top_records
+        if numpy is not None and rows:
+            values = numpy.frombuffer(column, dtype=numpy.int64)[rows]
+            rows = [rows[position] for position in numpy.argsort(-values, kind="stable").tolist()]
+        else:
+            rows.sort(key=lambda row: -column[row])
+        selected: List[int] = []
+        for row in rows:
+            if limit is not None and len(selected) >= limit:
+                break
+            if city is not None and normalize_city(columns.string("city", row)) != city:
+                continue
+            if matcher and not matcher.matches_any(columns.string(SEARCH_FIELD, row)):
+                continue
+            selected.append(row)
+        return [Vacancy.from_dict(columns.record(row)) for row in selected]
+
+    def count(self) -> int:
+        """
+        Количество вакансий в хранилище.
+
+        :return: Количество неудаленных вакансий.
+        """
+        return len(self._rows_by_url)
+
+    @instrumented("BinaryWorker.compact")
+    def compact(self) -> None:
+        """
+        Переписать хранилище без удаленных строк.
+
+        Новые колонки пишутся в соседнюю папку, которая затем подменяет текущую.
+        Если процесс упадет во время подмены, хранилище восстановится при следующем открытии.
+        """
+        name = os.path.basename(self.dir_path)
+        compacted = BinaryWorker(name + ".compact", os.path.dirname(self.dir_path), reset=True)
+        columns = self._load()
+        compacted.add_vacancies([Vacancy.from_dict(columns.record(row)) for row in columns.live_rows()])
+        old_path = self.dir_path + ".old"
+        if os.path.isdir(old_path):
+            # os.replace не перезаписывает непустую папку
+            shutil.rmtree(old_path)
+        os.replace(self.dir_path, old_path)
+        os.replace(compacted.dir_path, self.dir_path)
+        shutil.rmtree(old_path)
+        self._columns = None
+        self.prepare()
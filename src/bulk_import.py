@@ -0,0 +1,165 @@
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from src.profiling import instrumented
+from src.vacancy import Vacancy
+from src.worker import JSONWorker
+
+# Количество вакансий, передаваемых хранилищу за один вызов
+DEFAULT_BATCH_SIZE: int = 10000
+# Количество файлов, разбираемых процессом пула за одну задачу
+FILES_PER_TASK: int = 8
+# Количество задач на процесс пула, результаты которых могут ждать родительский процесс
+TASKS_PER_WORKER: int = 2
+
+
+def page_items(data: Any) -> List[Dict[str, Any]]:
+    """
+    Вакансии из сохраненного ответа API.
+
+    Поддерживаются страница выдачи hh.ru (объект с полем items), запись
+    кэша ResponseCache (объект с полем body) и просто список вакансий.
+
+    :param data: Разобранное содержимое файла.
+    :return: Список словарей с данными вакансий в формате API.
+    """
+    if isinstance(data, dict) and "body" in data:
+        data = data["body"]
+    if isinstance(data, dict):
+        data = data.get("items", [])
+    if not isinstance(data, list):
+        raise ValueError("Файл не содержит страницу вакансий hh.ru")
+    return data
+
+
+def find_page_files(dir_path: str) -> List[str]:
+    """
+    Файлы JSON в папке и вложенных папках.
+
+    :param dir_path: Папка с сохраненными ответами API.
+    :return: Пути в порядке времени изменения файлов, при равном времени - по имени.
+    """
+    paths = []
+    for root, _, names in os.walk(dir_path):
+        paths.extend(os.path.join(root, name) for name in names if name.endswith(".json"))
+    return sorted(paths, key=lambda path: (os.path.getmtime(path), path))
+
+
+def parse_page_files(paths: List[str]) -> Tuple[List[Vacancy], List[Tuple[str, str]]]:
+    """
+    Разбирает файлы ответов API в вакансии. Выполняется в процессе пула.
+
+    :param paths: Пути к файлам.
+    :return: Вакансии в порядке файлов и список (путь, ошибка) для файлов, которые не удалось разобрать.
+    """
+    vacancies: List[Vacancy] = []
+    errors: List[Tuple[str, str]] = []
+    for file_path in paths:
+        try:
+            with open(file_path, encoding="utf-8") as f:
+                items = page_items(json.load(f))
+            vacancies.extend(Vacancy.iter_create(items))
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as error:
+            # Поврежденный файл архива не должен отменять весь импорт
+            errors.append((file_path, repr(error)))
+    return vacancies, errors
+
+
+def _iter_parsed(tasks: List[List[str]],
+                 max_workers: Optional[int]) -> Iterator[Tuple[List[Vacancy], List[Tuple[str, str]]]]:
+    max_workers = max_workers or os.cpu_count() or 1
+    if max_workers == 1 or len(tasks) < 2:
+        yield from map(parse_page_files, tasks)
+        return
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        # executor.map отправил бы сразу все задачи, и разобранные вакансии всего архива ждали бы
+        # в памяти родительского процесса; здесь в работе не больше TASKS_PER_WORKER задач на процесс
+        pending: deque = deque()
+        for task in tasks:
+            if len(pending) >= max_workers * TASKS_PER_WORKER:
+                yield pending.popleft().result()
+            pending.append(executor.submit(parse_page_files, task))
+        while pending:
+            yield pending.popleft().result()
+
+
+@instrumented("bulk_import.import_pages")
+def import_pages(dir_path: str, store: Optional[JSONWorker] = None, max_workers: Optional[int] = None,
+                 batch_size: int = DEFAULT_BATCH_SIZE) -> Dict[str, Any]:
+    """
+    Импортирует сохраненные ответы API из папки в хранилище.
+
+    Файлы разбираются в вакансии параллельно в пуле процессов и передаются
+    хранилищу пачками по batch_size. Повторы по URL (он содержит id вакансии)
+    внутри пачки убираются, остается вакансия из файла, измененного позже. Повтор
+    из более ранней пачки хранилище находит по URL среди сохраненных записей
+    и обновляет или пропускает, поэтому импорт держит в памяти одну пачку, а не
+    весь архив. Сам JSONWorker при этом хранит все записи в памяти.
+
+    Все пачки записываются одной транзакцией: файл хранилища пишется один раз в конце,
+    а не переписывается или дополняется журналом после каждой пачки. Прерванный
+    импорт ничего не записывает, его можно просто запустить заново.
+
+    :param dir_path: Папка с файлами ответов API.
+    :param store: Хранилище вакансий или None, чтобы использовать data/vacancies.json.
+    :param max_workers: Количество процессов, по умолчанию - количество ядер, 1 - без пула.
+    :param batch_size: Количество вакансий в одной пачке записи.
+    :return: Количество файлов, разобранных вакансий, повторов внутри пачек, добавленных, обновленных
+             и пропущенных вакансий, ошибки, время и скорость в вакансиях в секунду.
+    """
+    start = time.perf_counter()
+    if store is None:
+        store = JSONWorker("vacancies.json", reset=False)
+    paths = find_page_files(dir_path)
+    tasks = [paths[i:i + FILES_PER_TASK] for i in range(0, len(paths), FILES_PER_TASK)]
+
+    stats = {"inserted": 0, "updated": 0, "skipped": 0}
+    errors: List[Tuple[str, str]] = []
+    parsed = 0
+    duplicates = 0
+    batch: Dict[str, Vacancy] = {}
+
+    def flush() -> None:
+        for key, value in store.upsert_vacancies(list(batch.values())).items():
+            stats[key] += value
+        batch.clear()
+
+    with store.transaction():
+        for vacancies, task_errors in _iter_parsed(tasks, max_workers):
+            parsed += len(vacancies)
+            errors.extend(task_errors)
+            for vacancy in vacancies:
+                if batch.pop(vacancy.url, None) is not None:
+                    duplicates += 1
+                # Удаление перед вставкой переносит вакансию на место последнего появления
+                batch[vacancy.url] = vacancy
+                if len(batch) >= batch_size:
+                    flush()
+        if batch:
+            flush()
+
+    seconds = time.perf_counter() - start
+    return {"files": len(paths), "parsed": parsed, "duplicates": duplicates, **stats, "errors": errors,
+            "seconds": round(seconds, 3), "records_per_second": round(parsed / seconds, 1) if seconds else None}
+
+
+def import_interaction(dir_path: str, max_workers: Optional[int] = None) -> None:
+    """
+    Режим импорта: загрузить сохраненные ответы API в data/vacancies.json и вывести сводку.
+
+    :param dir_path: Папка с файлами ответов API.
+    :param max_workers: Количество процессов, по умолчанию - количество ядер.
+    """
+    if not os.path.isdir(dir_path):
+        print(f"Папка {dir_path} не найдена")
+        return
+    report = import_pages(dir_path, max_workers=max_workers)
+    for file_path, error in report["errors"]:
+        print(f"{file_path}: ошибка {error}")
+    print(f"Файлов: {report['files']}, вакансий: {report['parsed']}, повторов в пачках: {report['duplicates']}, "
+          f"добавлено {report['inserted']}, обновлено {report['updated']}, без изменений {report['skipped']}")
+    print(f"Импорт занял {report['seconds']:.2f} с, {report['records_per_second']:.0f} вакансий/с")
@@ -0,0 +1,264 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from config import DATA_PATH
+
+
+class ResponseCache:
+    """
+    Дисковый кэш ответов API.
+
+    Ответы хранятся в отдельных JSON-файлах, имя файла - хэш от (url, params).
+    Запись считается свежей в течение ttl секунд, после чего ее можно
+    перепроверить запросом с If-None-Match. Размер кэша ограничен количеством
+    записей и суммарным объемом, при превышении удаляются записи,
+    к которым дольше всего не обращались. Количество и объем записей
+    считаются в памяти, папка просматривается целиком только при первой
+    записи и при вытеснении. Записи других процессов, пишущих в ту же папку,
+    учитываются при следующем просмотре.
+    """
+
+    def __init__(self, cache_dir: str = os.path.join(DATA_PATH, "http_cache"), ttl: float = 600,
+                 max_entries: int = 1000, max_bytes: int = 200 * 1024 * 1024) -> None:
+        """
+        Инициализация кэша.
+
+        :param cache_dir: Папка для хранения записей кэша.
+        :param ttl: Время жизни записи в секундах.
+        :param max_entries: Максимальное количество записей.
+        :param max_bytes: Максимальный суммарный размер записей в байтах.
+        """
+        self.cache_dir: str = cache_dir
+        self.ttl: float = ttl
+        self.max_entries: int = max_entries
+        self.max_bytes: int = max_bytes
+        self.hits: int = 0
+        self.misses: int = 0
+        self.revalidated: int = 0
+        # Количество и суммарный размер записей или None, пока папка не просмотрена
+        self._usage: Optional[List[int]] = None
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(url: str, params: Dict[str, Any]) -> str:
+        """
+        Вычисляет ключ записи по URL и параметрам запроса.
+
+        :param url: URL запроса.
+        :param params: Параметры запроса.
+        :return: Хэш-строка ключа.
+        """
+        # hashlib нужен только кэшу ответов API, поэтому не загружается вместе с QueryCache
+        import hashlib
+
+        raw = json.dumps([url, sorted((str(k), str(v)) for k, v in params.items())], ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + ".json")
+
+    def get(self, url: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Возвращает запись кэша или None, если ее нет.
+
+        :param url: URL запроса.
+        :param params: Параметры запроса.
+        :return: Словарь с полями body, etag и stored_at.
+        """
+        path = self._path(self.make_key(url, params))
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry: Dict[str, Any] = json.load(f)
+        except (OSError, ValueError):
+            return None
+        # Время доступа нужно для вытеснения давно не использованных записей
+        os.utime(path)
+        return entry
+
+    def is_fresh(self, entry: Dict[str, Any]) -> bool:
+        """
+        Проверяет, не истек ли срок жизни записи.
+
+        :param entry: Запись кэша.
+        :return: True, если запись можно отдавать без обращения к серверу.
+        """
+        return time.time() - entry["stored_at"] < self.ttl
+
+    def put(self, url: str, params: Dict[str, Any], body: Any, etag: Optional[str] = None) -> None:
+        """
+        Сохраняет ответ в кэш.
+
+        :param url: URL запроса.
+        :param params: Параметры запроса.
+        :param body: Разобранное тело ответа.
+        :param etag: Значение заголовка ETag ответа.
+        """
+        entry = {"stored_at": time.time(), "etag": etag, "body": body}
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+            size = f.tell()
+        path = self._path(self.make_key(url, params))
+        with self._lock:
+            try:
+                replaced: Optional[int] = os.stat(path).st_size
+            except FileNotFoundError:
+                replaced = None
+            os.replace(tmp_path, path)
+            if self._usage is None:
+                # Первая запись: папка просматривается один раз, дальше размер считается в памяти
+                stats = self._scan()
+                self._usage = [len(stats), sum(stat.st_size for stat, _ in stats)]
+            elif replaced is None:
+                self._usage[0] += 1
+                self._usage[1] += size
+            else:
+                self._usage[1] += size - replaced
+            over = self._usage[0] > self.max_entries or self._usage[1] > self.max_bytes
+        if over:
+            self.evict()
+
+    def refresh(self, url: str, params: Dict[str, Any], entry: Dict[str, Any]) -> None:
+        """
+        Продлевает срок жизни записи после ответа 304 Not Modified.
+
+        :param url: URL запроса.
+        :param params: Параметры запроса.
+        :param entry: Перепроверенная запись кэша.
+        """
+        self.put(url, params, entry["body"], entry.get("etag"))
+
+    def _scan(self) -> List[Tuple[os.stat_result, str]]:
+        files = [entry for entry in os.scandir(self.cache_dir) if entry.name.endswith(".json")]
+        return sorted(((entry.stat(), entry.path) for entry in files), key=lambda item: item[0].st_mtime)
+
+    def evict(self) -> None:
+        """
+        Удаляет самые давно использованные записи, пока кэш превышает ограничения.
+        """
+        with self._lock:
+            stats = self._scan()
+            total_bytes = sum(stat.st_size for stat, _ in stats)
+            count = len(stats)
+            for stat, path in stats:
+                if count <= self.max_entries and total_bytes <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                count -= 1
+                total_bytes -= stat.st_size
+            self._usage = [count, total_bytes]
+
+    def record(self, kind: str) -> None:
+        """
+        Увеличивает счетчик обращений к кэшу.
+
+        :param kind: Тип обращения: hits, misses или revalidated.
+        """
+        with self._lock:
+            setattr(self, kind, getattr(self, kind) + 1)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Возвращает статистику обращений к кэшу.
+
+        :return: Словарь со счетчиками попаданий, промахов и ответов 304.
+        """
+        return {"hits": self.hits, "misses": self.misses, "revalidated": self.revalidated}
+
+    def clear(self) -> None:
+        """
+        Удаляет все записи кэша.
+        """
+        with self._lock:
+            for entry in os.scandir(self.cache_dir):
+                if entry.name.endswith(".json"):
+                    os.remove(entry.path)
+            self._usage = [0, 0]
+
+
+class QueryCache:
+    """
+    LRU-кэш результатов запросов к хранилищу вакансий в памяти.
+
+    Каждый результат сохраняется вместе с поколением хранилища, при котором
+    он был получен. Хранилище увеличивает поколение при каждом изменении,
+    поэтому результат, сохраненный до изменения, считается промахом
+    и не отдается. Количество записей ограничено, при превышении удаляется
+    запись, к которой дольше всего не обращались.
+    """
+
+    def __init__(self, max_entries: int = 128) -> None:
+        """
+        Инициализация кэша.
+
+        :param max_entries: Максимальное количество записей.
+        """
+        self.max_entries: int = max_entries
+        self.hits: int = 0
+        self.misses: int = 0
+        self._entries: 'OrderedDict[Hashable, Tuple[int, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, generation: int) -> Optional[Any]:
+        """
+        Возвращает результат, если он получен при текущем поколении хранилища.
+
+        :param key: Ключ запроса.
+        :param generation: Текущее поколение хранилища.
+        :return: Сохраненный результат или None.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != generation:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, generation: int, value: Any) -> None:
+        """
+        Сохраняет результат запроса.
+
+        :param key: Ключ запроса.
+        :param generation: Поколение хранилища, при котором получен результат.
+        :param value: Результат запроса.
+        """
+        with self._lock:
+            self._entries[key] = (generation, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Возвращает статистику обращений к кэшу.
+
+        :return: Словарь с попаданиями, промахами, долей попаданий и количеством записей.
+        """
+        total = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hits / total if total else 0.0,
+                "entries": len(self._entries)}
+
+    def clear(self) -> None:
+        """
+        Удаляет все записи и сбрасывает статистику.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
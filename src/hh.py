@@ -1,5 +1,7 @@
-import requests
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+from src.api import fetch_all_pages, get_json, DEFAULT_MAX_WORKERS
+from src.cache import ResponseCache
+from src.profiling import instrumented
 
 class Parser:
     """
@@ -17,29 +19,51 @@ class HH(Parser):
         file_worker: Объект для работы с файлами, передаваемый родительскому классу Parser.
     """
 
-    def __init__(self, file_worker: Any):
+    def __init__(self, file_worker: Any, max_workers: int = DEFAULT_MAX_WORKERS,
+                 cache: Optional[ResponseCache] = None, url: str = 'https://api.hh.ru/vacancies'):
         """
         Инициализация класса HH.
 
         Args:
             file_worker (Any): Объект для работы с файлами.
+            max_workers (int): Максимальное количество потоков для загрузки страниц.
+            cache (Optional[ResponseCache]): Кэш ответов API.
+            url (str): Адрес метода поиска вакансий.
         """
-        self.url: str = 'https://api.hh.ru/vacancies'
+        self.url: str = url
         self.headers: Dict[str, str] = {'User-Agent': 'HH-User-Agent'}
         self.params: Dict[str, Any] = {'text': '', 'page': 0, 'per_page': 100}
         self.vacancies: List[Dict[str, Any]] = []
+        self.max_workers: int = max_workers
+        self.cache: Optional[ResponseCache] = cache
         super().__init__(file_worker)
 
+    @instrumented("HH.load_page")
+    def load_page(self, page: int) -> Dict[str, Any]:
+        """
+        Загрузка одной страницы выдачи.
+
+        Args:
+            page (int): Номер страницы.
+
+        Returns:
+            Dict[str, Any]: Ответ API для страницы.
+        """
+        params: Dict[str, Any] = dict(self.params, page=page)
+        return get_json(self.url, params, headers=self.headers, cache=self.cache)
+
+    @instrumented("HH.load_vacancies")
     def load_vacancies(self, keyword: str):
         """
         Загрузка вакансий по ключевому слову.
 
+        Первая страница загружается сразу, остальные - параллельно,
+        в количестве, указанном в ответе API.
+
         Args:
             keyword (str): Ключевое слово для поиска вакансий.
         """
         self.params['text'] = keyword
-        while self.params.get('page') != 20:
-            response = requests.get(self.url, headers=self.headers, params=self.params)
-            vacancies: List[Dict[str, Any]] = response.json().get('items', [])
-            self.vacancies.extend(vacancies)
-            self.params['page'] += 1
+        pages = fetch_all_pages(self.load_page, self.params['per_page'], self.max_workers)
+        for page in pages:
+            self.vacancies.extend(page.get('items', []))
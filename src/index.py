@@ -0,0 +1,167 @@
+import json
+import os
+import re
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+TOKEN_RE = re.compile(r"\w+")
+# Версия файла индекса; 2 - индексируется текст для поиска, а не только название
+INDEX_VERSION: int = 2
+
+
+def tokenize(text: str) -> Set[str]:
+    """
+    Разбивает текст на множество слов в нижнем регистре (casefold, как normalize_text).
+
+    :param text: Исходный текст.
+    :return: Множество слов.
+    """
+    return set(TOKEN_RE.findall(text.casefold()))
+
+
+def has_tokens(keyword: str) -> bool:
+    """
+    Можно ли искать ключевое слово по индексу.
+
+    Слова без букв и цифр ("", "++") не дают ни одного слова индекса,
+    такие слова ищутся простым перебором записей.
+
+    :param keyword: Ключевое слово или фраза.
+    :return: True, если в слове есть хотя бы одно слово индекса.
+    """
+    return TOKEN_RE.search(keyword) is not None
+
+
+class InvertedIndex:
+    """
+    Инвертированный индекс: слово -> множество идентификаторов записей.
+
+    Индекс хранится в отдельном файле рядом с файлом данных вместе с состоянием
+    файла данных, по которому он построен, и обновляется при добавлении и удалении записей. Поиск подстроки выполняется по
+    словарю индекса, который намного меньше самих данных.
+    """
+
+    def __init__(self, file_path: str) -> None:
+        """
+        Инициализация индекса.
+
+        :param file_path: Путь к файлу индекса.
+        """
+        self.file_path: str = file_path
+        self.postings: Dict[str, Set[str]] = {}
+
+    def load(self, base: Optional[Any] = None) -> bool:
+        """
+        Загружает индекс из файла.
+
+        :param base: Состояние файла данных, для которого нужен индекс, или None - любое.
+        :return: True, если файл индекса существует, прочитан и построен для этого состояния
+                 текущей версией индекса.
+        """
+        try:
+            with open(self.file_path, encoding="utf-8") as f:
+                data: Dict[str, Any] = json.load(f)
+        except (OSError, ValueError):
+            return False
+        # Значения слов - списки, поэтому словарь в поле postings отличает формат с состоянием данных
+        postings = data.get("postings")
+        if not isinstance(postings, dict):
+            postings, data = data, {}
+        if base is not None and (data.get("base") != list(base) or data.get("version") != INDEX_VERSION):
+            return False
+        self.postings = {token: set(keys) for token, keys in postings.items()}
+        return True
+
+    def save(self, base: Optional[Any] = None) -> None:
+        """
+        Сохраняет индекс в файл.
+
+        :param base: Состояние файла данных, по которому построен индекс, например время изменения и размер.
+        """
+        tmp_path = self.file_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": INDEX_VERSION, "base": list(base) if base is not None else None,
+                       "postings": {token: sorted(keys) for token, keys in self.postings.items()}},
+                      f, ensure_ascii=False)
+        os.replace(tmp_path, self.file_path)
+
+    def clear(self) -> None:
+        """
+        Удаляет все записи из индекса.
+        """
+        self.postings = {}
+
+    def add(self, key: str, text: str) -> None:
+        """
+        Добавляет запись в индекс.
+
+        :param key: Идентификатор записи.
+        :param text: Индексируемый текст записи.
+        """
+        for token in tokenize(text):
+            self.postings.setdefault(token, set()).add(key)
+
+    def remove(self, key: str, text: str) -> None:
+        """
+        Удаляет запись из индекса.
+
+        :param key: Идентификатор записи.
+        :param text: Индексируемый текст записи.
+        """
+        for token in tokenize(text):
+            keys = self.postings.get(token)
+            if keys is None:
+                continue
+            keys.discard(key)
+            if not keys:
+                del self.postings[token]
+
+    def rebuild(self, items: Iterable[tuple]) -> None:
+        """
+        Строит индекс заново.
+
+        :param items: Пары (идентификатор, текст).
+        """
+        self.clear()
+        for key, text in items:
+            self.add(key, text)
+
+    def _match_words(self, words: Set[str]) -> Dict[str, Set[str]]:
+        # Один проход по словарю индекса для всех искомых слов
+        matches: Dict[str, Set[str]] = {word: set() for word in words}
+        for token, keys in self.postings.items():
+            for word in words:
+                if word in token:
+                    matches[word] |= keys
+        return matches
+
+    def lookup(self, keyword: str) -> Set[str]:
+        """
+        Находит записи, содержащие все слова ключевой фразы как подстроки слов текста.
+
+        :param keyword: Ключевое слово или фраза.
+        :return: Множество идентификаторов записей-кандидатов.
+        """
+        return self.query([keyword], mode="and")
+
+    def query(self, keywords: Iterable[str], mode: str = "or") -> Set[str]:
+        """
+        Находит записи по нескольким ключевым словам за один проход по словарю индекса.
+
+        Слова внутри одной ключевой фразы всегда объединяются через AND.
+
+        :param keywords: Ключевые слова или фразы.
+        :param mode: "or" - хотя бы одна фраза, "and" - все фразы.
+        :return: Множество идентификаторов записей-кандидатов.
+        """
+        if mode not in ("or", "and"):
+            raise ValueError(f"Неизвестный режим поиска: {mode}")
+        phrases: List[List[str]] = [TOKEN_RE.findall(keyword.casefold()) for keyword in keywords]
+        matches = self._match_words({word for words in phrases for word in words})
+        result: Set[str] = set()
+        for number, words in enumerate(phrases):
+            keys: Set[str] = set.intersection(*(matches[word] for word in words)) if words else set()
+            if mode == "or":
+                result |= keys
+            else:
+                result = keys if number == 0 else result & keys
+        return result
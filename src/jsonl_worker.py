@@ -0,0 +1,268 @@
+import json
+import os
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+from config import DATA_PATH
+from src.profiling import instrumented
+from src.vacancy import Vacancy
+from src.worker import BaseWorker
+
+TOMBSTONE_FIELD: str = "deleted"
+
+
+class JSONLWorker(BaseWorker):
+    """
+    Класс для работы с вакансиями в формате JSON Lines.
+
+    Каждая вакансия хранится отдельной строкой, новые вакансии дописываются
+    в конец файла без его перезаписи. Вакансии, URL которых уже есть в файле,
+    не дописываются; если повтор все же есть в файле (записан старой версией),
+    действует первая строка. Удаление записывается строкой-надгробием
+    {"deleted": url}, которая отменяет все предыдущие записи с этим URL.
+    Когда доля неактуальных строк превышает порог, файл уплотняется в фоновом потоке.
+    """
+
+    def __init__(self, file_name: str = "vacancies.jsonl", data_path: str = DATA_PATH,
+                 compact_ratio: float = 0.5, compact_min_lines: int = 1000, reset: bool = False) -> None:
+        """
+        Инициализация JSONLWorker с именем файла.
+
+        :param file_name: Имя файла для хранения вакансий.
+        :param data_path: Папка для хранения файла.
+        :param compact_ratio: Доля неактуальных строк, после которой файл уплотняется.
+        :param compact_min_lines: Минимальное количество строк в файле для уплотнения.
+        :param reset: Очистить файл при инициализации.
+        """
+        self.file_path: str = os.path.join(data_path, file_name)
+        self.compact_ratio: float = compact_ratio
+        self.compact_min_lines: int = compact_min_lines
+        self._lock = threading.RLock()
+        self._compaction: Optional[threading.Thread] = None
+        self._live_urls: Set[str] = set()
+        self._total_lines: int = 0
+        self._file_state: tuple = ()
+        self.prepare(reset)
+
+    def prepare(self, reset: bool = False) -> None:
+        """
+        Подготовка файла: создание или очистка и подсчет актуальных записей.
+
+        :param reset: Очистить файл, если он существует.
+        """
+        os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+        if reset or not os.path.exists(self.file_path):
+            open(self.file_path, "w").close()
+        self._live_urls = set()
+        self._total_lines = 0
+        for record in self._iter_lines():
+            self._total_lines += 1
+            if TOMBSTONE_FIELD in record:
+                self._live_urls.discard(record[TOMBSTONE_FIELD])
+            else:
+                # Повтор актуального URL - неактуальная строка
+                self._live_urls.add(record["url"])
+        self.bump_generation()
+
+    def _stat(self) -> tuple:
+        stat = os.stat(self.file_path)
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def bump_generation(self) -> None:
+        """
+        Отметить изменение хранилища и запомнить состояние файла после собственной записи.
+        """
+        super().bump_generation()
+        self._file_state = self._stat()
+
+    def current_generation(self) -> int:
+        """
+        Текущее поколение хранилища с учетом изменений файла извне.
+
+        Если файл изменил другой процесс, счетчики актуальных строк пересчитываются.
+
+        :return: Номер поколения.
+        """
+        with self._lock:
+            if self._stat() != self._file_state:
+                self.prepare()
+        return self._generation
+
+    @property
+    def dead_lines(self) -> int:
+        """
+        Количество строк, не соответствующих актуальным вакансиям.
+        """
+        return self._total_lines - len(self._live_urls)
+
+    def _iter_lines(self) -> Iterator[Dict[str, Any]]:
+        with open(self.file_path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def _append(self, records: List[Dict[str, Any]]) -> None:
+        lines = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+        with self._lock:
+            with open(self.file_path, "a", encoding="utf-8") as f:
+                f.write(lines)
+            self._total_lines += len(records)
+
+    def iter_records(self) -> Iterator[Dict[str, Any]]:
+        """
+        Перебирает актуальные записи файла в порядке добавления.
+
+        Первый проход находит для каждого URL первую строку после его последнего
+        надгробия, второй отдает только эти строки. Оба прохода читают один
+        открытый файл и одни и те же байты: уплотнение подменяет файл через
+        os.replace, а открытый дескриптор продолжает читать прежний, строки,
+        дописанные после первого прохода, во второй не попадают.
+
+        :return: Итератор словарей с данными вакансий.
+        """
+        with open(self.file_path, "rb") as f:
+            # URL -> номер актуальной строки
+            live: Dict[str, int] = {}
+            end = 0
+            number = 0
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # Строка дописывается прямо сейчас, в снимок она не входит
+                    break
+                end += len(line)
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if TOMBSTONE_FIELD in record:
+                    live.pop(record[TOMBSTONE_FIELD], None)
+                else:
+                    live.setdefault(record["url"], number)
+                number += 1
+            f.seek(0)
+            position = 0
+            number = 0
+            for line in f:
+                if position >= end:
+                    break
+                position += len(line)
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if TOMBSTONE_FIELD not in record and live.get(record["url"]) == number:
+                    yield record
+                number += 1
+
+    @instrumented("JSONLWorker.add_vacancies")
+    def add_vacancies(self, vacancies: List[Vacancy]) -> int:
+        """
+        Дописать список вакансий в конец файла.
+
+        Вакансии, URL которых уже есть в файле, пропускаются.
+
+        :param vacancies: Список объектов вакансий.
+        :return: Количество пропущенных дубликатов.
+        """
+        vacancies = list(vacancies)
+        with self._lock:
+            records = []
+            for vacancy in vacancies:
+                if vacancy.url not in self._live_urls:
+                    self._live_urls.add(vacancy.url)
+                    records.append(vacancy.to_dict())
+            if records:
+                self._append(records)
+                self.bump_generation()
+        self.maybe_compact()
+        return len(vacancies) - len(records)
+
+    @instrumented("JSONLWorker.del_vacancy")
+    def del_vacancy(self, vacancy: Vacancy) -> None:
+        """
+        Удалить вакансию, дописав надгробие для ее URL.
+
+        :param vacancy: Объект вакансии для удаления.
+        """
+        with self._lock:
+            if vacancy.url not in self._live_urls:
+                return
+            self._append([{TOMBSTONE_FIELD: vacancy.url}])
+            self._live_urls.remove(vacancy.url)
+            self.bump_generation()
+        self.maybe_compact()
+
+    @instrumented("JSONLWorker.return_list_vacancies")
+    def return_list_vacancies(self) -> List[Vacancy]:
+        """
+        Вернуть список вакансий из файла.
+
+        :return: Список объектов вакансий.
+        """
+        return [Vacancy.from_dict(record) for record in self.iter_records()]
+
+    @instrumented("JSONLWorker.select_vacancy")
+    def select_vacancy(self, keyword: str) -> List[Vacancy]:
+        """
+        Выбрать вакансии по ключевому слову в названии, требованиях или обязанностях.
+
+        :param keyword: Ключевое слово для поиска вакансий.
+        :return: Список объектов вакансий, соответствующих ключевому слову.
+        """
+        return list(self.iter_select(keyword))
+
+    def maybe_compact(self) -> None:
+        """
+        Запустить уплотнение в фоновом потоке, если доля неактуальных строк превышает порог.
+        """
+        with self._lock:
+            if self._total_lines < self.compact_min_lines:
+                return
+            if self.dead_lines / self._total_lines < self.compact_ratio:
+                return
+            if self._compaction is not None and self._compaction.is_alive():
+                return
+            self._compaction = threading.Thread(target=self.compact, daemon=True)
+            self._compaction.start()
+
+    @instrumented("JSONLWorker.compact")
+    def compact(self) -> None:
+        """
+        Перезаписать файл, оставив только актуальные записи.
+
+        На время уплотнения запись в файл блокируется, новый файл
+        подменяет старый атомарно через os.replace.
+        """
+        with self._lock:
+            tmp_path = self.file_path + ".tmp"
+            lines = 0
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for record in self.iter_records():
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    lines += 1
+            os.replace(tmp_path, self.file_path)
+            self._total_lines = lines
+            # Содержимое не изменилось, поэтому поколение остается прежним
+            self._file_state = self._stat()
+
+    def wait_compaction(self) -> None:
+        """
+        Дождаться завершения фонового уплотнения, если оно запущено.
+        """
+        if self._compaction is not None:
+            self._compaction.join()
+
+    def migrate_from_json(self, json_path: str) -> int:
+        """
+        Однократно перенести вакансии из файла в формате JSON-массива (JSONWorker).
+
+        Перенос выполняется только в пустое хранилище, поэтому повторный вызов
+        не создает копий.
+
+        :param json_path: Путь к файлу JSONWorker.
+        :return: Количество перенесенных вакансий.
+        """
+        if self._total_lines:
+            return 0
+        with open(json_path, encoding="utf-8") as f:
+            json_data: List[Dict[str, str]] = json.load(f)
+        vacancies = [Vacancy.from_dict(item) for item in json_data]
+        return len(vacancies) - self.add_vacancies(vacancies)
@@ -0,0 +1,119 @@
+import re
+from typing import Any, Dict, Iterable, List, Optional, Pattern
+
+HIGHLIGHT_RE = re.compile(r"</?highlighttext>")
+
+
+def strip_markup(text: str) -> str:
+    """
+    Удаляет из текста разметку подсветки <highlighttext>, которую добавляет hh.ru.
+
+    :param text: Исходный текст.
+    :return: Текст без разметки.
+    """
+    return HIGHLIGHT_RE.sub("", text) if "<" in text else text
+
+
+def normalize_text(text: str) -> str:
+    """
+    Приводит текст к виду для поиска: без разметки и в нижнем регистре (casefold).
+
+    :param text: Исходный текст.
+    :return: Нормализованный текст.
+    """
+    return strip_markup(text).casefold()
+
+
+def normalize_city(city: str) -> str:
+    """
+    Приводит название города к виду для сравнения: без пробелов по краям и в нижнем регистре (casefold).
+
+    :param city: Название города.
+    :return: Нормализованное название.
+    """
+    return city.strip().casefold()
+
+
+def make_search_text(title: str, requirements: Optional[str], responsibility: Optional[str]) -> str:
+    """
+    Собирает текст вакансии для поиска по словам.
+
+    :param title: Название вакансии.
+    :param requirements: Требования к кандидату.
+    :param responsibility: Обязанности на должности.
+    :return: Название, требования и обязанности через перевод строки, нормализованные normalize_text.
+    """
+    return normalize_text(f"{title}\n{requirements or ''}\n{responsibility or ''}")
+
+
+def record_search_text(record: Dict[str, Any]) -> str:
+    """
+    Текст для поиска из сохраненного словаря вакансии.
+
+    Для записей, сохраненных до появления поля search_text, текст собирается из полей вакансии.
+
+    :param record: Словарь с данными вакансии.
+    :return: Нормализованный текст для поиска.
+    """
+    text = record.get("search_text")
+    if text is None:
+        text = make_search_text(record["title"], record.get("requirements"), record.get("responsibility"))
+    return text
+
+
+class KeywordMatcher:
+    """
+    Поиск многих ключевых слов за один проход по тексту.
+
+    Слова компилируются в одно регулярное выражение-альтернацию, поэтому
+    проверка "есть ли хотя бы одно слово" выполняется одним проходом
+    движка re по тексту независимо от количества слов. Слова нормализуются
+    так же, как текст, поэтому текст для поиска должен быть подготовлен
+    функцией normalize_text.
+    """
+
+    def __init__(self, keywords: Iterable[str]) -> None:
+        """
+        Компилирует список слов.
+
+        :param keywords: Ключевые слова, пустые строки пропускаются.
+        """
+        normalized = (normalize_text(keyword).strip() for keyword in keywords)
+        self.keywords: List[str] = [keyword for keyword in dict.fromkeys(normalized) if keyword]
+        self._pattern: Optional[Pattern[str]] = None
+        if self.keywords:
+            # Длинные слова первыми, чтобы при общем начале находилось более длинное совпадение
+            alternatives = sorted(self.keywords, key=len, reverse=True)
+            self._pattern = re.compile("|".join(map(re.escape, alternatives)))
+
+    def __bool__(self) -> bool:
+        return bool(self.keywords)
+
+    def matches_any(self, text: str) -> bool:
+        """
+        Есть ли в тексте хотя бы одно слово.
+
+        :param text: Нормализованный текст.
+        :return: True, если найдено хотя бы одно слово.
+        """
+        return self._pattern is not None and self._pattern.search(text) is not None
+
+    def matches_all(self, text: str) -> bool:
+        """
+        Есть ли в тексте все слова.
+
+        :param text: Нормализованный текст.
+        :return: True, если найдены все слова.
+        """
+        return bool(self.keywords) and all(keyword in text for keyword in self.keywords)
+
+    def found_keywords(self, text: str) -> List[str]:
+        """
+        Список слов, встречающихся в тексте.
+
+        :param text: Нормализованный текст.
+        :return: Найденные слова в порядке списка слов.
+        """
+        if not self.matches_any(text):
+            return []
+        return [keyword for keyword in self.keywords if keyword in text]
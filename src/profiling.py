@@ -0,0 +1,170 @@
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Границы корзин гистограммы задержек в секундах: 1 мкс * 2^k
+BUCKET_BOUNDS: List[float] = [1e-6 * 2 ** power for power in range(32)]
+
+
+class Histogram:
+    """
+    Гистограмма задержек с логарифмическими корзинами.
+
+    Хранит количество, сумму, минимум и максимум, а перцентили оценивает
+    по верхней границе корзины.
+    """
+
+    __slots__ = ("count", "total", "minimum", "maximum", "buckets")
+
+    def __init__(self) -> None:
+        self.count: int = 0
+        self.total: float = 0.0
+        self.minimum: float = float("inf")
+        self.maximum: float = 0.0
+        self.buckets: List[int] = [0] * (len(BUCKET_BOUNDS) + 1)
+
+    def add(self, seconds: float) -> None:
+        """
+        Добавляет замер.
+
+        :param seconds: Длительность в секундах.
+        """
+        self.count += 1
+        self.total += seconds
+        self.minimum = min(self.minimum, seconds)
+        self.maximum = max(self.maximum, seconds)
+        bucket = 0
+        while bucket < len(BUCKET_BOUNDS) and seconds > BUCKET_BOUNDS[bucket]:
+            bucket += 1
+        self.buckets[bucket] += 1
+
+    def percentile(self, fraction: float) -> float:
+        """
+        Оценивает перцентиль задержки.
+
+        :param fraction: Доля от 0 до 1, например 0.95.
+        :return: Верхняя граница корзины, в которую попадает перцентиль, но не больше максимума.
+        """
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for bucket, amount in enumerate(self.buckets):
+            seen += amount
+            if seen >= rank:
+                bound = BUCKET_BOUNDS[bucket] if bucket < len(BUCKET_BOUNDS) else self.maximum
+                return min(bound, self.maximum)
+        return self.maximum
+
+
+class Metrics:
+    """
+    Реестр таймеров и счетчиков для горячих участков программы.
+
+    По умолчанию выключен: инструментированный код проверяет один флаг
+    и сразу вызывает исходную функцию.
+    """
+
+    def __init__(self) -> None:
+        self.enabled: bool = False
+        self.timers: Dict[str, Histogram] = {}
+        self.counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def reset(self) -> None:
+        """
+        Сбрасывает все накопленные замеры.
+        """
+        with self._lock:
+            self.timers = {}
+            self.counters = {}
+
+    def record(self, name: str, seconds: float) -> None:
+        """
+        Добавляет замер времени этапа.
+
+        :param name: Название этапа.
+        :param seconds: Длительность в секундах.
+        """
+        with self._lock:
+            histogram = self.timers.get(name)
+            if histogram is None:
+                histogram = self.timers[name] = Histogram()
+            histogram.add(seconds)
+
+    def count(self, name: str, value: int = 1) -> None:
+        """
+        Увеличивает счетчик.
+
+        :param name: Название счетчика.
+        :param value: Величина увеличения.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def report(self) -> str:
+        """
+        Формирует таблицу с разбивкой времени по этапам и значениями счетчиков.
+
+        :return: Текст отчета.
+        """
+        lines = [f"{'Этап':<36}{'вызовов':>9}{'всего, мс':>12}{'среднее':>10}{'p50':>10}{'p95':>10}{'макс':>10}"]
+        for name, histogram in sorted(self.timers.items(), key=lambda item: -item[1].total):
+            lines.append(f"{name:<36}{histogram.count:>9}{histogram.total * 1000:>12.1f}"
+                         f"{histogram.total / histogram.count * 1000:>10.2f}"
+                         f"{histogram.percentile(0.5) * 1000:>10.2f}{histogram.percentile(0.95) * 1000:>10.2f}"
+                         f"{histogram.maximum * 1000:>10.2f}")
+        for name, value in sorted(self.counters.items()):
+            lines.append(f"{name:<36}{value:>9}")
+        return "\n".join(lines)
+
+
+metrics: Metrics = Metrics()
+
+
+@contextmanager
+def timer(name: str) -> Iterator[None]:
+    """
+    Измеряет время выполнения блока, если замеры включены.
+
+    :param name: Название этапа.
+    """
+    if not metrics.enabled:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.record(name, time.perf_counter() - start)
+
+
+def instrumented(name: Optional[str] = None) -> Callable[[F], F]:
+    """
+    Декоратор, измеряющий время каждого вызова функции, если замеры включены.
+
+    :param name: Название этапа, по умолчанию - полное имя функции.
+    :return: Декоратор.
+    """
+    def decorator(func: F) -> F:
+        stage = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not metrics.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                metrics.record(stage, time.perf_counter() - start)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
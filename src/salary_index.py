@@ -0,0 +1,201 @@
+from bisect import bisect_left, bisect_right
+from operator import itemgetter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Примерный курс валют hh.ru к рублю; точные курсы можно передать в SalaryIndex
+CURRENCY_RATES: Dict[str, float] = {
+    "RUR": 1.0,
+    "USD": 90.0,
+    "EUR": 100.0,
+    "KZT": 0.19,
+    "BYR": 28.0,
+    "UAH": 2.2,
+    "UZS": 0.0072,
+    "AZN": 53.0,
+    "GEL": 33.0,
+    "KGS": 1.05,
+}
+
+
+def normalize_salary(value: Optional[int], currency: Optional[str] = "RUR",
+                     rates: Optional[Dict[str, float]] = None) -> Optional[int]:
+    """
+    Приводит зарплату к рублям.
+
+    :param value: Зарплата в валюте вакансии, 0 или None - не указана.
+    :param currency: Код валюты hh.ru, None - рубли.
+    :param rates: Курсы валют к рублю, по умолчанию CURRENCY_RATES.
+    :return: Зарплата в рублях или None, если она не указана.
+    """
+    if not value:
+        return None
+    rate = (rates or CURRENCY_RATES).get(currency or "RUR", 1.0)
+    return int(value) if rate == 1.0 else round(int(value) * rate)
+
+
+class _SortedColumn:
+    """
+    Отсортированные значения с ключами записей в параллельных списках.
+    """
+
+    __slots__ = ("values", "keys")
+
+    def __init__(self) -> None:
+        self.values: List[int] = []
+        self.keys: List[str] = []
+
+    def insert(self, value: int, key: str) -> None:
+        position = bisect_right(self.values, value)
+        self.values.insert(position, value)
+        self.keys.insert(position, key)
+
+    def remove(self, value: int, key: str) -> None:
+        position = bisect_left(self.values, value)
+        while self.keys[position] != key:
+            position += 1
+        del self.values[position]
+        del self.keys[position]
+
+    def fill(self, pairs: List[Tuple[int, str]]) -> None:
+        # Устойчивая сортировка сохраняет порядок добавления при равных значениях, как insert
+        pairs.sort(key=itemgetter(0))
+        self.values = [value for value, _ in pairs]
+        self.keys = [key for _, key in pairs]
+
+    def range(self, low: Optional[int], high: Optional[int]) -> Tuple[int, int]:
+        start = 0 if low is None else bisect_left(self.values, low)
+        end = len(self.values) if high is None else bisect_right(self.values, high)
+        return start, end
+
+
+class SalaryIndex:
+    """
+    Отсортированный индекс зарплат: запросы по диапазону через bisect за O(log n + k).
+
+    Зарплаты приводятся к рублям при добавлении, незаполненная граница
+    вилки заменяется другой границей, вакансии без зарплаты в индекс не попадают.
+    Для поиска пересечений вилок индекс хранит самую широкую вилку:
+    вилка [from, to] пересекает [X, Y], только если from лежит в [X - ширина, Y].
+    """
+
+    def __init__(self, rates: Optional[Dict[str, float]] = None) -> None:
+        """
+        Инициализация пустого индекса.
+
+        :param rates: Курсы валют к рублю, по умолчанию CURRENCY_RATES.
+        """
+        self.rates: Dict[str, float] = rates or CURRENCY_RATES
+        self.ranges: Dict[str, Tuple[Optional[int], int, int]] = {}
+        self._from = _SortedColumn()
+        self._low = _SortedColumn()
+        self._max_width: int = 0
+
+    def __len__(self) -> int:
+        return len(self.ranges)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.ranges
+
+    def clear(self) -> None:
+        """
+        Очищает индекс.
+        """
+        self.ranges = {}
+        self._from = _SortedColumn()
+        self._low = _SortedColumn()
+        self._max_width = 0
+
+    def _normalize(self, salary_from: Optional[int], salary_to: Optional[int],
+                   currency: Optional[str]) -> Optional[Tuple[Optional[int], int, int]]:
+        normalized_from = normalize_salary(salary_from, currency, self.rates)
+        normalized_to = normalize_salary(salary_to, currency, self.rates)
+        if normalized_from is None and normalized_to is None:
+            return None
+        low = normalized_from if normalized_from is not None else normalized_to
+        high = normalized_to if normalized_to is not None else normalized_from
+        return normalized_from, min(low, high), max(low, high)
+
+    def add(self, key: str, salary_from: Optional[int], salary_to: Optional[int],
+            currency: Optional[str] = "RUR") -> None:
+        """
+        Добавляет или заменяет зарплату записи.
+
+        :param key: Идентификатор записи.
+        :param salary_from: Минимальная зарплата в валюте вакансии, 0 или None - не указана.
+        :param salary_to: Максимальная зарплата в валюте вакансии, 0 или None - не указана.
+        :param currency: Код валюты hh.ru.
+        """
+        self.remove(key)
+        entry = self._normalize(salary_from, salary_to, currency)
+        if entry is None:
+            return
+        normalized_from, low, high = entry
+        self.ranges[key] = entry
+        if normalized_from is not None:
+            self._from.insert(normalized_from, key)
+        self._low.insert(low, key)
+        self._max_width = max(self._max_width, high - low)
+
+    def remove(self, key: str) -> None:
+        """
+        Удаляет запись из индекса, если она там есть.
+
+        :param key: Идентификатор записи.
+        """
+        entry = self.ranges.pop(key, None)
+        if entry is None:
+            return
+        # Ширина самой широкой вилки не уменьшается до rebuild: это лишь расширяет окно поиска
+        normalized_from, low, _ = entry
+        if normalized_from is not None:
+            self._from.remove(normalized_from, key)
+        self._low.remove(low, key)
+
+    def rebuild(self, items: Iterable[Tuple[str, Optional[int], Optional[int], Optional[str]]]) -> None:
+        """
+        Строит индекс заново.
+
+        :param items: Кортежи (идентификатор, зарплата от, зарплата до, валюта).
+        """
+        self.clear()
+        from_pairs: List[Tuple[int, str]] = []
+        low_pairs: List[Tuple[int, str]] = []
+        for key, salary_from, salary_to, currency in items:
+            self.ranges.pop(key, None)
+            entry = self._normalize(salary_from, salary_to, currency)
+            if entry is not None:
+                self.ranges[key] = entry
+        # Списки сортируются один раз, а не вставкой каждой записи
+        for key, (normalized_from, low, high) in self.ranges.items():
+            if normalized_from is not None:
+                from_pairs.append((normalized_from, key))
+            low_pairs.append((low, key))
+            self._max_width = max(self._max_width, high - low)
+        self._from.fill(from_pairs)
+        self._low.fill(low_pairs)
+
+    def from_range(self, low: Optional[int] = None, high: Optional[int] = None) -> List[str]:
+        """
+        Записи, у которых минимальная зарплата указана и лежит в диапазоне.
+
+        :param low: Нижняя граница в рублях или None.
+        :param high: Верхняя граница в рублях или None.
+        :return: Идентификаторы записей по возрастанию минимальной зарплаты.
+        """
+        start, end = self._from.range(low, high)
+        return self._from.keys[start:end]
+
+    def overlaps(self, low: Optional[int] = None, high: Optional[int] = None) -> List[str]:
+        """
+        Записи, вилка зарплаты которых пересекает диапазон [low, high].
+
+        :param low: Нижняя граница в рублях или None.
+        :param high: Верхняя граница в рублях или None.
+        :return: Идентификаторы записей по возрастанию нижней границы вилки.
+        """
+        if low is None:
+            start, end = self._low.range(None, high)
+            return self._low.keys[start:end]
+        start, end = self._low.range(low - self._max_width, high)
+        ranges = self.ranges
+        return [key for key in self._low.keys[start:end] if ranges[key][2] >= low]
@@ -0,0 +1,431 @@
+import hashlib
+import heapq
+import os
+import zlib
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from config import DATA_PATH
+from src.matcher import normalize_city
+from src.profiling import instrumented
+from src.salary_index import normalize_salary
+from src.topn import top_records
+from src.vacancy import Vacancy
+from src.worker import JOURNAL_SUFFIX, BaseWorker, JSONWorker, file_state
+
+PARTITIONS: tuple = ("city", "hash")
+
+# Открытые хранилища частей в текущем процессе: процесс пула держит части
+# в памяти между запросами и перечитывает файл, только если его изменили
+_open_shards: Dict[str, JSONWorker] = {}
+
+
+def _shard_worker(file_path: str) -> JSONWorker:
+    """
+    Хранилище одной части, открытое в текущем процессе.
+
+    :param file_path: Путь к файлу части.
+    :return: Объект JSONWorker.
+    """
+    worker = _open_shards.get(file_path)
+    if worker is None:
+        worker = JSONWorker(os.path.basename(file_path), os.path.dirname(file_path), reset=False)
+        _open_shards[file_path] = worker
+    return worker
+
+
+def _forget_shard(file_path: str) -> None:
+    _open_shards.pop(file_path, None)
+
+
+def _row(record: Dict[str, Any]) -> tuple:
+    """
+    Аргументы конструктора Vacancy для записи хранилища.
+
+    Процессы пула возвращают кортежи, а не объекты Vacancy или словари:
+    кортеж без имен полей вдвое быстрее передается между процессами.
+
+    :param record: Словарь с данными вакансии.
+    :return: Кортеж аргументов Vacancy.
+    """
+    return (record["title"], record["url"], int(record["salary_from"] or 0), int(record["salary_to"] or 0),
+            record["requirements"], record["responsibility"], record["city"], record.get("currency", "RUR"),
+            record.get("search_text"))
+
+
+def _row_salary(row: tuple) -> int:
+    return normalize_salary(row[2], row[7]) or 0
+
+
+def _scan_all(file_path: str) -> List[tuple]:
+    return [_row(record) for record in _shard_worker(file_path).iter_records()]
+
+
+def _scan_select(file_path: str, keyword: str) -> List[tuple]:
+    return [_row(record) for record in _shard_worker(file_path).select_records([keyword])]
+
+
+def _scan_salary(file_path: str, min_salary: int, max_salary: Optional[int]) -> List[tuple]:
+    return [_row(record) for record in _shard_worker(file_path).salary_records(min_salary, max_salary)]
+
+
+def _scan_query(file_path: str, keywords: Optional[List[str]], min_salary: Optional[int], city: Optional[str],
+                limit: Optional[int]) -> List[tuple]:
+    # Часть отдает только свои limit лучших записей
+    return [_row(vacancy.to_dict()) for vacancy in _shard_worker(file_path).query(keywords, min_salary, city, limit)]
+
+
+class ShardedWorker(BaseWorker):
+    """
+    Хранилище вакансий, разбитое на части в отдельных файлах JSON.
+
+    Вакансии распределяются по частям по городу (partition="city") или по
+    хэшу URL, в котором содержится id вакансии (partition="hash"). Каждая часть -
+    обычный JSONWorker, поэтому запись меняет только файл своей части. Запрос
+    с городом при разбиении по городу читает одну часть, остальные запросы
+    выполняются по всем частям параллельно в пуле процессов, а результаты
+    объединяются. Процессы пула держат прочитанные части в памяти между
+    запросами, поэтому повторный запрос не разбирает файлы заново.
+    """
+
+    def __init__(self, dir_name: str = "vacancies_shards", data_path: str = DATA_PATH, reset: bool = True,
+                 partition: str = "city", shards: int = 8, max_workers: Optional[int] = None) -> None:
+        """
+        Инициализация хранилища.
+
+        :param dir_name: Имя папки с файлами частей.
+        :param data_path: Папка для хранения.
+        :param reset: Удалить существующие части при инициализации.
+        :param partition: "city" - часть на каждый город, "hash" - shards частей по хэшу URL.
+        :param shards: Количество частей при разбиении по хэшу.
+        :param max_workers: Количество процессов пула, по умолчанию - по числу ядер, 1 - без пула.
+        """
+        if partition not in PARTITIONS:
+            raise ValueError(f"Неизвестный способ разбиения: {partition}, допустимо: {', '.join(PARTITIONS)}")
+        if shards < 1:
+            raise ValueError("Количество частей должно быть положительным")
+        self.dir_path: str = os.path.abspath(os.path.join(data_path, dir_name))
+        self.partition: str = partition
+        self.shards: int = shards
+        self.max_workers: int = max_workers or os.cpu_count() or 1
+        self._executor: Optional[Executor] = None
+        self._shard_state: Optional[tuple] = None
+        # URL -> путь к части при разбиении по городу и состояние файлов частей, по которому он построен
+        self._url_shards: Optional[Dict[str, str]] = None
+        self._url_shards_state: Optional[tuple] = None
+        self.prepare(reset)
+
+    def prepare(self, reset: bool = True) -> None:
+        """
+        Подготовка папки частей: создание или очистка.
+
+        :param reset: Удалить существующие части.
+        """
+        os.makedirs(self.dir_path, exist_ok=True)
+        if reset:
+            for file_path in self.shard_paths():
+                _forget_shard(file_path)
+                os.remove(file_path)
+                for suffix in (".index", JOURNAL_SUFFIX):
+                    if os.path.exists(file_path + suffix):
+                        os.remove(file_path + suffix)
+            self._url_shards = None
+            self.bump_generation()
+
+    def close(self) -> None:
+        """
+        Остановить пул процессов.
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self) -> 'ShardedWorker':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def shard_name(self, vacancy: Vacancy) -> str:
+        """
+        Имя файла части, в которой хранится вакансия.
+
+        :param vacancy: Объект вакансии.
+        :return: Имя файла части.
+        """
+        if self.partition == "city":
+            return self.city_shard_name(vacancy.city)
+        return self.hash_shard_name(vacancy.url)
+
+    def hash_shard_name(self, url: str) -> str:
+        """
+        Имя файла части вакансии при разбиении по хэшу URL.
+
+        :param url: URL вакансии.
+        :return: Имя файла части.
+        """
+        # crc32, а не hash(): встроенный хэш строк меняется между запусками
+        return f"shard_{zlib.crc32(url.encode('utf-8')) % self.shards:03d}.json"
+
+    @staticmethod
+    def city_shard_name(city: str) -> str:
+        """
+        Имя файла части города при разбиении по городу.
+
+        Названия, которые отличаются только регистром или пробелами по краям, попадают в одну часть,
+        так же как query сравнивает город.
+
+        :param city: Город.
+        :return: Имя файла части.
+        """
+        return f"city_{hashlib.md5(normalize_city(city).encode('utf-8')).hexdigest()[:16]}.json"
+
+    def shard_paths(self) -> List[str]:
+        """
+        Пути к файлам существующих частей.
+
+        :return: Отсортированный список путей.
+        """
+        return [os.path.join(self.dir_path, name) for name in sorted(os.listdir(self.dir_path))
+                if name.endswith(".json")]
+
+    def _group(self, vacancies: Iterable[Vacancy]) -> Dict[str, List[Vacancy]]:
+        groups: Dict[str, List[Vacancy]] = {}
+        for vacancy in vacancies:
+            groups.setdefault(os.path.join(self.dir_path, self.shard_name(vacancy)), []).append(vacancy)
+        return groups
+
+    def _files_state(self) -> tuple:
+        return tuple((file_path, file_state(file_path)) for file_path in self.shard_paths())
+
+    def _url_map(self) -> Dict[str, str]:
+        """
+        Части, в которых хранятся вакансии, при разбиении по городу.
+
+        Карта строится по записям частей при первом обращении и обновляется
+        при записи через этот объект; если файлы частей изменили извне, она строится заново.
+
+        :return: Словарь URL -> путь к файлу части.
+        """
+        state = self._files_state()
+        if self._url_shards is None or state != self._url_shards_state:
+            self._url_shards = {record["url"]: file_path for file_path in self.shard_paths()
+                                for record in _shard_worker(file_path).iter_records()}
+            self._url_shards_state = state
+        return self._url_shards
+
+    def _located(self, urls: Iterable[str]) -> Dict[str, List[str]]:
+        """
+        Сгруппировать URL по частям, в которых хранятся вакансии.
+
+        :param urls: URL вакансий.
+        :return: Словарь путь к файлу части -> URL вакансий этой части; URL, которых нет в хранилище, пропускаются.
+        """
+        groups: Dict[str, List[str]] = {}
+        if self.partition == "city":
+            url_shards = self._url_map()
+            for url in urls:
+                if url in url_shards:
+                    groups.setdefault(url_shards[url], []).append(url)
+        else:
+            for url in urls:
+                file_path = os.path.join(self.dir_path, self.hash_shard_name(url))
+                if os.path.exists(file_path):
+                    groups.setdefault(file_path, []).append(url)
+        return groups
+
+    def _changed(self) -> None:
+        """
+        После записи через этот объект: запомнить состояние файлов для карты частей и сменить поколение.
+        """
+        if self._url_shards is not None:
+            self._url_shards_state = self._files_state()
+        self.bump_generation()
+
+    def _scan(self, func: Callable[..., Any], paths: List[str], *args: Any) -> List[Any]:
+        """
+        Выполнить функцию по каждой части: в пуле процессов, если частей больше одной.
+
+        :param func: Функция модуля, первым аргументом получает путь к части.
+        :param paths: Пути к частям.
+        :param args: Остальные аргументы функции.
+        :return: Результаты в порядке частей.
+        """
+        if self.max_workers == 1 or len(paths) < 2:
+            return [func(file_path, *args) for file_path in paths]
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        futures = [self._executor.submit(func, file_path, *args) for file_path in paths]
+        return [future.result() for future in futures]
+
+    def current_generation(self) -> int:
+        """
+        Текущее поколение хранилища с учетом изменений файлов частей извне.
+
+        :return: Номер поколения.
+        """
+        state = self._files_state()
+        if state != self._shard_state:
+            self._shard_state = state
+            self.bump_generation()
+        return self._generation
+
+    @instrumented("ShardedWorker.add_vacancies")
+    def add_vacancies(self, vacancies: List[Vacancy]) -> int:
+        """
+        Добавить вакансии, каждую в файл своей части.
+
+        Вакансии, URL которых уже есть в хранилище, пропускаются, в том числе
+        при разбиении по городу, если сохраненная вакансия в части другого города.
+
+        :param vacancies: Список объектов вакансий.
+        :return: Количество пропущенных дубликатов.
+        """
+        skipped = 0
+        if self.partition == "city":
+            url_shards = self._url_map()
+            first: Dict[str, Vacancy] = {}
+            for vacancy in vacancies:
+                if vacancy.url not in url_shards:
+                    first.setdefault(vacancy.url, vacancy)
+            skipped += len(vacancies) - len(first)
+            vacancies = list(first.values())
+        for file_path, group in self._group(vacancies).items():
+            skipped += _shard_worker(file_path).add_vacancies(group)
+            if self.partition == "city":
+                for vacancy in group:
+                    url_shards.setdefault(vacancy.url, file_path)
+        self._changed()
+        return skipped
+
+    @instrumented("ShardedWorker.upsert_vacancies")
+    def upsert_vacancies(self, vacancies: List[Vacancy]) -> Dict[str, int]:
+        """
+        Добавить новые вакансии и обновить уже сохраненные с теми же URL.
+
+        При разбиении по городу вакансия, сменившая город, удаляется из части прежнего города.
+
+        :param vacancies: Список объектов вакансий.
+        :return: Количество добавленных (inserted), обновленных (updated) и пропущенных (skipped) вакансий.
+        """
+        stats = {"inserted": 0, "updated": 0, "skipped": 0}
+        if self.partition == "city":
+            url_shards = self._url_map()
+            # При повторе URL в пачке остается последняя вакансия, как при обновлении в одной части
+            vacancies = list({vacancy.url: vacancy for vacancy in vacancies}.values())
+        groups = self._group(vacancies)
+        for file_path, group in groups.items():
+            for key, value in _shard_worker(file_path).upsert_vacancies(group).items():
+                stats[key] += value
+        if self.partition == "city":
+            moved: Dict[str, List[str]] = {}
+            for file_path, group in groups.items():
+                for vacancy in group:
+                    old_path = url_shards.get(vacancy.url)
+                    if old_path is not None and old_path != file_path:
+                        moved.setdefault(old_path, []).append(vacancy.url)
+                    url_shards[vacancy.url] = file_path
+            # Прежняя копия удаляется только из части, где она хранится
+            for old_path, urls in moved.items():
+                moved_count = _shard_worker(old_path).delete_many(urls)
+                stats["inserted"] -= moved_count
+                stats["updated"] += moved_count
+        self._changed()
+        return stats
+
+    @instrumented("ShardedWorker.del_vacancy")
+    def del_vacancy(self, vacancy: Vacancy) -> None:
+        """
+        Удалить вакансию из части, в которой она хранится.
+
+        При разбиении по городу часть находится по URL, поэтому вакансия удаляется,
+        даже если город в переданном объекте отличается от сохраненного.
+
+        :param vacancy: Объект вакансии для удаления.
+        """
+        self.delete_many([vacancy.url])
+
+    @instrumented("ShardedWorker.delete_many")
+    def delete_many(self, urls: Iterable[str]) -> int:
+        """
+        Удалить вакансии по их URL.
+
+        Каждый URL удаляется только из части, в которой хранится вакансия.
+
+        :param urls: URL вакансий для удаления.
+        :return: Количество удаленных вакансий.
+        """
+        deleted = 0
+        for file_path, group in self._located(urls).items():
+            deleted += _shard_worker(file_path).delete_many(group)
+            if self.partition == "city":
+                for url in group:
+                    self._url_shards.pop(url, None)
+        if deleted:
+            self._changed()
+        return deleted
+
+    def iter_records(self) -> Iterator[Dict[str, Any]]:
+        """
+        Перебрать вакансии всех частей в виде словарей, читая файлы частями.
+
+        :return: Итератор словарей с данными вакансий.
+        """
+        for file_path in self.shard_paths():
+            yield from _shard_worker(file_path).iter_file_records()
+
+    @instrumented("ShardedWorker.return_list_vacancies")
+    def return_list_vacancies(self) -> List[Vacancy]:
+        """
+        Вернуть список вакансий всех частей, части читаются параллельно.
+
+        :return: Список объектов вакансий.
+        """
+        return [Vacancy(*row) for part in self._scan(_scan_all, self.shard_paths()) for row in part]
+
+    @instrumented("ShardedWorker.select_vacancy")
+    def select_vacancy(self, keyword: str) -> List[Vacancy]:
+        """
+        Выбрать вакансии по ключевому слову, части просматриваются параллельно.
+
+        :param keyword: Ключевое слово для поиска вакансий.
+        :return: Список объектов вакансий в порядке частей.
+        """
+        return [Vacancy(*row) for part in self._scan(_scan_select, self.shard_paths(), keyword) for row in part]
+
+    @instrumented("ShardedWorker.select_by_salary")
+    def select_by_salary(self, min_salary: int, max_salary: Optional[int] = None) -> List[Vacancy]:
+        """
+        Выбрать вакансии с минимальной зарплатой в диапазоне по индексам зарплат частей.
+
+        Каждая часть отдает вакансии по возрастанию зарплаты, списки частей сливаются.
+
+        :param min_salary: Нижняя граница минимальной зарплаты в рублях.
+        :param max_salary: Верхняя граница минимальной зарплаты в рублях или None.
+        :return: Список объектов вакансий по возрастанию минимальной зарплаты.
+        """
+        parts = self._scan(_scan_salary, self.shard_paths(), min_salary, max_salary)
+        return [Vacancy(*row) for row in heapq.merge(*parts, key=_row_salary)]
+
+    def _query_paths(self, city: Optional[str]) -> List[str]:
+        if city is None or self.partition != "city":
+            return self.shard_paths()
+        file_path = os.path.join(self.dir_path, self.city_shard_name(city))
+        return [file_path] if os.path.exists(file_path) else []
+
+    def _query(self, keywords: Optional[List[str]], min_salary: Optional[int], city: Optional[str],
+               limit: Optional[int]) -> List[Vacancy]:
+        """
+        Выполнить запрос без кэша.
+
+        Запрос с городом при разбиении по городу читает только часть этого города.
+        Иначе каждая часть отбирает свои limit лучших записей, а из них выбираются общие лучшие.
+
+        :param keywords: Слова в нижнем регистре, хотя бы одно из которых должно быть в тексте вакансии, или None.
+        :param min_salary: Минимальная зарплата в рублях или None.
+        :param city: Город, приведенный normalize_city, или None.
+        :param limit: Количество вакансий или None для всех подходящих.
+        :return: Список вакансий по убыванию минимальной зарплаты в рублях.
+        """
+        parts: List[List[tuple]] = self._scan(_scan_query, self._query_paths(city), keywords, min_salary, city, limit)
+        return [Vacancy(*row) for row in top_records((row for part in parts for row in part), limit, key=_row_salary)]
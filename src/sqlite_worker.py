@@ -0,0 +1,263 @@
+import os
+import sqlite3
+from typing import Any, List, Optional, Tuple
+
+from config import DATA_PATH
+from src.matcher import normalize_city
+from src.profiling import instrumented
+from src.salary_index import normalize_salary
+from src.vacancy import Vacancy
+from src.worker import BaseWorker
+
+SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS vacancies (
+    id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    url TEXT NOT NULL,
+    salary_from INTEGER NOT NULL DEFAULT 0,
+    salary_to INTEGER NOT NULL DEFAULT 0,
+    requirements TEXT NOT NULL DEFAULT '',
+    responsibility TEXT NOT NULL DEFAULT '',
+    city TEXT NOT NULL DEFAULT '',
+    currency TEXT NOT NULL DEFAULT 'RUR',
+    salary_rub INTEGER,
+    city_key TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_vacancies_salary_from ON vacancies (salary_from);
+CREATE INDEX IF NOT EXISTS idx_vacancies_salary_rub ON vacancies (salary_rub);
+CREATE INDEX IF NOT EXISTS idx_vacancies_city_key ON vacancies (city_key);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_vacancies_url ON vacancies (url);
+"""
+
+FTS_SCHEMA: str = """
+CREATE VIRTUAL TABLE IF NOT EXISTS vacancies_fts USING fts5 (
+    title, requirements, responsibility, content='vacancies', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS vacancies_ai AFTER INSERT ON vacancies BEGIN
+    INSERT INTO vacancies_fts (rowid, title, requirements, responsibility)
+    VALUES (new.id, new.title, new.requirements, new.responsibility);
+END;
+CREATE TRIGGER IF NOT EXISTS vacancies_ad AFTER DELETE ON vacancies BEGIN
+    INSERT INTO vacancies_fts (vacancies_fts, rowid, title, requirements, responsibility)
+    VALUES ('delete', old.id, old.title, old.requirements, old.responsibility);
+END;
+"""
+
+COLUMNS: str = "title, url, salary_from, salary_to, requirements, responsibility, city, currency"
+# Минимальная зарплата в рублях хранится отдельной колонкой (NULL - не указана), по ней фильтруют и сортируют.
+# Город для сравнения (normalize_city) - тоже: регистр кириллицы SQLite сам не сравнивает
+INSERT_COLUMNS: str = COLUMNS + ", salary_rub, city_key"
+
+
+def fts_query(text: str, column: Optional[str] = None) -> str:
+    """
+    Преобразует строку поиска в запрос FTS5.
+
+    Каждое слово экранируется и ищется по префиксу, слова объединяются через AND.
+
+    :param text: Строка поиска.
+    :param column: Колонка для поиска или None для поиска по всем текстовым полям.
+    :return: Строка запроса для оператора MATCH.
+    """
+    terms = ['"' + word.replace('"', '""') + '"*' for word in text.split()]
+    query = " AND ".join(terms)
+    return f"{column} : ({query})" if column else query
+
+
+class SQLiteWorker(BaseWorker):
+    """
+    Класс для работы с вакансиями в базе данных SQLite.
+
+    Минимальная зарплата в рублях и город для сравнения проиндексированы B-деревом, название, требования
+    и обязанности - полнотекстовым индексом FTS5. Запросы выполняются
+    в базе данных без загрузки всех вакансий в память.
+    """
+
+    def __init__(self, file_name: str = "vacancies.db", data_path: str = DATA_PATH, reset: bool = False) -> None:
+        """
+        Инициализация SQLiteWorker с именем файла базы данных.
+
+        :param file_name: Имя файла базы данных.
+        :param data_path: Папка для хранения файла.
+        :param reset: Удалить все вакансии при инициализации.
+        """
+        os.makedirs(data_path, exist_ok=True)
+        self.file_path: str = os.path.join(data_path, file_name)
+        self.connection = sqlite3.connect(self.file_path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self._data_version: int = 0
+        self.prepare(reset)
+
+    def prepare(self, reset: bool = False) -> None:
+        """
+        Создание таблиц и индексов, при необходимости - очистка базы.
+
+        :param reset: Удалить все вакансии.
+        """
+        with self.connection:
+            self.connection.executescript(SCHEMA)
+            self.connection.executescript(FTS_SCHEMA)
+            if reset:
+                self.connection.execute("DELETE FROM vacancies")
+        self.bump_generation()
+
+    def current_generation(self) -> int:
+        """
+        Текущее поколение хранилища с учетом записей через другие соединения.
+
+        PRAGMA data_version меняется, когда другое соединение фиксирует изменения в базе.
+
+        :return: Номер поколения.
+        """
+        data_version = self.connection.execute("PRAGMA data_version").fetchone()[0]
+        if data_version != self._data_version:
+            self._data_version = data_version
+            self.bump_generation()
+        return self._generation
+
+    def close(self) -> None:
+        """
+        Закрыть соединение с базой данных.
+        """
+        self.connection.close()
+
+    def _select(self, where: str = "", params: Tuple[Any, ...] = (), order: str = "id",
+                limit: Optional[int] = None) -> List[Vacancy]:
+        sql = f"SELECT {COLUMNS} FROM vacancies"
+        if where:
+            sql += f" WHERE {where}"
+        sql += f" ORDER BY {order}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params += (limit,)
+        return [Vacancy(*row) for row in self.connection.execute(sql, params)]
+
+    def _filtered(self, match: Optional[str], min_salary: Optional[int], city: Optional[str],
+                  limit: Optional[int]) -> List[Vacancy]:
+        conditions: List[str] = []
+        params: Tuple[Any, ...] = ()
+        if match is not None:
+            conditions.append("id IN (SELECT rowid FROM vacancies_fts WHERE vacancies_fts MATCH ?)")
+            params += (match,)
+        if min_salary is not None and min_salary > 0:
+            # Незаполненная зарплата считается нулевой, поэтому условие с нулем пропускает все вакансии
+            conditions.append("salary_rub >= ?")
+            params += (min_salary,)
+        if city is not None:
+            conditions.append("city_key = ?")
+            params += (normalize_city(city),)
+        return self._select(" AND ".join(conditions), params, "salary_rub DESC, id", limit)
+
+    @instrumented("SQLiteWorker.add_vacancies")
+    def add_vacancies(self, vacancies: List[Vacancy]) -> int:
+        """
+        Добавить список вакансий одной транзакцией.
+
+        Вакансии, URL которых уже есть в базе, пропускаются: URL проиндексирован уникальным индексом.
+
+        :param vacancies: Список объектов вакансий.
+        :return: Количество пропущенных дубликатов.
+        """
+        vacancies = list(vacancies)
+        rows = ((vacancy.title, vacancy.url, vacancy.salary_from, vacancy.salary_to, vacancy.requirements,
+                 vacancy.responsibility, vacancy.city, vacancy.currency,
+                 normalize_salary(vacancy.salary_from, vacancy.currency), normalize_city(vacancy.city))
+                for vacancy in vacancies)
+        with self.connection:
+            inserted = self.connection.executemany(
+                f"INSERT OR IGNORE INTO vacancies ({INSERT_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows).rowcount
+        if inserted:
+            self.bump_generation()
+        return len(vacancies) - inserted
+
+    @instrumented("SQLiteWorker.del_vacancy")
+    def del_vacancy(self, vacancy: Vacancy) -> None:
+        """
+        Удалить вакансию по ее URL.
+
+        :param vacancy: Объект вакансии для удаления.
+        """
+        with self.connection:
+            self.connection.execute("DELETE FROM vacancies WHERE url = ?", (vacancy.url,))
+        self.bump_generation()
+
+    @instrumented("SQLiteWorker.return_list_vacancies")
+    def return_list_vacancies(self) -> List[Vacancy]:
+        """
+        Вернуть список всех вакансий.
+
+        :return: Список объектов вакансий.
+        """
+        return self._select()
+
+    @instrumented("SQLiteWorker.select_vacancy")
+    def select_vacancy(self, keyword: str) -> List[Vacancy]:
+        """
+        Выбрать вакансии, в названии которых есть слова, начинающиеся с ключевого слова.
+
+        :param keyword: Ключевое слово для поиска вакансий.
+        :return: Список объектов вакансий, соответствующих ключевому слову.
+        """
+        if not keyword.split():
+            return self._select()
+        return self._select("id IN (SELECT rowid FROM vacancies_fts WHERE vacancies_fts MATCH ?)",
+                            (fts_query(keyword, "title"),))
+
+    @instrumented("SQLiteWorker.search")
+    def search(self, text: str = "", min_salary: Optional[int] = None, city: Optional[str] = None,
+               limit: Optional[int] = None) -> List[Vacancy]:
+        """
+        Найти вакансии по тексту в названии, требованиях и обязанностях с фильтрами.
+
+        Результат отсортирован по убыванию минимальной зарплаты в рублях.
+
+        :param text: Слова для полнотекстового поиска, пустая строка - без фильтра.
+        :param min_salary: Минимальная зарплата в рублях или None.
+        :param city: Город (без учета регистра) или None.
+        :param limit: Максимальное количество вакансий или None.
+        :return: Список объектов вакансий.
+        """
+        return self._filtered(fts_query(text) if text.split() else None, min_salary, city, limit)
+
+    @instrumented("SQLiteWorker.query")
+    def _query(self, keywords: Optional[List[str]], min_salary: Optional[int], city: Optional[str],
+               limit: Optional[int]) -> List[Vacancy]:
+        """
+        Найти вакансии по условиям, выполнив фильтрацию, сортировку и LIMIT в SQL.
+
+        Слова ищутся полнотекстовым индексом по названию, требованиям и обязанностям,
+        то есть по началу слов, а не по любой подстроке, как в остальных хранилищах.
+
+        :param keywords: Слова в нижнем регистре, хотя бы одно из которых должно быть в тексте вакансии, или None.
+        :param min_salary: Минимальная зарплата в рублях или None.
+        :param city: Город, приведенный normalize_city, или None.
+        :param limit: Количество вакансий или None для всех подходящих.
+        :return: Список вакансий по убыванию минимальной зарплаты в рублях.
+        """
+        keywords = [keyword for keyword in keywords or [] if keyword.split()]
+        match = " OR ".join(f"({fts_query(keyword)})" for keyword in keywords)
+        return self._filtered(match or None, min_salary, city, limit)
+
+    def select_by_salary(self, min_salary: int, max_salary: Optional[int] = None) -> List[Vacancy]:
+        """
+        Выбрать вакансии с минимальной зарплатой в заданном диапазоне.
+
+        Зарплаты сравниваются в рублях, вакансии без минимальной зарплаты не выбираются.
+
+        :param min_salary: Нижняя граница минимальной зарплаты в рублях.
+        :param max_salary: Верхняя граница минимальной зарплаты в рублях или None.
+        :return: Список объектов вакансий по возрастанию минимальной зарплаты.
+        """
+        if max_salary is None:
+            return self._select("salary_rub >= ?", (min_salary,), "salary_rub, id")
+        return self._select("salary_rub BETWEEN ? AND ?", (min_salary, max_salary), "salary_rub, id")
+
+    def count(self) -> int:
+        """
+        Количество вакансий в базе.
+
+        :return: Количество вакансий.
+        """
+        return self.connection.execute("SELECT COUNT(*) FROM vacancies").fetchone()[0]
@@ -0,0 +1,74 @@
+import json
+from typing import Any, Iterator
+
+DEFAULT_CHUNK_SIZE: int = 64 * 1024
+WHITESPACE: str = " \t\n\r"
+
+
+def iter_json_array(file_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Any]:
+    """
+    Читает элементы JSON-массива из файла по одному, не загружая файл целиком.
+
+    Файл читается частями по chunk_size символов, каждый элемент разбирается
+    json.JSONDecoder.raw_decode, как только он полностью оказался в буфере.
+    В памяти находится не больше одной части файла и одного элемента.
+
+    :param file_path: Путь к файлу с JSON-массивом.
+    :param chunk_size: Размер читаемой части файла в символах.
+    :return: Итератор элементов массива.
+    """
+    decoder = json.JSONDecoder()
+    with open(file_path, encoding="utf-8") as f:
+        buffer = ""
+        position = 0
+        eof = False
+
+        def fill() -> bool:
+            nonlocal buffer, position, eof
+            chunk = f.read(chunk_size)
+            if not chunk:
+                eof = True
+                return False
+            buffer = buffer[position:] + chunk
+            position = 0
+            return True
+
+        def skip(allowed: str) -> str:
+            # Пропускает пробелы и возвращает следующий значимый символ, не сдвигаясь за него
+            nonlocal position
+            while True:
+                while position < len(buffer) and buffer[position] in WHITESPACE:
+                    position += 1
+                if position < len(buffer):
+                    char = buffer[position]
+                    if char not in allowed:
+                        raise ValueError(f"Неожиданный символ {char!r} в {file_path}")
+                    return char
+                if not fill():
+                    raise ValueError(f"Неожиданный конец файла {file_path}")
+
+        skip("[")
+        position += 1
+        if skip("]{[\"-0123456789tfn") == "]":
+            return
+        while True:
+            while True:
+                try:
+                    item, end = decoder.raw_decode(buffer, position)
+                except json.JSONDecodeError:
+                    if eof or not fill():
+                        raise
+                    continue
+                if not eof and not isinstance(item, (dict, list, str)):
+                    # Число на границе части файла могло быть прочитано не полностью:
+                    # дочитываем, пока за ним не окажется разделитель
+                    rest = buffer[end:].lstrip(WHITESPACE)
+                    if (not rest or rest[0] not in ",]") and fill():
+                        continue
+                break
+            position = end
+            yield item
+            if skip(",]") == "]":
+                return
+            position += 1
+            skip("{[\"-0123456789tfn")
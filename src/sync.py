@@ -0,0 +1,154 @@
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Set
+
+from config import DATA_PATH
+from src.api import MAX_DEPTH, HHApi
+from src.vacancy import Vacancy
+from src.worker import JSONWorker
+
+DATE_FORMAT: str = "%Y-%m-%dT%H:%M:%S%z"
+
+
+class SyncState:
+    """
+    Состояние инкрементальной синхронизации по каждому поисковому запросу.
+
+    Для запроса хранится время последней успешной загрузки, время последней
+    полной загрузки и время, когда каждая вакансия последний раз была в выдаче.
+    """
+
+    def __init__(self, file_path: str = os.path.join(DATA_PATH, "sync_state.json")) -> None:
+        """
+        Инициализация состояния, существующий файл загружается.
+
+        :param file_path: Путь к файлу состояния.
+        """
+        self.file_path: str = file_path
+        self.queries: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(file_path):
+            with open(file_path, encoding="utf-8") as f:
+                self.queries = json.load(f)
+
+    def get(self, query: str) -> Dict[str, Any]:
+        """
+        Состояние одного запроса, создается при первом обращении.
+
+        :param query: Поисковый запрос.
+        :return: Словарь с полями last_fetch, last_full и seen.
+        """
+        return self.queries.setdefault(query, {"last_fetch": None, "last_full": None, "seen": {}})
+
+    def urls_of_other_queries(self, query: str) -> Set[str]:
+        """
+        URL вакансий, которые видели другие запросы и которые нельзя удалять из общего хранилища.
+
+        :param query: Поисковый запрос, который исключается.
+        :return: Множество URL.
+        """
+        return {url for name, state in self.queries.items() if name != query for url in state["seen"]}
+
+    def save(self) -> None:
+        """
+        Атомарно сохраняет состояние в файл.
+        """
+        os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+        tmp_path = self.file_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.queries, f, ensure_ascii=False)
+        os.replace(tmp_path, self.file_path)
+
+
+def sync_query(query: str, api: HHApi, store: JSONWorker, state: SyncState, now: Optional[datetime] = None,
+               full_every: timedelta = timedelta(days=7), max_age: timedelta = timedelta(days=30),
+               overlap: timedelta = timedelta(minutes=10)) -> Dict[str, Any]:
+    """
+    Синхронизирует хранилище с выдачей hh.ru по одному запросу.
+
+    При первом запуске и раз в full_every выполняется полная загрузка,
+    после которой удаляются вакансии, пропавшие из выдачи. В остальных
+    запусках запрашиваются только вакансии, опубликованные после прошлой
+    загрузки (параметр date_from с запасом overlap), а удаляются вакансии,
+    которых не было в выдаче дольше max_age (срок публикации на hh.ru - 30 дней).
+    Вакансии, которые видели другие запросы, не удаляются.
+
+    Если вакансий, которые запрос уже видел, нет в хранилище (его очистили, например
+    поиском в диалоговом режиме), загрузка только новых их не вернет, поэтому
+    выполняется полная загрузка.
+
+    hh.ru отдает не больше MAX_DEPTH вакансий на запрос. Если найдено больше,
+    отсутствие вакансии в полной выдаче ничего не значит, поэтому удаление
+    выполняется как при загрузке новых - только по сроку max_age.
+
+    :param query: Поисковый запрос.
+    :param api: Клиент API.
+    :param store: Хранилище вакансий.
+    :param state: Состояние синхронизации.
+    :param now: Текущее время, по умолчанию - системное.
+    :param full_every: Период полной загрузки.
+    :param max_age: Срок, после которого невидимая в выдаче вакансия удаляется.
+    :param overlap: Запас по времени для date_from.
+    :return: Режим загрузки, количество загруженных, добавленных, обновленных и удаленных вакансий,
+             количество вакансий запроса, которых не оказалось в хранилище (missing),
+             и признак неполной выдачи truncated.
+    """
+    now = now or datetime.now(timezone.utc)
+    query_state = state.get(query)
+    last_fetch = query_state["last_fetch"] and datetime.strptime(query_state["last_fetch"], DATE_FORMAT)
+    last_full = query_state["last_full"] and datetime.strptime(query_state["last_full"], DATE_FORMAT)
+    seen: Dict[str, str] = query_state["seen"]
+    stored = {record["url"] for record in store.iter_records()}
+    missing = sum(1 for url in seen if url not in stored)
+    full = not last_fetch or not last_full or now - last_full >= full_every or missing > 0
+
+    extra_params = None if full else {"date_from": (last_fetch - overlap).strftime(DATE_FORMAT)}
+    fetched: List[Vacancy] = []
+    for page in api.iter_vacancies(query.lower(), extra_params):
+        fetched.extend(Vacancy.iter_create(page))
+
+    stamp = now.strftime(DATE_FORMAT)
+    returned = {vacancy.url for vacancy in fetched}
+    truncated = (api.last_found or 0) > MAX_DEPTH
+    if full and not truncated:
+        expired = set(seen) - returned
+    else:
+        border = now - max_age
+        expired = {url for url, last_seen in seen.items()
+                   if url not in returned and datetime.strptime(last_seen, DATE_FORMAT) < border}
+    for url in expired:
+        del seen[url]
+    for url in returned:
+        seen[url] = stamp
+
+    with store.transaction():
+        stats = store.upsert_vacancies(fetched)
+        deleted = store.delete_many(expired - state.urls_of_other_queries(query))
+
+    query_state["last_fetch"] = stamp
+    if full:
+        query_state["last_full"] = stamp
+    state.save()
+    return {"mode": "full" if full else "delta", "fetched": len(fetched), "inserted": stats["inserted"],
+            "updated": stats["updated"], "expired": deleted, "missing": missing, "truncated": truncated}
+
+
+def sync_interaction(queries: List[str]) -> None:
+    """
+    Режим синхронизации: обновить общее хранилище по каждому запросу и вывести сводку.
+
+    :param queries: Поисковые запросы.
+    """
+    api = HHApi()
+    store = JSONWorker("vacancies.json", reset=False)
+    state = SyncState()
+    for query in queries:
+        stats = sync_query(query, api, store, state)
+        print(f"{query}: загрузка {'полная' if stats['mode'] == 'full' else 'только новых'}, "
+              f"получено {stats['fetched']}, добавлено {stats['inserted']}, обновлено {stats['updated']}, "
+              f"удалено устаревших {stats['expired']}")
+        if stats["missing"]:
+            print(f"{query}: {stats['missing']} вакансий запроса не было в хранилище, выполнена полная загрузка")
+        if stats["truncated"]:
+            print(f"{query}: найдено больше {MAX_DEPTH} вакансий, hh.ru отдает только часть выдачи - "
+                  f"уточните запрос, пропавшие вакансии удаляются только по сроку")
@@ -0,0 +1,119 @@
+import heapq
+import json
+import os
+import shutil
+import tempfile
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from src.matcher import KeywordMatcher, normalize_city, record_search_text
+from src.salary_index import normalize_salary
+
+# Максимальное количество записей, сортируемых в памяти за один раз
+DEFAULT_CHUNK_SIZE: int = 100000
+
+
+def salary_key(record: Dict[str, Any]) -> int:
+    """
+    Ключ сортировки записи по минимальной зарплате в рублях.
+
+    Зарплата приводится к рублям так же, как в filter_vacancies и индексе зарплат,
+    поэтому вакансии в разных валютах сравниваются между собой.
+
+    :param record: Словарь с данными вакансии.
+    :return: Минимальная зарплата в рублях, 0 если не указана.
+    """
+    return normalize_salary(record["salary_from"], record.get("currency")) or 0
+
+
+def record_matches(record: Dict[str, Any], matcher: Optional[KeywordMatcher] = None,
+                   min_salary: Optional[int] = None, city: Optional[str] = None) -> bool:
+    """
+    Проверяет запись на соответствие условиям запроса.
+
+    Слова ищутся по тексту для поиска (название, требования и обязанности),
+    как в filter_vacancies.
+
+    :param record: Словарь с данными вакансии.
+    :param matcher: Ключевые слова, хотя бы одно из которых должно быть в тексте вакансии, или None.
+    :param min_salary: Минимальная зарплата в рублях или None.
+    :param city: Город, приведенный normalize_city, или None.
+    :return: True, если запись подходит.
+    """
+    if city is not None and normalize_city(record["city"]) != city:
+        return False
+    if min_salary is not None and salary_key(record) < min_salary:
+        return False
+    if matcher:
+        return matcher.matches_any(record_search_text(record))
+    return True
+
+
+def external_sorted(records: Iterable[Dict[str, Any]], key: Callable[[Dict[str, Any]], Any] = salary_key,
+                    chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """
+    Сортирует записи по убыванию ключа, не держа в памяти больше chunk_size записей.
+
+    Записи сортируются частями, каждая часть сохраняется во временный файл,
+    затем части сливаются через heapq.merge. Если записей меньше chunk_size,
+    сортировка выполняется в памяти. Порядок равных записей сохраняется.
+
+    :param records: Итерируемый набор словарей.
+    :param key: Функция ключа сортировки.
+    :param chunk_size: Количество записей в одной части.
+    :return: Итератор отсортированных записей.
+    """
+    chunk: List[Dict[str, Any]] = []
+    runs: List[str] = []
+    tmp_dir: Optional[str] = None
+    try:
+        for record in records:
+            chunk.append(record)
+            if len(chunk) >= chunk_size:
+                tmp_dir = tmp_dir or tempfile.mkdtemp(prefix="vacancies_sort_")
+                runs.append(_write_run(tmp_dir, len(runs), sorted(chunk, key=key, reverse=True)))
+                chunk = []
+        if not runs:
+            yield from sorted(chunk, key=key, reverse=True)
+            return
+        if chunk:
+            runs.append(_write_run(tmp_dir, len(runs), sorted(chunk, key=key, reverse=True)))
+            chunk = []
+        files = [open(path, encoding="utf-8") for path in runs]
+        try:
+            streams = [(json.loads(line) for line in f) for f in files]
+            yield from heapq.merge(*streams, key=key, reverse=True)
+        finally:
+            for f in files:
+                f.close()
+    finally:
+        if tmp_dir is not None:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def _write_run(tmp_dir: str, number: int, records: List[Dict[str, Any]]) -> str:
+    path = os.path.join(tmp_dir, f"run_{number}.jsonl")
+    with open(path, "w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    return path
+
+
+def top_records(records: Iterable[Dict[str, Any]], limit: Optional[int] = None,
+                key: Callable[[Dict[str, Any]], Any] = salary_key,
+                chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """
+    Выбирает limit записей с наибольшим ключом.
+
+    Если limit помещается в память, используется куча размера limit
+    (O(n log limit)), иначе - внешняя сортировка слиянием.
+
+    :param records: Итерируемый набор словарей.
+    :param limit: Количество записей или None для всех записей.
+    :param key: Функция ключа сортировки.
+    :param chunk_size: Максимальное количество записей в памяти.
+    :return: Итератор записей по убыванию ключа.
+    """
+    if limit is not None and limit <= chunk_size:
+        return iter(heapq.nlargest(limit, records, key=key))
+    return islice(external_sorted(records, key, chunk_size), limit)
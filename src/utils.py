@@ -1,6 +1,107 @@
+import heapq
+import os
+import time
+from typing import Iterable, Iterator, List, Dict, Any
 from src.vacancy import Vacancy
-from src.api import HHApi
-from src.worker import JSONWorker
+from src.profiling import timer
+from src.matcher import KeywordMatcher
+from src.salary_index import normalize_salary
+from src.worker import BaseWorker, JSONWorker
+from config import DATA_PATH
+
+
+def iter_stored_vacancies(pages: Iterable[List[Dict[str, Any]]], file_worker: BaseWorker) -> Iterator[Vacancy]:
+    """
+    Создает вакансии из страниц выдачи, сохраняет каждую страницу и отдает вакансии дальше.
+
+    Чтобы запись не повторялась на каждой странице, вызывайте внутри транзакции хранилища.
+
+    :param pages: Итерируемый набор страниц с данными о вакансиях.
+    :param file_worker: Объект для сохранения вакансий.
+    :return: Итератор объектов Vacancy.
+    """
+    for page in pages:
+        with timer("Vacancy.iter_create"):
+            vacancies = list(Vacancy.iter_create(page))
+        file_worker.add_vacancies(vacancies)
+        yield from vacancies
+
+
+def filter_vacancies(vacancies: Iterable[Vacancy], filter_words: List[str], desired_salary: int) -> Iterator[Vacancy]:
+    """
+    Отбирает вакансии по ключевым словам и желаемой зарплате.
+
+    Вакансия подходит, если ее название, требования или обязанности содержат
+    хотя бы одно из ключевых слов (или список слов пуст) и минимальная зарплата
+    в рублях не меньше желаемой. Все слова ищутся одним проходом по заранее
+    нормализованному тексту вакансии.
+
+    :param vacancies: Итерируемый набор вакансий.
+    :param filter_words: Ключевые слова для фильтрации.
+    :param desired_salary: Желаемая зарплата.
+    :return: Итератор подходящих вакансий.
+    """
+    matcher = KeywordMatcher(filter_words)
+    for vacancy in vacancies:
+        if matcher and not matcher.matches_any(vacancy.search_text):
+            continue
+        if desired_salary <= (normalize_salary(vacancy.salary_from, vacancy.currency) or 0):
+            yield vacancy
+
+
+def top_vacancies(vacancies: Iterable[Vacancy], top_n: int) -> List[Vacancy]:
+    """
+    Выбирает top_n вакансий с наибольшей минимальной зарплатой в рублях.
+
+    Используется куча размера top_n, поэтому в памяти не хранится весь поток.
+    При равных зарплатах сохраняется порядок поступления, как у sorted().
+
+    :param vacancies: Итерируемый набор вакансий.
+    :param top_n: Количество вакансий для вывода.
+    :return: Список вакансий, отсортированный по убыванию минимальной зарплаты.
+    """
+    return heapq.nlargest(top_n, vacancies,
+                          key=lambda vacancy: normalize_salary(vacancy.salary_from, vacancy.currency) or 0)
+
+
+def select_top(file_worker: BaseWorker, filter_words: List[str], desired_salary: int, top_n: int) -> List[Vacancy]:
+    """
+    Выбирает из сохраненного хранилища top_n лучших вакансий по ключевым словам и желаемой зарплате.
+
+    Используется в офлайн-режиме. Запрос выполняет query хранилища: кандидаты
+    берутся из его индексов, а результат кэшируется, пока хранилище не изменилось.
+
+    :param file_worker: Хранилище вакансий.
+    :param filter_words: Ключевые слова для фильтрации.
+    :param desired_salary: Желаемая зарплата, 0 - без ограничения.
+    :param top_n: Количество вакансий для вывода.
+    :return: Список вакансий по убыванию минимальной зарплаты.
+    """
+    return file_worker.query(filter_words, desired_salary or None, None, top_n)
+
+
+def offline_interaction(filter_words: List[str], desired_salary: int = 0, top_n: int = 10,
+                        store_path: str = os.path.join(DATA_PATH, "vacancies.json")) -> None:
+    """
+    Офлайн-режим: ответить на запрос по сохраненным вакансиям без обращения к hh.ru.
+
+    :param filter_words: Ключевые слова для фильтрации.
+    :param desired_salary: Желаемая зарплата, 0 - без ограничения.
+    :param top_n: Количество вакансий для вывода.
+    :param store_path: Путь к файлу хранилища JSON.
+    """
+    if not os.path.exists(store_path):
+        print(f"Хранилище {store_path} не найдено: сначала выполните поиск или синхронизацию (--sync)")
+        return
+    file_worker = JSONWorker(os.path.basename(store_path), os.path.dirname(os.path.abspath(store_path)),
+                             reset=False)
+    result = select_top(file_worker, filter_words, desired_salary, top_n)
+
+    for item in result:
+        print(item, '\n')
+
+    updated = time.strftime("%d.%m.%Y %H:%M", time.localtime(file_worker.last_modified()))
+    print(f"Показано {len(result)} вакансий из {store_path}, данные обновлены {updated}")
 
 
 def user_interaction():
@@ -9,52 +110,43 @@ def user_interaction():
 
     Функция запрашивает у пользователя параметры поиска, получает вакансии с использованием API,
     сохраняет их в файл JSON, фильтрует по ключевым словам и зарплате, а затем выводит отфильтрованные вакансии.
+    Вакансии обрабатываются постранично по мере загрузки, поэтому в памяти
+    находится не больше нескольких страниц выдачи и top_n лучших вакансий.
+    Все страницы сохраняются одной транзакцией, файл записывается один раз.
 
     Шаги выполнения:
     1. Запрос поискового запроса у пользователя.
     2. Запрос количества вакансий для отображения (топ N).
     3. Запрос ключевых слов для фильтрации.
     4. Запрос желаемой зарплаты.
-    5. Получение вакансий с использованием API.
-    6. Сохранение вакансий в файл JSON.
-    7. Фильтрация вакансий по ключевым словам.
-    8. Фильтрация вакансий по желаемой зарплате.
-    9. Сортировка и вывод отфильтрованных вакансий.
+    5. Постраничное получение вакансий с использованием API.
+    6. Сохранение каждой страницы вакансий в хранилище.
+    7. Фильтрация вакансий по ключевым словам и желаемой зарплате.
+    8. Отбор и вывод top_n отфильтрованных вакансий.
     """
-    api_hh = HHApi()
+    # Модули загрузки из сети нужны только здесь, офлайн-режим их не импортирует
+    from src.api import HHApi
+    from src.cache import ResponseCache
+
+    api_hh = HHApi(cache=ResponseCache())
     search_query = input("Введите поисковый запрос: ")
     top_n = int(input("Введите количество вакансий для вывода в топ N: "))
     filter_words = input("Введите ключевые слова для фильтрации вакансий: ").split()
     desired_salary = int(input("Введите желаемую зарплату: "))
 
-    vacancies_info = api_hh.get_vacancies(search_query.lower())
-    vacancies = Vacancy.create_vacancies(vacancies_info)
-
     file_worker = JSONWorker("vacancies.json")
-    file_worker.add_vacancies(vacancies)
-
-    selected_vacancies = set()
-    if not filter_words:
-        selected_vacancies.update(set(file_worker.return_list_vacancies()))
-    else:
-        for word in filter_words:
-            list_vacancies = set(file_worker.select_vacancy(word))
-            selected_vacancies.update(list_vacancies)
-
-    ready_vacancies = []
-    for vacancy in selected_vacancies:
-        try:
-            if desired_salary <= int(vacancy.salary_from):
-                ready_vacancies.append(vacancy)
-        except ValueError:
-            # Если salary_from не может быть приведена к int, пропускаем эту вакансию
-            continue
+    pages = api_hh.iter_vacancies(search_query.lower())
+    with file_worker.transaction():
+        vacancies = iter_stored_vacancies(pages, file_worker)
+        result = top_vacancies(filter_vacancies(vacancies, filter_words, desired_salary), top_n)
 
-    result = sorted(ready_vacancies)
-
-    for item in result[0:top_n]:
+    for item in result:
         print(item, '\n')
 
+    cache_stats = api_hh.cache.stats()
+    print(f"Кэш запросов: попаданий {cache_stats['hits']}, промахов {cache_stats['misses']}, "
+          f"подтверждено сервером (304) {cache_stats['revalidated']}")
+
 
 if __name__ == "__main__":
     user_interaction()
@@ -1,5 +1,6 @@
-from typing import List
-from src.api import HHApi
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from src.matcher import make_search_text, strip_markup
+from src.profiling import instrumented
 class Vacancy:
     """
     Класс для представления вакансии.
@@ -12,8 +13,15 @@ class Vacancy:
         requirements (str): Требования к кандидату.
         responsibility (str): Обязанности на должности.
         city (str): Город, в котором расположена вакансия.
+        currency (str): Код валюты зарплаты на hh.ru.
+        search_text (str): Название, требования и обязанности без разметки в нижнем регистре для поиска.
     """
-    def __init__(self, title: str, url: str, salary_from: int, salary_to: int, requirements: str, responsibility: str, city: str) -> None:
+    # Без __dict__ у каждого экземпляра объект вакансии занимает заметно меньше памяти
+    __slots__ = ("title", "url", "salary_from", "salary_to", "requirements", "responsibility", "city", "currency",
+                 "search_text")
+
+    def __init__(self, title: str, url: str, salary_from: int, salary_to: int, requirements: str, responsibility: str, city: str,
+                 currency: str = "RUR", search_text: Optional[str] = None) -> None:
         """
         Инициализация объекта Vacancy.
 
@@ -24,16 +32,24 @@ class Vacancy:
         :param requirements: Требования к кандидату.
         :param responsibility: Обязанности на должности.
         :param city: Город, в котором расположена вакансия.
+        :param currency: Код валюты зарплаты на hh.ru.
+        :param search_text: Сохраненный текст для поиска или None, чтобы собрать его из полей вакансии.
         """
         self.title: str = title
         self.url: str = url
         self.salary_from: int = salary_from if salary_from else 0
         self.salary_to: int = salary_to if salary_to else 0
-        self.requirements: str = requirements if requirements else ""
-        self.responsibility: str = responsibility if responsibility else ""
+        self.requirements: str = strip_markup(requirements) if requirements else ""
+        self.responsibility: str = strip_markup(responsibility) if responsibility else ""
         self.city: str = city
+        self.currency: str = currency if currency else "RUR"
+        # Текст нормализуется один раз при загрузке из API и сохраняется вместе с вакансией,
+        # фильтры по словам используют готовую строку
+        self.search_text: str = search_text if search_text is not None else \
+            make_search_text(title, self.requirements, self.responsibility)
 
     @classmethod
+    @instrumented("Vacancy.create_vacancies")
     def create_vacancies(cls, vacancies_data: List[dict]) -> List['Vacancy']:
         """
         Создает список объектов Vacancy на основе данных о вакансиях.
@@ -41,7 +57,16 @@ class Vacancy:
         :param vacancies_data: Список словарей с данными о вакансиях.
         :return: Список объектов Vacancy.
         """
-        instances: List['Vacancy'] = []
+        return list(cls.iter_create(vacancies_data))
+
+    @classmethod
+    def iter_create(cls, vacancies_data: Iterable[dict]) -> Iterator['Vacancy']:
+        """
+        Лениво создает объекты Vacancy по мере чтения данных о вакансиях.
+
+        :param vacancies_data: Итерируемый набор словарей с данными о вакансиях.
+        :return: Итератор объектов Vacancy.
+        """
         for vacancy_info in vacancies_data:
             title: str = vacancy_info["name"]
             url: str = vacancy_info["alternate_url"]
@@ -49,14 +74,54 @@ class Vacancy:
             salary = vacancy_info.get("salary")
             salary_from: int = salary.get("from") if salary else 0
             salary_to: int = salary.get("to") if salary else 0
+            currency: str = salary.get("currency") if salary else "RUR"
 
             requirements: str = vacancy_info["snippet"].get("requirement", "")
             responsibility: str = vacancy_info["snippet"].get("responsibility", "")
             city: str = vacancy_info["area"]["name"]
 
-            vacancy: 'Vacancy' = cls(title, url, salary_from, salary_to, requirements, responsibility, city)
-            instances.append(vacancy)
-        return instances
+            yield cls(title, url, salary_from, salary_to, requirements, responsibility, city, currency)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Возвращает словарь с данными вакансии для сохранения в файл.
+
+        :return: Словарь с полями вакансии.
+        """
+        return {
+            "title": self.title,
+            "url": self.url,
+            "salary_from": self.salary_from,
+            "salary_to": self.salary_to,
+            "requirements": self.requirements,
+            "responsibility": self.responsibility,
+            "city": self.city,
+            "currency": self.currency,
+            "search_text": self.search_text
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Vacancy':
+        """
+        Создает объект Vacancy из словаря, сохраненного методом to_dict.
+
+        Зарплаты приводятся к int, так как в старых файлах они хранились строками.
+        В старых файлах нет и текста для поиска, тогда он собирается заново.
+
+        :param data: Словарь с полями вакансии.
+        :return: Объект Vacancy.
+        """
+        return cls(
+            data["title"],
+            data["url"],
+            int(data["salary_from"] or 0),
+            int(data["salary_to"] or 0),
+            data["requirements"],
+            data["responsibility"],
+            data["city"],
+            data.get("currency", "RUR"),
+            data.get("search_text")
+        )
 
     def __lt__(self, other: 'Vacancy') -> bool:
         """
@@ -75,12 +140,15 @@ class Vacancy:
         """
         return (f"Профессия: {self.title}\n"
                 f"Ссылка: {self.url}\n"
-                f"Зарплата: от {self.salary_from} до {self.salary_to}\n"
+                f"Зарплата: от {self.salary_from} до {self.salary_to}"
+                f"{'' if self.currency == 'RUR' else ' ' + self.currency}\n"
                 f"Требования: {self.requirements}\n"
                 f"Ответственность: {self.responsibility}\n"
                 f"Город: {self.city}")
 
 if __name__ == "__main__":
+    from src.api import HHApi
+
     hh_api: HHApi = HHApi()
     hh_vacancies: List[dict] = hh_api.get_vacancies("python developer")
     list_vacancies: List[Vacancy] = Vacancy.create_vacancies(hh_vacancies)
@@ -0,0 +1,185 @@
+import sys
+from array import array
+from itertools import compress
+from typing import Dict, Iterable, List, Optional
+
+from src.salary_index import normalize_salary
+from src.vacancy import Vacancy
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class VacancyBatch:
+    """
+    Колоночное представление набора вакансий.
+
+    Зарплаты хранятся в типизированных массивах array('q'), города и валюты -
+    в виде кодов в массиве array('q') со справочником интернированных строк.
+    Минимальная зарплата в рублях хранится отдельным массивом: фильтры и сортировка
+    сравнивают рубли, как хранилища вакансий. Фильтры возвращают маски (bytes с 0/1 на каждую вакансию), которые
+    вычисляются проходом по массиву без создания объектов Vacancy.
+    Если установлен numpy, маски считаются над теми же массивами без копирования.
+    """
+
+    def __init__(self) -> None:
+        """
+        Инициализация пустого набора вакансий.
+        """
+        self.titles: List[str] = []
+        self.urls: List[str] = []
+        self.salary_from: array = array("q")
+        self.salary_to: array = array("q")
+        # Минимальная зарплата в рублях, 0 - не указана
+        self.salary_rub: array = array("q")
+        self.requirements: List[str] = []
+        self.responsibilities: List[str] = []
+        self.search_texts: List[str] = []
+        self.city_codes: array = array("q")
+        self.cities: List[str] = []
+        self._city_index: Dict[str, int] = {}
+        self.currency_codes: array = array("q")
+        self.currencies: List[str] = []
+        self._currency_index: Dict[str, int] = {}
+
+    @classmethod
+    def from_vacancies(cls, vacancies: Iterable[Vacancy]) -> 'VacancyBatch':
+        """
+        Создает набор из объектов Vacancy.
+
+        :param vacancies: Итерируемый набор вакансий.
+        :return: Объект VacancyBatch.
+        """
+        batch = cls()
+        for vacancy in vacancies:
+            batch.append(vacancy)
+        return batch
+
+    @staticmethod
+    def _code(value: str, values: List[str], index: Dict[str, int]) -> int:
+        code = index.get(value)
+        if code is None:
+            code = len(values)
+            value = sys.intern(value)
+            values.append(value)
+            index[value] = code
+        return code
+
+    def append(self, vacancy: Vacancy) -> None:
+        """
+        Добавляет вакансию в набор.
+
+        :param vacancy: Объект вакансии.
+        """
+        self.titles.append(vacancy.title)
+        self.urls.append(vacancy.url)
+        self.salary_from.append(vacancy.salary_from or 0)
+        self.salary_to.append(vacancy.salary_to or 0)
+        self.salary_rub.append(normalize_salary(vacancy.salary_from, vacancy.currency) or 0)
+        self.requirements.append(vacancy.requirements)
+        self.responsibilities.append(vacancy.responsibility)
+        self.search_texts.append(vacancy.search_text)
+        self.city_codes.append(self._code(vacancy.city, self.cities, self._city_index))
+        self.currency_codes.append(self._code(vacancy.currency, self.currencies, self._currency_index))
+
+    def __len__(self) -> int:
+        return len(self.urls)
+
+    def __getitem__(self, position: int) -> Vacancy:
+        """
+        Собирает объект Vacancy для одной позиции набора.
+
+        :param position: Номер вакансии в наборе.
+        :return: Объект Vacancy.
+        """
+        return Vacancy(self.titles[position], self.urls[position], self.salary_from[position],
+                       self.salary_to[position], self.requirements[position], self.responsibilities[position],
+                       self.cities[self.city_codes[position]], self.currencies[self.currency_codes[position]],
+                       self.search_texts[position])
+
+    def salary_mask(self, min_salary: Optional[int] = None, max_salary: Optional[int] = None) -> bytes:
+        """
+        Маска вакансий с минимальной зарплатой в рублях в заданных границах.
+
+        :param min_salary: Нижняя граница в рублях или None.
+        :param max_salary: Верхняя граница в рублях или None.
+        :return: Маска длиной len(self).
+        """
+        if numpy is not None and len(self):
+            column = numpy.frombuffer(self.salary_rub, dtype=numpy.int64)
+            result = numpy.ones(len(self), dtype=bool)
+            if min_salary is not None:
+                result &= column >= min_salary
+            if max_salary is not None:
+                result &= column <= max_salary
+            return result.tobytes()
+        mask = b"\x01" * len(self)
+        if min_salary is not None:
+            mask = bytes(map(min_salary.__le__, self.salary_rub))
+        if max_salary is not None:
+            mask = self.combine(mask, bytes(map(max_salary.__ge__, self.salary_rub)))
+        return mask
+
+    def city_mask(self, city: str) -> bytes:
+        """
+        Маска вакансий в заданном городе.
+
+        Сравниваются целочисленные коды, а не строки.
+
+        :param city: Название города.
+        :return: Маска длиной len(self).
+        """
+        code = self._city_index.get(city)
+        if code is None:
+            return bytes(len(self))
+        if numpy is not None and len(self):
+            return (numpy.frombuffer(self.city_codes, dtype=numpy.int64) == code).tobytes()
+        return bytes(map(code.__eq__, self.city_codes))
+
+    @staticmethod
+    def combine(*masks: bytes) -> bytes:
+        """
+        Объединяет маски через логическое И.
+
+        :param masks: Маски одинаковой длины.
+        :return: Итоговая маска.
+        """
+        # Побайтовое И выполняется одной операцией над длинными целыми
+        result = int.from_bytes(masks[0], "little")
+        for mask in masks[1:]:
+            result &= int.from_bytes(mask, "little")
+        return result.to_bytes(len(masks[0]), "little")
+
+    def positions(self, mask: bytes) -> List[int]:
+        """
+        Номера вакансий, отмеченных в маске.
+
+        :param mask: Маска длиной len(self).
+        :return: Список номеров.
+        """
+        if numpy is not None:
+            return numpy.flatnonzero(numpy.frombuffer(mask, dtype=bool)).tolist()
+        return list(compress(range(len(self)), mask))
+
+    def argsort(self, positions: Optional[List[int]] = None, reverse: bool = True) -> List[int]:
+        """
+        Сортирует номера вакансий по минимальной зарплате в рублях.
+
+        :param positions: Номера для сортировки или None для всего набора.
+        :param reverse: Сортировать по убыванию зарплаты.
+        :return: Отсортированный список номеров.
+        """
+        if positions is None:
+            positions = range(len(self))
+        return sorted(positions, key=self.salary_rub.__getitem__, reverse=reverse)
+
+    def take(self, positions: Iterable[int]) -> List[Vacancy]:
+        """
+        Собирает объекты Vacancy для выбранных номеров.
+
+        :param positions: Номера вакансий.
+        :return: Список объектов Vacancy.
+        """
+        return [self[position] for position in positions]
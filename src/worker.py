@@ -1,17 +1,154 @@
+import copy
 import os
-from typing import List, Dict
+import tempfile
+from contextlib import contextmanager
+from typing import List, Dict, Iterable, Iterator, Any, Optional, Set, Tuple
 import json
-from src.api import HHApi
+from src.cache import QueryCache
+from src.index import InvertedIndex, has_tokens
+from src.matcher import KeywordMatcher, normalize_city, record_search_text
+from src.profiling import instrumented, metrics, timer
+from src.salary_index import SalaryIndex
+from src.stream_reader import DEFAULT_CHUNK_SIZE, iter_json_array
+from src.topn import record_matches, top_records
 from src.vacancy import Vacancy
 from config import DATA_PATH
 from abc import abstractmethod, ABC
 
+# Начиная с этого размера пачки индексы не обновляются по записи, а строятся заново при обращении
+BULK_REINDEX_SIZE: int = 1000
+# Хранилище меньше этого размера, индекс слов которого еще не прочитан из файла или индекс зарплат
+# которого еще не построен, ищется перебором: перебор записей дешевле чтения или построения индекса
+INDEX_SCAN_LIMIT: int = 5000
+JOURNAL_SUFFIX: str = ".journal"
+
+
+def file_state(file_path: str) -> tuple:
+    """
+    Состояние файла хранилища JSON вместе с его журналом.
+
+    :param file_path: Путь к основному файлу.
+    :return: Время изменения и размер основного файла и журнала, для отсутствующего журнала - нули.
+    """
+    stat = os.stat(file_path)
+    try:
+        journal = os.stat(file_path + JOURNAL_SUFFIX)
+    except FileNotFoundError:
+        return stat.st_mtime_ns, stat.st_size, 0, 0
+    return stat.st_mtime_ns, stat.st_size, journal.st_mtime_ns, journal.st_size
+
+
+def read_journal(journal_path: str, base: tuple) -> Tuple[List[Dict[str, Any]], bool]:
+    """
+    Читает пачки изменений из журнала.
+
+    Первая строка журнала - заголовок с временем изменения и размером основного
+    файла, к которому относятся изменения. Если основной файл с тех пор перезаписан,
+    журнал устарел и не применяется. Недописанная последняя строка пропускается,
+    поэтому пачка применяется целиком или не применяется совсем.
+
+    :param journal_path: Путь к журналу.
+    :param base: Время изменения и размер основного файла.
+    :return: Список пачек {"deleted": [URL], "put": [записи]} и признак того, что журнал
+             отсутствует или прочитан целиком (False - устаревший журнал или недописанная строка).
+    """
+    batches: List[Dict[str, Any]] = []
+    try:
+        f = open(journal_path, encoding="utf-8")
+    except FileNotFoundError:
+        return batches, True
+    with f:
+        try:
+            if tuple(json.loads(f.readline())["base"]) != tuple(base):
+                return batches, False
+        except (ValueError, KeyError, TypeError):
+            return batches, False
+        for line in f:
+            if not line.endswith("\n"):
+                return batches, False
+            try:
+                batches.append(json.loads(line))
+            except ValueError:
+                return batches, False
+    return batches, True
+
+
+def index_journal(journal_path: str, base: tuple) -> Tuple[Set[str], Dict[str, int]]:
+    """
+    Строит по журналу карту последних изменений, не держа в памяти сами записи.
+
+    Проверки заголовка и недописанной строки те же, что в read_journal.
+
+    :param journal_path: Путь к журналу.
+    :param base: Время изменения и размер основного файла.
+    :return: Множество URL, удаленных хотя бы одной пачкой, и словарь URL -> смещение строки
+             журнала с последней версией записи. Порядок словаря совпадает с порядком,
+             в котором записи журнала оказываются в хранилище после apply_journal.
+    """
+    moved: Set[str] = set()
+    offsets: Dict[str, int] = {}
+    try:
+        f = open(journal_path, "rb")
+    except FileNotFoundError:
+        return moved, offsets
+    with f:
+        try:
+            if tuple(json.loads(f.readline())["base"]) != tuple(base):
+                return moved, offsets
+        except (ValueError, KeyError, TypeError):
+            return moved, offsets
+        while True:
+            offset = f.tell()
+            line = f.readline()
+            if not line.endswith(b"\n"):
+                break
+            try:
+                batch = json.loads(line)
+            except ValueError:
+                break
+            for url in batch["deleted"]:
+                offsets.pop(url, None)
+                moved.add(url)
+            for record in batch["put"]:
+                offsets[record["url"]] = offset
+    return moved, offsets
+
+
+def apply_journal(records: Dict[str, Dict[str, Any]], batches: List[Dict[str, Any]],
+                  index: Optional[InvertedIndex] = None) -> None:
+    """
+    Применяет пачки изменений журнала к словарю записей.
+
+    :param records: Словарь URL -> запись.
+    :param batches: Пачки изменений из read_journal.
+    :param index: Индекс слов, который нужно обновить вместе с записями, или None.
+    """
+    for batch in batches:
+        for url in batch["deleted"]:
+            old = records.pop(url, None)
+            if index is not None and old is not None:
+                index.remove(url, record_search_text(old))
+        for record in batch["put"]:
+            old = records.get(record["url"])
+            records[record["url"]] = record
+            if index is not None:
+                if old is not None:
+                    index.remove(old["url"], record_search_text(old))
+                index.add(record["url"], record_search_text(record))
+
 
 class BaseWorker(ABC):
     """
     Абстрактный базовый класс для работы с вакансиями.
+
+    Реализации должны вызывать bump_generation при каждом изменении данных.
     """
 
+    # Количество результатов query, хранимых в кэше каждого хранилища
+    query_cache_size: int = 128
+    _generation: int = 0
+    _query_cache: Optional[QueryCache] = None
+
     @abstractmethod
     def add_vacancies(self, vacancies: List[Vacancy]) -> None:
         """
@@ -40,123 +177,735 @@ class BaseWorker(ABC):
         """
         pass
 
+    @abstractmethod
+    def return_list_vacancies(self) -> List[Vacancy]:
+        """
+        Вернуть список всех вакансий.
+
+        :return: Список объектов вакансий.
+        """
+        pass
+
+    def iter_records(self) -> Iterator[Dict[str, Any]]:
+        """
+        Перебрать сохраненные вакансии в виде словарей.
+
+        :return: Итератор словарей с данными вакансий.
+        """
+        for vacancy in self.return_list_vacancies():
+            yield vacancy.to_dict()
+
+    def iter_vacancies(self) -> Iterator[Vacancy]:
+        """
+        Перебрать сохраненные вакансии по одной.
+
+        :return: Итератор объектов вакансий.
+        """
+        for record in self.iter_records():
+            yield Vacancy.from_dict(record)
+
+    def iter_select(self, keyword: str) -> Iterator[Vacancy]:
+        """
+        Перебрать по одной вакансии, в тексте которых есть ключевое слово.
+
+        :param keyword: Ключевое слово для поиска вакансий.
+        :return: Итератор объектов вакансий.
+        """
+        matcher = KeywordMatcher([keyword])
+        for record in self.iter_records():
+            if not matcher or matcher.matches_any(record_search_text(record)):
+                yield Vacancy.from_dict(record)
+
+    def candidate_records(self, keywords: Optional[List[str]]) -> Iterator[Dict[str, Any]]:
+        """
+        Перебрать записи, которые могут подходить под ключевые слова.
+
+        Хранилища с индексом переопределяют метод, чтобы не читать остальные записи.
+
+        :param keywords: Ключевые слова в нижнем регистре или None.
+        :return: Итератор словарей с данными вакансий.
+        """
+        return self.iter_records()
+
+    @instrumented("BaseWorker.query")
+    def query(self, keywords: Optional[List[str]] = None, min_salary: Optional[int] = None,
+              city: Optional[str] = None, limit: Optional[int] = None) -> List[Vacancy]:
+        """
+        Найти вакансии по условиям и вернуть лучшие по минимальной зарплате.
+
+        Результаты кэшируются по нормализованным условиям и отдаются из кэша,
+        пока хранилище не изменилось. Сам поиск выполняет метод _query.
+        Город сравнивается без учета регистра и пробелов по краям, нулевая
+        минимальная зарплата равносильна ее отсутствию.
+
+        :param keywords: Слова, хотя бы одно из которых должно быть в тексте вакансии, или None.
+        :param min_salary: Минимальная зарплата в рублях или None.
+        :param city: Город или None.
+        :param limit: Количество вакансий или None для всех подходящих.
+        :return: Список вакансий по убыванию минимальной зарплаты в рублях.
+        """
+        words = tuple(sorted({keyword.lower().strip() for keyword in keywords or []} - {""})) or None
+        if min_salary is not None and min_salary <= 0:
+            min_salary = None
+        if city is not None:
+            city = normalize_city(city)
+        key = (words, min_salary, city, limit)
+        generation = self.current_generation()
+        result = self.query_cache.get(key, generation)
+        if result is None:
+            metrics.count("QueryCache.misses")
+            result = self._query(list(words) if words else None, min_salary, city, limit)
+            self.query_cache.put(key, generation, result)
+        else:
+            metrics.count("QueryCache.hits")
+        # Копии вакансий, чтобы изменения у вызывающего не попали в кэш
+        return [copy.copy(vacancy) for vacancy in result]
+
+    def _query(self, keywords: Optional[List[str]], min_salary: Optional[int], city: Optional[str],
+               limit: Optional[int]) -> List[Vacancy]:
+        """
+        Выполнить запрос без кэша.
+
+        Условия проверяются на сохраненных словарях до создания объектов Vacancy,
+        лучшие limit записей выбираются кучей, без сортировки всего результата.
+
+        :param keywords: Слова в нижнем регистре, хотя бы одно из которых должно быть в тексте вакансии, или None.
+        :param min_salary: Минимальная зарплата в рублях или None.
+        :param city: Город, приведенный normalize_city, или None.
+        :param limit: Количество вакансий или None для всех подходящих.
+        :return: Список вакансий по убыванию минимальной зарплаты в рублях.
+        """
+        matcher = KeywordMatcher(keywords or [])
+        matched = (record for record in self.candidate_records(keywords)
+                   if record_matches(record, matcher, min_salary, city))
+        return [Vacancy.from_dict(record) for record in top_records(matched, limit)]
+
+    @property
+    def query_cache(self) -> QueryCache:
+        """
+        Кэш результатов query, создается при первом обращении.
+
+        :return: Объект QueryCache.
+        """
+        if self._query_cache is None:
+            self._query_cache = QueryCache(self.query_cache_size)
+        return self._query_cache
+
+    def current_generation(self) -> int:
+        """
+        Текущее поколение хранилища.
+
+        Хранилища, которые могут измениться извне, переопределяют метод,
+        чтобы перед сравнением поколений проверить актуальность данных.
+
+        :return: Номер поколения.
+        """
+        return self._generation
+
+    def bump_generation(self) -> None:
+        """
+        Отметить изменение хранилища, после чего закэшированные результаты query не используются.
+        """
+        self._generation += 1
+
 
 class JSONWorker(BaseWorker):
     """
     Класс для работы с вакансиями в формате JSON.
+
+    Вакансии идентифицируются по URL (он содержит id вакансии на hh.ru).
+    В памяти хранится словарь URL -> запись, поэтому поиск, вставка
+    и удаление по ключу выполняются за O(1), а файл перечитывается
+    только если его изменили извне.
+
+    Изменения дописываются одной строкой на пачку в журнал рядом с файлом
+    (<файл>.journal), поэтому запись стоит O(размер пачки), а не O(размер файла).
+    Основной файл перезаписывается атомарно и вбирает журнал, когда журнал
+    становится больше journal_ratio от размера файла или файл меньше
+    journal_min_size. Внутри transaction() изменения накапливаются
+    и записываются одной пачкой.
     """
 
-    def __init__(self, file_name: str) -> None:
+    # Файл меньше этого размера дешевле перезаписать целиком, чем вести журнал
+    journal_min_size: int = 64 * 1024
+    # Доля размера основного файла, после которой журнал сливается с файлом
+    journal_ratio: float = 0.5
+
+    def __init__(self, file_name: str, data_path: str = DATA_PATH, reset: bool = True) -> None:
         """
         Инициализация JSONWorker с именем файла.
 
         :param file_name: Имя файла для хранения вакансий.
+        :param data_path: Папка для хранения файла.
+        :param reset: Очистить файл при инициализации. При False открывается существующее хранилище.
         """
-        self.file_path: str = os.path.join(DATA_PATH, file_name)
-        self.prepare()
+        self.file_path: str = os.path.join(data_path, file_name)
+        self.journal_path: str = self.file_path + JOURNAL_SUFFIX
+        self.index: InvertedIndex = InvertedIndex(self.file_path + ".index")
+        self.salary_index: SalaryIndex = SalaryIndex()
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._file_state: Optional[tuple] = None
+        self._transaction_depth: int = 0
+        self._dirty: bool = False
+        # Изменения, еще не записанные в файл: новые записи и удаленные URL в порядке изменений
+        self._pending_put: Dict[str, Dict[str, Any]] = {}
+        self._pending_deleted: Dict[str, None] = {}
+        # Индексы строятся при первом обращении после чтения файла, а не при каждом чтении
+        self._words_stale: bool = False
+        self._salaries_stale: bool = False
+        # Состояние основного файла, для которого индекс слов будет прочитан из файла при первом поиске
+        self._index_base: Optional[tuple] = None
+        self.prepare(reset)
 
-    def prepare(self) -> None:
+    def prepare(self, reset: bool = True) -> None:
         """
         Подготовка файла JSON: создание или очистка.
+
+        :param reset: Очистить существующий файл.
         """
-        if not os.path.exists(self.file_path):
-            with open(self.file_path, "w") as file:
-                json.dump([], file)
+        os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+        if not os.path.exists(self.file_path) or reset:
+            self._records = {}
+            self.index.clear()
+            self.salary_index.clear()
+            self._index_base = None
+            self._words_stale = False
+            self._salaries_stale = False
+            self.bump_generation()
+            self._write()
         else:
-            open(self.file_path, "w").close()
-            with open(self.file_path, "w") as file:
-                json.dump([], file)
+            self._load()
 
-    def add_vacancies(self, vacancies: List[Vacancy]) -> None:
+    def _stat(self) -> tuple:
+        return file_state(self.file_path)
+
+    def last_modified(self) -> float:
+        """
+        Время последнего изменения хранилища с учетом журнала.
+
+        :return: Время в секундах от начала эпохи.
+        """
+        state = self._stat()
+        return max(state[0], state[2]) / 1e9
+
+    def current_generation(self) -> int:
+        """
+        Текущее поколение хранилища с учетом изменений файла извне.
+
+        :return: Номер поколения.
+        """
+        self._load()
+        return self._generation
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Вернуть записи, перечитав файл, если он изменился после последнего чтения или записи.
+
+        :return: Словарь URL -> запись в порядке добавления.
+        """
+        if self._file_state != self._stat():
+            with timer("JSONWorker.read_file"):
+                state = self._stat()
+                with open(self.file_path, encoding="utf-8") as f:
+                    json_data: List[Dict[str, Any]] = json.load(f)
+                self._records = {item["url"]: item for item in json_data}
+                batches, clean = read_journal(self.journal_path, state[:2])
+                index_loaded = False
+                self._index_base = None
+                if batches:
+                    # Сохраненный индекс подходит, только если построен по этому же основному файлу
+                    index_loaded = self.index.load(state[:2])
+                    apply_journal(self._records, batches, self.index if index_loaded else None)
+                else:
+                    # Без журнала индекс читается при первом поиске по словам, а не при каждом открытии
+                    self._index_base = state[:2]
+            self._file_state = self._stat()
+            self._words_stale = not index_loaded
+            self._salaries_stale = True
+            self.bump_generation()
+            if not clean:
+                # Журнал после сбоя нельзя продолжать: прочитанное сохраняется в основной файл
+                self._write()
+        return self._records
+
+    def _word_index(self) -> InvertedIndex:
+        """
+        Вернуть инвертированный индекс слов вакансий, прочитав его из файла или построив,
+        если файл был перечитан и сохраненный индекс к нему не подошел.
+
+        :return: Объект InvertedIndex.
+        """
+        self._load()
+        if self._words_stale:
+            if self._index_base is None or not self.index.load(self._index_base):
+                self.index.rebuild((url, record_search_text(item)) for url, item in self._records.items())
+            self._index_base = None
+            self._words_stale = False
+        return self.index
+
+    def _salary_index(self) -> SalaryIndex:
+        """
+        Вернуть индекс зарплат, построив его, если файл был перечитан.
+
+        :return: Объект SalaryIndex.
+        """
+        self._load()
+        if self._salaries_stale:
+            self.salary_index.rebuild((url, item["salary_from"], item["salary_to"], item.get("currency"))
+                                      for url, item in self._records.items())
+            self._salaries_stale = False
+        return self.salary_index
+
+    @instrumented("JSONWorker.write_file")
+    def _write(self) -> None:
+        """
+        Атомарно записать все вакансии в файл JSON, удалить журнал и сохранить индекс.
+
+        Данные пишутся во временный файл в той же папке, который затем
+        подменяет основной через os.replace, поэтому сбой во время записи
+        не оставляет поврежденный файл. Журнал, оставшийся после сбоя
+        до его удаления, относится к прежнему файлу и не применяется.
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.file_path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(list(self._records.values()), f, ensure_ascii=False, indent=4)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.file_path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+        self._file_state = self._stat()
+        self._clear_pending()
+        self._word_index().save(self._file_state[:2])
+
+    def _clear_pending(self) -> None:
+        self._pending_put = {}
+        self._pending_deleted = {}
+        self._dirty = False
+
+    @instrumented("JSONWorker.append_journal")
+    def _flush(self) -> None:
+        """
+        Записать накопленные изменения одной строкой журнала или слить журнал с файлом.
+        """
+        line = json.dumps({"deleted": list(self._pending_deleted), "put": list(self._pending_put.values())},
+                          ensure_ascii=False) + "\n"
+        main_mtime, main_size, _, journal_size = self._stat()
+        if main_size < self.journal_min_size or journal_size + len(line) > main_size * self.journal_ratio:
+            self._write()
+            return
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            if not journal_size:
+                f.write(json.dumps({"base": [main_mtime, main_size]}) + "\n")
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+        self._file_state = self._stat()
+        self._clear_pending()
+
+    def _save(self) -> None:
+        """
+        Записать изменения или отложить запись до конца транзакции.
+        """
+        if self._transaction_depth:
+            self._dirty = True
+        else:
+            self._flush()
+
+    @contextmanager
+    def transaction(self) -> Iterator['JSONWorker']:
+        """
+        Выполнить несколько добавлений и удалений с одной записью файла.
+
+        Изменения накапливаются в памяти и записываются атомарно при выходе
+        из блока. При исключении изменения отменяются, файл остается прежним.
+        Вложенные транзакции объединяются с внешней.
+
+        :return: Этот же объект JSONWorker.
+        """
+        self._load()
+        self._transaction_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._transaction_depth -= 1
+            if not self._transaction_depth:
+                self._rollback()
+            raise
+        self._transaction_depth -= 1
+        if not self._transaction_depth and self._dirty:
+            self._flush()
+
+    def _rollback(self) -> None:
+        self._clear_pending()
+        self._file_state = None
+        self._load()
+
+    def _begin_bulk(self, count: int) -> None:
+        """
+        Перед большой пачкой изменений отметить индексы устаревшими.
+
+        Вставка в отсортированный индекс зарплат стоит O(n) на запись, поэтому
+        для большой пачки дешевле один раз построить индексы заново при обращении.
+
+        :param count: Количество записей в пачке.
+        """
+        if count >= BULK_REINDEX_SIZE:
+            self._index_base = None
+            self._words_stale = True
+            self._salaries_stale = True
+
+    def _put(self, record: Dict[str, Any]) -> None:
+        if self._index_base is not None:
+            # Изменения накладываются на индекс из файла, поэтому он читается до них
+            self._word_index()
+        old = self._records.get(record["url"])
+        self._records[record["url"]] = record
+        self._pending_put[record["url"]] = record
+        if not self._words_stale:
+            if old is not None:
+                self.index.remove(old["url"], record_search_text(old))
+            self.index.add(record["url"], record_search_text(record))
+        if not self._salaries_stale:
+            self.salary_index.add(record["url"], record["salary_from"], record["salary_to"], record.get("currency"))
+        self.bump_generation()
+
+    @instrumented("JSONWorker.add_vacancies")
+    def add_vacancies(self, vacancies: List[Vacancy]) -> int:
         """
         Добавить список вакансий в файл JSON.
 
+        Вакансии, URL которых уже есть в файле, пропускаются.
+
         :param vacancies: Список объектов вакансий.
+        :return: Количество пропущенных дубликатов.
         """
-        with open(self.file_path, encoding="utf-8") as f:
-            json_data: List[Dict[str, str]] = json.load(f)
-            for vacancy in vacancies:
-                new_dict: Dict[str, str] = {
-                    "title": vacancy.title,
-                    "url": vacancy.url,
-                    "salary_from": str(vacancy.salary_from),
-                    "salary_to": str(vacancy.salary_to),
-                    "requirements": vacancy.requirements,
-                    "responsibility": vacancy.responsibility,
-                    "city": vacancy.city
-                }
-                json_data.append(new_dict)
-        with open(self.file_path, "w", encoding="utf-8") as f:
-            json.dump(json_data, f, ensure_ascii=False, indent=4)
+        records = self._load()
+        self._begin_bulk(len(vacancies))
+        skipped = 0
+        for vacancy in vacancies:
+            if vacancy.url in records:
+                skipped += 1
+                continue
+            self._put(vacancy.to_dict())
+        self._save()
+        return skipped
 
+    @instrumented("JSONWorker.upsert_vacancies")
+    def upsert_vacancies(self, vacancies: List[Vacancy]) -> Dict[str, int]:
+        """
+        Добавить новые вакансии и обновить уже сохраненные с теми же URL.
+
+        :param vacancies: Список объектов вакансий.
+        :return: Количество добавленных (inserted), обновленных (updated)
+                 и пропущенных как полные дубликаты (skipped) вакансий.
+        """
+        records = self._load()
+        self._begin_bulk(len(vacancies))
+        stats = {"inserted": 0, "updated": 0, "skipped": 0}
+        for vacancy in vacancies:
+            record = vacancy.to_dict()
+            old = records.get(vacancy.url)
+            if old == record:
+                stats["skipped"] += 1
+                continue
+            stats["inserted" if old is None else "updated"] += 1
+            self._put(record)
+        if stats["inserted"] or stats["updated"]:
+            self._save()
+        return stats
+
+    @instrumented("JSONWorker.return_list_vacancies")
     def return_list_vacancies(self) -> List[Vacancy]:
         """
         Вернуть список вакансий из файла JSON.
 
         :return: Список объектов вакансий.
         """
-        with open(self.file_path, encoding="utf-8") as f:
-            json_data: List[Dict[str, str]] = json.load(f)
-            selected_vacancies: List[Vacancy] = []
-            for item in json_data:
-                vacancy = Vacancy(
-                    item["title"],
-                    item["url"],
-                    int(item["salary_from"]),
-                    int(item["salary_to"]),
-                    item["requirements"],
-                    item["responsibility"],
-                    item["city"]
-                )
-                selected_vacancies.append(vacancy)
-        return selected_vacancies
-
-    def del_vacancy(self, vacancy: object):
+        return [Vacancy.from_dict(item) for item in self._load().values()]
+
+    @instrumented("JSONWorker.del_vacancy")
+    def del_vacancy(self, vacancy: Vacancy) -> None:
         """
         Удалить вакансию из файла JSON.
 
         :param vacancy: Объект вакансии для удаления.
         """
-        with open(self.file_path, encoding="utf-8") as f:
-            json_data = json.load(f)
-            for item in json_data:
-                if (item["title"] == vacancy.title and
-                        item["url"] == vacancy.url and
-                        item["salary_from"] == vacancy.salary_from and
-                        item["salary_to"] == vacancy.salary_to and
-                        item["requirements"] == vacancy.requirements and
-                        item["responsibility"] == vacancy.responsibility and
-                        item["city"] == vacancy.city):
-                    json_data.remove(item)
-        with open(self.file_path, "w", encoding="utf-8") as f:
-            json.dump(json_data, f, ensure_ascii=False, indent=4)
+        self.delete_many([vacancy.url])
 
+    @instrumented("JSONWorker.delete_many")
+    def delete_many(self, urls: Iterable[str]) -> int:
+        """
+        Удалить вакансии по их URL.
+
+        :param urls: URL вакансий для удаления.
+        :return: Количество удаленных вакансий.
+        """
+        records = self._load()
+        if self._index_base is not None:
+            self._word_index()
+        deleted = 0
+        for url in urls:
+            item = records.pop(url, None)
+            if item is not None:
+                self._pending_put.pop(url, None)
+                self._pending_deleted[url] = None
+                if not self._words_stale:
+                    self.index.remove(item["url"], record_search_text(item))
+                if not self._salaries_stale:
+                    self.salary_index.remove(item["url"])
+                deleted += 1
+        if deleted:
+            self.bump_generation()
+            self._save()
+        return deleted
+
+    def iter_records(self) -> Iterator[Dict[str, Any]]:
+        """
+        Перебрать вакансии из файла JSON в виде словарей.
+
+        :return: Итератор словарей с данными вакансий.
+        """
+        return iter(list(self._load().values()))
+
+    def iter_file_records(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+        """
+        Перебрать записи, читая файл JSON частями, без загрузки всего хранилища в память.
+
+        Изменения из журнала накладываются на записи файла по ходу чтения:
+        обновленные записи отдаются на своем месте, новые - после записей файла.
+        Из журнала в памяти держатся только URL и смещения строк, сами записи
+        перечитываются из журнала по одной строке, когда до них доходит очередь.
+        Внутри транзакции с еще не записанными изменениями записи берутся из памяти.
+
+        :param chunk_size: Размер читаемой части файла в символах.
+        :return: Итератор словарей с данными вакансий.
+        """
+        if self._dirty:
+            yield from list(self._records.values())
+            return
+        moved, offsets = index_journal(self.journal_path, self._stat()[:2])
+        if not offsets:
+            for record in iter_json_array(self.file_path, chunk_size):
+                if record["url"] not in moved:
+                    yield record
+            return
+        with open(self.journal_path, "rb") as journal:
+            # Последняя прочитанная строка журнала: смещение и ее записи по URL
+            line: Tuple[int, Dict[str, Dict[str, Any]]] = (-1, {})
+
+            def journal_record(url: str, offset: int) -> Dict[str, Any]:
+                nonlocal line
+                if line[0] != offset:
+                    journal.seek(offset)
+                    put = json.loads(journal.readline())["put"]
+                    line = (offset, {record["url"]: record for record in put})
+                return line[1][url]
+
+            for record in iter_json_array(self.file_path, chunk_size):
+                url = record["url"]
+                if url in moved:
+                    continue
+                offset = offsets.pop(url, None)
+                yield record if offset is None else journal_record(url, offset)
+            for url, offset in offsets.items():
+                yield journal_record(url, offset)
+
+    def iter_vacancies(self) -> Iterator[Vacancy]:
+        """
+        Перебрать вакансии из файла JSON по одной.
+
+        Память не зависит от размера файла, перебор можно прервать в любой момент.
+
+        :return: Итератор объектов вакансий.
+        """
+        for record in self.iter_file_records():
+            yield Vacancy.from_dict(record)
+
+    def iter_select(self, keyword: str) -> Iterator[Vacancy]:
+        """
+        Перебрать по одной вакансии из файла JSON, в тексте которых есть ключевое слово.
+
+        :param keyword: Ключевое слово для поиска вакансий.
+        :return: Итератор объектов вакансий.
+        """
+        matcher = KeywordMatcher([keyword])
+        for record in self.iter_file_records():
+            if not matcher or matcher.matches_any(record_search_text(record)):
+                yield Vacancy.from_dict(record)
+
+    def candidate_records(self, keywords: Optional[List[str]]) -> Iterator[Dict[str, Any]]:
+        """
+        Перебрать записи, найденные по ключевым словам в инвертированном индексе.
+
+        :param keywords: Ключевые слова в нижнем регистре или None.
+        :return: Итератор словарей с данными вакансий.
+        """
+        candidates = self._index_candidates(keywords or [], "or")
+        if candidates is None:
+            return self.iter_records()
+        records = self._records
+        return iter([item for url, item in records.items() if url in candidates])
+
+    def _query(self, keywords: Optional[List[str]], min_salary: Optional[int], city: Optional[str],
+               limit: Optional[int]) -> List[Vacancy]:
+        """
+        Выполнить запрос без кэша.
+
+        Вакансии с минимальной зарплатой не ниже min_salary берутся из индекса зарплат
+        и пересекаются с кандидатами по ключевым словам из инвертированного индекса,
+        поэтому зарплата остальных записей не проверяется.
+
+        :param keywords: Слова в нижнем регистре, хотя бы одно из которых должно быть в тексте вакансии, или None.
+        :param min_salary: Минимальная зарплата в рублях или None.
+        :param city: Город, приведенный normalize_city, или None.
+        :param limit: Количество вакансий или None для всех подходящих.
+        :return: Список вакансий по убыванию минимальной зарплаты в рублях.
+        """
+        candidates = self._salary_candidates(min_salary)
+        if candidates is None:
+            return super()._query(keywords, min_salary, city, limit)
+        words = self._index_candidates(keywords or [], "or")
+        if words is not None:
+            candidates &= words
+        matcher = KeywordMatcher(keywords or [])
+        # Зарплата кандидатов из индекса уже не ниже min_salary, а для сортировки берется из индекса
+        matched = (item for url, item in self._records.items()
+                   if url in candidates and record_matches(item, matcher, None, city))
+        ranges = self.salary_index.ranges
+        return [Vacancy.from_dict(record)
+                for record in top_records(matched, limit, key=lambda record: ranges[record["url"]][0])]
+
+    def _salary_candidates(self, min_salary: Optional[int]) -> Optional[Set[str]]:
+        """
+        Кандидаты по индексу зарплат: вакансии с минимальной зарплатой в рублях не ниже min_salary.
+
+        Условие min_salary <= 0 пропускает и вакансии без зарплаты, поэтому не сужает поиск.
+        Индекс, устаревший после чтения файла, для небольшого хранилища не строится.
+
+        :param min_salary: Минимальная зарплата в рублях или None.
+        :return: Множество URL кандидатов или None, если проверять нужно все записи.
+        """
+        if min_salary is None or min_salary <= 0:
+            return None
+        if self._salaries_stale and len(self._load()) < INDEX_SCAN_LIMIT:
+            return None
+        return set(self._salary_index().from_range(min_salary))
+
+    def _index_candidates(self, keywords: List[str], mode: str) -> Optional[Set[str]]:
+        """
+        Кандидаты по инвертированному индексу.
+
+        Слова без букв и цифр ("", "++") не дают слов индекса и не сужают поиск:
+        в режиме "or" такое слово может совпасть с любой записью, в режиме "and"
+        оно проверяется перебором среди кандидатов по остальным словам.
+        Небольшое хранилище, индекс которого еще не прочитан из файла, тоже перебирается.
+
+        :param keywords: Ключевые слова в нижнем регистре.
+        :param mode: "or" или "and".
+        :return: Множество URL кандидатов или None, если проверять нужно все записи.
+        """
+        searchable = [keyword for keyword in keywords if has_tokens(keyword)]
+        if not searchable or (mode == "or" and len(searchable) < len(keywords)):
+            return None
+        if self._index_base is not None and len(self._load()) < INDEX_SCAN_LIMIT:
+            # Индекс еще не прочитан, а небольшое хранилище быстрее перебрать
+            return None
+        return self._word_index().query(searchable, mode)
+
+    @instrumented("JSONWorker.select_vacancy")
     def select_vacancy(self, keyword: str):
         """
         Выбрать вакансии по ключевому слову из файла JSON.
 
+        Кандидаты берутся из инвертированного индекса.
+
         :param keyword: Ключевое слово для поиска вакансий.
         :return: Список объектов вакансий, соответствующих ключевому слову.
         """
-        with open(self.file_path, encoding="utf-8") as f:
-            json_data = json.load(f)
-            selected_vacancies = []
-            for item in json_data:
-                if keyword.lower() in item["title"].lower():
-                    vacancy = Vacancy(
-                        item["title"],
-                        item["url"],
-                        item["salary_from"],
-                        item["salary_to"],
-                        item["requirements"],
-                        item["responsibility"],
-                        item["city"]
-                    )
-                    selected_vacancies.append(vacancy)
-            return selected_vacancies
+        return self.select_vacancies([keyword])
+
+    @instrumented("JSONWorker.select_vacancies")
+    def select_vacancies(self, keywords: Iterable[str], mode: str = "or") -> List[Vacancy]:
+        """
+        Выбрать вакансии по нескольким ключевым словам за один поиск по индексу.
+
+        Слова ищутся в названии, требованиях и обязанностях, как в filter_vacancies.
+
+        :param keywords: Ключевые слова для поиска вакансий.
+        :param mode: "or" - в тексте есть хотя бы одно слово, "and" - все слова.
+        :return: Список объектов вакансий, соответствующих ключевым словам.
+        """
+        return [Vacancy.from_dict(item) for item in self.select_records(keywords, mode)]
+
+    def select_records(self, keywords: Iterable[str], mode: str = "or") -> List[Dict[str, Any]]:
+        """
+        Выбрать записи по ключевым словам, как select_vacancies, без создания объектов Vacancy.
+
+        :param keywords: Ключевые слова для поиска вакансий.
+        :param mode: "or" - в тексте есть хотя бы одно слово, "and" - все слова.
+        :return: Список словарей с данными вакансий в порядке хранилища.
+        """
+        keywords = [keyword.lower() for keyword in keywords]
+        candidates = self._index_candidates(keywords, mode)
+        records = self._load()
+        matcher = KeywordMatcher(keywords)
+        check = matcher.matches_any if mode == "or" else matcher.matches_all
+        selected = []
+        for url, item in records.items():
+            if candidates is not None and url not in candidates:
+                continue
+            # Индекс ищет по словам, точное совпадение подстроки проверяется здесь
+            if not matcher or check(record_search_text(item)):
+                selected.append(item)
+        return selected
+
+    @instrumented("JSONWorker.select_by_salary")
+    def select_by_salary(self, min_salary: int, max_salary: Optional[int] = None) -> List[Vacancy]:
+        """
+        Выбрать вакансии с минимальной зарплатой в заданном диапазоне по индексу зарплат.
+
+        Зарплаты сравниваются в рублях, вакансии без минимальной зарплаты не выбираются.
+
+        :param min_salary: Нижняя граница минимальной зарплаты в рублях.
+        :param max_salary: Верхняя граница минимальной зарплаты в рублях или None.
+        :return: Список объектов вакансий по возрастанию минимальной зарплаты.
+        """
+        return [Vacancy.from_dict(item) for item in self.salary_records(min_salary, max_salary)]
+
+    def salary_records(self, min_salary: int, max_salary: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Выбрать записи по диапазону минимальной зарплаты, как select_by_salary, без создания объектов Vacancy.
+
+        :param min_salary: Нижняя граница минимальной зарплаты в рублях.
+        :param max_salary: Верхняя граница минимальной зарплаты в рублях или None.
+        :return: Список словарей с данными вакансий по возрастанию минимальной зарплаты.
+        """
+        urls = self._salary_index().from_range(min_salary, max_salary)
+        return [self._records[url] for url in urls]
+
+    @instrumented("JSONWorker.select_salary_overlap")
+    def select_salary_overlap(self, low: Optional[int] = None, high: Optional[int] = None) -> List[Vacancy]:
+        """
+        Выбрать вакансии, вилка зарплаты которых пересекает диапазон [low, high].
+
+        Если указана только одна граница вилки, вилка считается одним значением.
+
+        :param low: Нижняя граница диапазона в рублях или None.
+        :param high: Верхняя граница диапазона в рублях или None.
+        :return: Список объектов вакансий по возрастанию нижней границы вилки.
+        """
+        urls = self._salary_index().overlaps(low, high)
+        return [Vacancy.from_dict(self._records[url]) for url in urls]
 
 
 if __name__ == "__main__":
+    from src.api import HHApi
+
     hh_api = HHApi()
     hh_vacancies = hh_api.get_vacancies("python разработчик")
     list_vacancies = Vacancy.create_vacancies(hh_vacancies)
@@ -178,5 +927,3 @@ if __name__ == "__main__":
     selected_vacancy = file_json.select_vacancy("Django")
     for vacancy in selected_vacancy:
         print(f"{vacancy}\n")
-
-
@@ -0,0 +1,7 @@
+from src.vacancy import Vacancy
+
+
+def make_vacancy(number, salary_from=1000, salary_to=0, currency="RUR", title="Python Developer", city="Москва",
+                 requirements="", responsibility=""):
+    return Vacancy(title, f"https://hh.ru/vacancy/{number}", salary_from, salary_to, requirements, responsibility,
+                   city, currency)
@@ -0,0 +1,94 @@
+import asyncio
+import time
+from unittest import mock
+
+import pytest
+import requests
+
+from src.async_api import AsyncHHApi, HHApiError, TokenBucket, backoff_delay
+
+
+def make_response(status_code, body=None, headers=None):
+    response = mock.Mock(status_code=status_code, headers=headers or {}, text="")
+    response.json.return_value = body
+    return response
+
+
+def page_body(page, pages=3):
+    return {"items": [{"id": f"{page}-{i}"} for i in range(2)], "found": pages * 100, "pages": pages, "page": page}
+
+
+def test_backoff_delay_is_bounded():
+    for attempt in range(10):
+        assert 0 <= backoff_delay(attempt, base=0.5, cap=4) <= min(4, 0.5 * 2 ** attempt)
+
+
+def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate=50, capacity=1)
+
+    async def take(count):
+        for _ in range(count):
+            await bucket.acquire()
+
+    start = time.monotonic()
+    asyncio.run(take(6))
+
+    assert time.monotonic() - start >= 5 / 50 * 0.9
+
+
+def test_token_bucket_adapts_to_throttling():
+    bucket = TokenBucket(rate=8, increase=1)
+
+    bucket.on_throttle(retry_after=0.5)
+    assert bucket.rate == 4
+    assert bucket.paused_until > time.monotonic()
+
+    for _ in range(10):
+        bucket.on_success()
+    assert bucket.rate == 8
+
+
+def test_retries_throttled_and_failed_requests():
+    responses = {0: [make_response(200, page_body(0))],
+                 1: [make_response(429, headers={"Retry-After": "0.01"}), make_response(200, page_body(1))],
+                 2: [requests.Timeout(), make_response(503), make_response(200, page_body(2))]}
+
+    def fake_get(url, params=None, timeout=None):
+        result = responses[params["page"]].pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    api = AsyncHHApi(rate=100, backoff_base=0.001)
+    with mock.patch("src.async_api.get_session") as get_session:
+        get_session.return_value.get.side_effect = fake_get
+        items = api.get_vacancies("python", all_pages=True)
+
+    assert [item["id"] for item in items] == ["0-0", "0-1", "1-0", "1-1", "2-0", "2-1"]
+    assert api.bucket.rate < 100
+
+
+def test_client_errors_are_not_retried():
+    api = AsyncHHApi(backoff_base=0.001)
+    with mock.patch("src.async_api.get_session") as get_session:
+        get_session.return_value.get.return_value = make_response(400)
+        with pytest.raises(HHApiError):
+            api.get_vacancies("python")
+
+    assert get_session.return_value.get.call_count == 1
+
+
+def test_search_many():
+    def fake_get(url, params=None, timeout=None):
+        return make_response(200, {"items": [{"id": params["text"]}], "found": 1, "pages": 1})
+
+    api = AsyncHHApi(rate=100)
+    with mock.patch("src.async_api.get_session") as get_session:
+        get_session.return_value.get.side_effect = fake_get
+        results = asyncio.run(api.search_many(["python", "java"]))
+
+    assert results == {"python": [{"id": "python"}], "java": [{"id": "java"}]}
+
+
+if __name__ == "__main__":
+    pytest.main()
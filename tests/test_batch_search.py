@@ -0,0 +1,105 @@
+import json
+
+import pytest
+
+from benchmarks.generator import make_items
+from benchmarks.stub_server import StubHHServer
+from src.batch_search import SearchQuery, load_queries, run_batch, run_search
+from src.vacancy import Vacancy
+from src.worker import JSONWorker
+
+
+def test_load_queries_json_and_csv(tmp_path):
+    json_path = tmp_path / "queries.json"
+    json_path.write_text(json.dumps([{"query": "python", "keywords": ["django"], "salary": 100000, "top_n": 5}]),
+                         encoding="utf-8")
+    csv_path = tmp_path / "queries.csv"
+    csv_path.write_text("name,query,keywords,salary,top_n\njava,java developer,spring boot,150000,3\n",
+                        encoding="utf-8")
+
+    from_json = load_queries(str(json_path))[0]
+    from_csv = load_queries(str(csv_path))[0]
+
+    assert (from_json.name, from_json.keywords, from_json.salary, from_json.top_n) == ("python", ["django"],
+                                                                                      100000, 5)
+    assert (from_csv.name, from_csv.query, from_csv.keywords, from_csv.top_n) == ("java", "java developer",
+                                                                                  ["spring", "boot"], 3)
+
+
+def test_run_batch_writes_results_and_deduplicates(tmp_path):
+    store = JSONWorker("vacancies.json", data_path=str(tmp_path))
+    queries = [SearchQuery("first", "python", top_n=5), SearchQuery("second", "python", ["data"], 100000, 3)]
+
+    with StubHHServer(150) as server:
+        summary = run_batch(queries, str(tmp_path / "results"), store, max_workers=2, url=server.url,
+                            cache_dir=None)
+
+    assert summary["first"]["found"] == summary["second"]["found"] == 150
+    assert summary["first"]["new"] + summary["second"]["new"] == 150
+    assert len(store.return_list_vacancies()) == 150
+    with open(tmp_path / "results" / "second.json", encoding="utf-8") as f:
+        second = json.load(f)
+    assert len(second) <= 3
+    assert all("data" in item["title"].lower() and item["salary_from"] >= 100000 for item in second)
+
+
+def test_run_batch_caps_concurrent_requests(tmp_path):
+    store = JSONWorker("vacancies.json", data_path=str(tmp_path))
+    queries = [SearchQuery(f"q{number}", "python") for number in range(3)]
+
+    with StubHHServer(900, latency=0.05) as server:
+        summary = run_batch(queries, str(tmp_path / "results"), store, max_workers=3, url=server.url,
+                            cache_dir=None, max_requests=3)
+
+    assert all(stats["found"] == 900 for stats in summary.values())
+    assert server.peak_active <= 3
+
+
+def test_run_search_dedupes_and_returns_rows(monkeypatch):
+    items = make_items(30)
+
+    class PagesApi:
+        def __init__(self, **kwargs):
+            pass
+
+        def iter_vacancies(self, query):
+            # Вакансия сдвинулась между страницами выдачи и пришла дважды
+            yield items[:20]
+            yield items[19:]
+
+    monkeypatch.setattr("src.batch_search.HHApi", PagesApi)
+
+    _, found, top = run_search(SearchQuery("python", "python", top_n=3))
+
+    assert all(isinstance(row, tuple) for row in found)
+    expected = Vacancy.create_vacancies(items)
+    assert [Vacancy(*row).to_dict() for row in found] == [vacancy.to_dict() for vacancy in expected]
+    assert len(top) == 3
+
+
+def test_run_batch_with_single_request_slot(tmp_path):
+    store = JSONWorker("vacancies.json", data_path=str(tmp_path))
+    queries = [SearchQuery(f"q{number}", "python") for number in range(3)]
+
+    with StubHHServer(200) as server:
+        summary = run_batch(queries, str(tmp_path / "results"), store, max_workers=3, url=server.url,
+                            cache_dir=None, max_requests=1)
+
+    assert all(stats["found"] == 200 for stats in summary.values())
+    assert server.peak_active == 1
+
+
+def test_run_batch_rejects_duplicate_names(tmp_path):
+    store = JSONWorker("vacancies.json", data_path=str(tmp_path))
+    queries = [SearchQuery("python", "python"), SearchQuery("python", "python developer")]
+
+    with pytest.raises(ValueError):
+        run_batch(queries, str(tmp_path / "results"), store, max_workers=1, cache_dir=None)
+    with pytest.raises(ValueError):
+        run_batch([SearchQuery("data science", "data"), SearchQuery("data_science", "ds")],
+                  str(tmp_path / "results"), store, max_workers=1, cache_dir=None)
+    assert not (tmp_path / "results").exists()
+
+
+if __name__ == "__main__":
+    pytest.main()
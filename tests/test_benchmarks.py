@@ -0,0 +1,38 @@
+import pytest
+
+from benchmarks.generator import make_items
+from benchmarks.run import run
+from benchmarks.stub_server import StubHHServer
+from src.api import HHApi
+from src.vacancy import Vacancy
+
+
+def test_generated_items_match_api_shape():
+    items = make_items(50)
+
+    vacancies = Vacancy.create_vacancies(items)
+
+    assert len(vacancies) == 50
+    assert len({item["id"] for item in items}) == 50
+    assert make_items(50) == items
+
+
+def test_stub_server_pagination():
+    with StubHHServer(250) as server:
+        items = HHApi(url=server.url).get_vacancies("python", all_pages=True)
+
+    assert [item["id"] for item in items] == [item["id"] for item in make_items(250)]
+    assert server.requests == 3
+
+
+def test_run_reports_storage_operations():
+    report = run([200], latency=0.0, max_workers=4, skip_api=True)
+
+    operations = {result["operation"] for result in report["results"]}
+    assert {"Vacancy.create_vacancies", "JSONWorker.add_vacancies", "JSONWorker.select_vacancy",
+            "JSONWorker.del_vacancy", "JSONWorker.return_list_vacancies"} <= operations
+    assert report["version"] == "0.1.0"
+
+
+if __name__ == "__main__":
+    pytest.main()
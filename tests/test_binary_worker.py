@@ -0,0 +1,157 @@
+import os
+import shutil
+from unittest import mock
+
+import pytest
+
+from src import binary_worker
+from src.binary_worker import BinaryWorker
+from tests.conftest import make_vacancy
+
+
+@pytest.fixture(params=["numpy", "pure"])
+def worker(request, tmp_path, monkeypatch):
+    if request.param == "pure":
+        monkeypatch.setattr(binary_worker, "numpy", None)
+    elif binary_worker.numpy is None:
+        pytest.skip("numpy не установлен")
+    return BinaryWorker(data_path=str(tmp_path))
+
+
+def test_round_trip(worker):
+    vacancies = [make_vacancy(1, 100000), make_vacancy(2, title="Аналитик данных", city="Казань")]
+    assert worker.add_vacancies(vacancies) == 0
+
+    assert [vacancy.to_dict() for vacancy in worker.return_list_vacancies()] == \
+           [vacancy.to_dict() for vacancy in vacancies]
+
+
+def test_skips_duplicates_and_reopens(worker, tmp_path):
+    worker.add_vacancies([make_vacancy(1), make_vacancy(2)])
+    assert worker.add_vacancies([make_vacancy(2), make_vacancy(3)]) == 1
+
+    reopened = BinaryWorker(data_path=str(tmp_path))
+    assert reopened.count() == 3
+    assert [vacancy.url for vacancy in reopened.return_list_vacancies()] == \
+           [f"https://hh.ru/vacancy/{i}" for i in (1, 2, 3)]
+
+
+def test_delete(worker, tmp_path):
+    worker.add_vacancies([make_vacancy(1), make_vacancy(2), make_vacancy(3)])
+
+    worker.del_vacancy(make_vacancy(2))
+    assert worker.delete_many(["https://hh.ru/vacancy/2", "https://hh.ru/vacancy/3"]) == 1
+
+    assert [vacancy.url for vacancy in worker.return_list_vacancies()] == ["https://hh.ru/vacancy/1"]
+    assert BinaryWorker(data_path=str(tmp_path)).count() == 1
+    worker.add_vacancies([make_vacancy(2)])
+    assert worker.count() == 2
+
+
+def test_select_by_salary(worker):
+    worker.add_vacancies([make_vacancy(1, 300), make_vacancy(2, 100), make_vacancy(3, 200), make_vacancy(4, 400)])
+    worker.del_vacancy(make_vacancy(4))
+
+    assert [vacancy.salary_from for vacancy in worker.select_by_salary(150)] == [200, 300]
+    assert [vacancy.salary_from for vacancy in worker.select_by_salary(100, 200)] == [100, 200]
+
+
+def test_salary_column_is_filled_for_old_stores(worker, tmp_path):
+    worker.add_vacancies([make_vacancy(1, 300), make_vacancy(2, 100)])
+    os.remove(os.path.join(worker.dir_path, "salary_rub.i64"))
+
+    reopened = BinaryWorker(data_path=str(tmp_path))
+
+    assert [vacancy.salary_from for vacancy in reopened.select_by_salary(150)] == [300]
+    reopened.add_vacancies([make_vacancy(3, 200)])
+    assert [vacancy.salary_from for vacancy in reopened.query(min_salary=150)] == [300, 200]
+
+
+def test_search_text_column_is_filled_for_old_stores(worker, tmp_path):
+    duty = "Разработка сервисов"
+    worker.add_vacancies([make_vacancy(1, responsibility=duty), make_vacancy(2, title="Аналитик", responsibility=duty)])
+    for suffix in ("off", "str"):
+        os.remove(os.path.join(worker.dir_path, f"search_text.{suffix}"))
+
+    reopened = BinaryWorker(data_path=str(tmp_path))
+    reopened.add_vacancies([make_vacancy(3, title="Тестировщик", responsibility=duty)])
+
+    assert [vacancy.url[-1] for vacancy in reopened.select_vacancy("сервисов")] == ["1", "2", "3"]
+    assert [vacancy.url[-1] for vacancy in reopened.query(["аналитик", "тестировщик"])] == ["2", "3"]
+
+
+def test_query(worker):
+    worker.add_vacancies([make_vacancy(1, 100), make_vacancy(2, 300, title="Java Developer"),
+                          make_vacancy(3, 200, city="Казань"), make_vacancy(4, 200), make_vacancy(5, 50)])
+
+    assert [vacancy.url[-1] for vacancy in worker.query(["python"], min_salary=100)] == ["3", "4", "1"]
+    assert [vacancy.url[-1] for vacancy in worker.query(city="Москва", limit=2)] == ["2", "4"]
+    assert [vacancy.url[-1] for vacancy in worker.select_vacancy("JAVA")] == ["2"]
+
+
+def test_query_decodes_only_matching_rows(worker, monkeypatch):
+    worker.add_vacancies([make_vacancy(number, number * 100) for number in range(1, 11)])
+    decoded = []
+    original = binary_worker._Columns.record
+    monkeypatch.setattr(binary_worker._Columns, "record",
+                        lambda columns, row: decoded.append(row) or original(columns, row))
+
+    assert [vacancy.salary_from for vacancy in worker.query(min_salary=900)] == [1000, 900]
+    assert sorted(decoded) == [8, 9]
+
+
+def test_recovers_from_interrupted_append(worker, tmp_path):
+    worker.add_vacancies([make_vacancy(1)])
+    # Запись оборвалась после строковых колонок, флаг удаления не записан
+    with open(os.path.join(worker.dir_path, "title.str"), "ab") as f:
+        f.write("Недописанная".encode("utf-8"))
+
+    reopened = BinaryWorker(data_path=str(tmp_path))
+    reopened.add_vacancies([make_vacancy(2, title="Go Developer")])
+    assert [vacancy.title for vacancy in reopened.return_list_vacancies()] == ["Python Developer", "Go Developer"]
+
+
+def test_compact(worker, tmp_path):
+    worker.add_vacancies([make_vacancy(number) for number in range(1, 6)])
+    worker.delete_many([f"https://hh.ru/vacancy/{number}" for number in (1, 3)])
+
+    worker.compact()
+
+    assert os.path.getsize(os.path.join(worker.dir_path, "salary_from.i64")) == 3 * 8
+    assert [vacancy.url[-1] for vacancy in worker.return_list_vacancies()] == ["2", "4", "5"]
+    assert BinaryWorker(data_path=str(tmp_path)).count() == 3
+
+
+def test_compact_interrupted_between_swaps_is_recovered(worker, tmp_path):
+    worker.add_vacancies([make_vacancy(number) for number in range(1, 6)])
+    worker.delete_many(["https://hh.ru/vacancy/1"])
+    original = os.replace
+    calls = []
+
+    def crash_on_second(src, dst):
+        calls.append(src)
+        if len(calls) == 2:
+            raise OSError("crash")
+        original(src, dst)
+
+    with mock.patch("src.binary_worker.os.replace", crash_on_second), pytest.raises(OSError):
+        worker.compact()
+    assert not os.path.exists(worker.dir_path)
+
+    reopened = BinaryWorker(data_path=str(tmp_path))
+
+    assert [vacancy.url[-1] for vacancy in reopened.return_list_vacancies()] == ["2", "3", "4", "5"]
+    assert sorted(os.listdir(tmp_path)) == ["vacancies.bin"]
+    reopened.compact()
+    assert reopened.count() == 4
+
+
+def test_compact_removes_stale_old_copy(worker, tmp_path):
+    worker.add_vacancies([make_vacancy(number) for number in range(1, 4)])
+    # Копия, оставшаяся после падения между подменой и удалением старой папки
+    shutil.copytree(worker.dir_path, worker.dir_path + ".old")
+
+    worker.compact()
+
+    assert sorted(os.listdir(tmp_path)) == ["vacancies.bin"]
+    assert worker.count() == 3
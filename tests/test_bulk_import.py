@@ -0,0 +1,93 @@
+import json
+import os
+
+import pytest
+
+from benchmarks.generator import make_items
+from src.bulk_import import import_pages, page_items
+from src.worker import JSONWorker
+
+
+def write_pages(dir_path, items, per_page=20):
+    os.makedirs(dir_path, exist_ok=True)
+    for number, start in enumerate(range(0, len(items), per_page)):
+        page = {"items": items[start:start + per_page], "page": number, "pages": 0, "found": len(items)}
+        with open(os.path.join(dir_path, f"page_{number:03d}.json"), "w", encoding="utf-8") as f:
+            json.dump(page, f, ensure_ascii=False)
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+@pytest.mark.parametrize("batch_size, expected", [(30, (0, 100, 20)), (200, (20, 100, 0))])
+def test_import_pages_dedupes_batches_and_commits_once(tmp_path, monkeypatch, max_workers, batch_size, expected):
+    items = make_items(100)
+    write_pages(str(tmp_path / "archive"), items)
+    # Повтор страницы в другой папке архива с измененной зарплатой
+    changed = [dict(item, salary={"from": 999999, "to": None, "currency": "RUR"}) for item in items[:20]]
+    write_pages(str(tmp_path / "archive" / "later"), changed)
+    for name in os.listdir(tmp_path / "archive" / "later"):
+        os.utime(tmp_path / "archive" / "later" / name, (2000000000, 2000000000))
+    store = JSONWorker("vacancies.json", str(tmp_path))
+    # По файлу на задачу, чтобы пул получил больше задач, чем их может ждать родительский процесс
+    monkeypatch.setattr("src.bulk_import.FILES_PER_TASK", 1)
+    commits = []
+    original = JSONWorker.transaction
+
+    def spy(self):
+        commits.append(self)
+        return original(self)
+
+    monkeypatch.setattr(JSONWorker, "transaction", spy)
+
+    report = import_pages(str(tmp_path / "archive"), store, max_workers=max_workers, batch_size=batch_size)
+
+    # Повтор внутри пачки убирается, повтор из более ранней пачки обновляет сохраненную вакансию
+    assert (report["files"], report["parsed"]) == (6, 120)
+    assert (report["duplicates"], report["inserted"], report["updated"]) == expected
+    assert report["skipped"] == 0
+    assert report["records_per_second"] > 0
+    assert len(commits) == 1
+    # Проверяется записанный файл, а не хранилище в памяти
+    assert not os.path.exists(store.journal_path)
+    with open(store.file_path, encoding="utf-8") as f:
+        written = {record["url"]: record for record in json.load(f)}
+    assert len(written) == 100
+    assert written[items[0]["alternate_url"]]["salary_from"] == 999999
+    assert written[items[20]["alternate_url"]]["salary_from"] == items[20]["salary"]["from"]
+    reopened = JSONWorker("vacancies.json", str(tmp_path), reset=False)
+    assert [vacancy.url for vacancy in reopened.return_list_vacancies()] == list(written)
+
+
+def test_import_pages_updates_existing_store(tmp_path):
+    items = make_items(40)
+    write_pages(str(tmp_path / "archive"), items)
+    store = JSONWorker("vacancies.json", str(tmp_path))
+    import_pages(str(tmp_path / "archive"), store, max_workers=1)
+
+    report = import_pages(str(tmp_path / "archive"), store, max_workers=1)
+
+    assert (report["inserted"], report["updated"], report["skipped"]) == (0, 0, 40)
+
+
+def test_import_pages_reports_broken_files(tmp_path):
+    write_pages(str(tmp_path / "archive"), make_items(10))
+    with open(tmp_path / "archive" / "broken.json", "w", encoding="utf-8") as f:
+        f.write('{"items": [')
+    store = JSONWorker("vacancies.json", str(tmp_path))
+
+    report = import_pages(str(tmp_path / "archive"), store, max_workers=1)
+
+    assert report["inserted"] == 10
+    assert [os.path.basename(path) for path, _ in report["errors"]] == ["broken.json"]
+
+
+def test_page_items_accepts_cache_entries_and_lists():
+    items = make_items(3)
+
+    assert page_items({"stored_at": 0, "etag": None, "body": {"items": items}}) == items
+    assert page_items(items) == items
+    with pytest.raises(ValueError):
+        page_items("not a page")
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,84 @@
+import os
+from unittest import mock
+
+import pytest
+
+from src.api import get_json
+from src.cache import ResponseCache
+
+URL = "https://api.hh.ru/vacancies"
+
+
+def make_response(status_code, body=None, etag=None):
+    response = mock.Mock(status_code=status_code, headers={"ETag": etag} if etag else {})
+    response.json.return_value = body
+    return response
+
+
+def test_fresh_entry_served_locally(tmp_path):
+    cache = ResponseCache(str(tmp_path), ttl=60)
+    with mock.patch("src.api.get_session") as get_session:
+        get_session.return_value.get.return_value = make_response(200, {"items": [1]}, etag='"v1"')
+        first = get_json(URL, {"text": "python", "page": 0}, cache=cache)
+        second = get_json(URL, {"page": 0, "text": "python"}, cache=cache)
+
+    assert first == second == {"items": [1]}
+    assert get_session.return_value.get.call_count == 1
+    assert cache.stats() == {"hits": 1, "misses": 1, "revalidated": 0}
+
+
+def test_stale_entry_revalidated_with_etag(tmp_path):
+    cache = ResponseCache(str(tmp_path), ttl=0)
+    cache.put(URL, {"text": "python"}, {"items": [1]}, etag='"v1"')
+    with mock.patch("src.api.get_session") as get_session:
+        get_session.return_value.get.return_value = make_response(304)
+        body = get_json(URL, {"text": "python"}, cache=cache)
+
+    assert body == {"items": [1]}
+    headers = get_session.return_value.get.call_args.kwargs["headers"]
+    assert headers["If-None-Match"] == '"v1"'
+    assert cache.stats()["revalidated"] == 1
+
+
+def test_not_modified_without_entry_is_retried(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    with mock.patch("src.api.get_session") as get_session:
+        get_session.return_value.get.side_effect = [make_response(304), make_response(200, {"items": [1]})]
+        body = get_json(URL, {"text": "python"}, headers={"If-None-Match": '"v0"'}, cache=cache)
+
+    assert body == {"items": [1]}
+    assert "If-None-Match" not in get_session.return_value.get.call_args.kwargs["headers"]
+    assert cache.get(URL, {"text": "python"})["body"] == {"items": [1]}
+    assert cache.stats()["misses"] == 1
+
+
+def test_put_scans_directory_only_when_limits_are_crossed(tmp_path):
+    cache = ResponseCache(str(tmp_path), max_entries=3)
+    with mock.patch("src.cache.os.scandir", wraps=os.scandir) as scandir:
+        for page in range(3):
+            cache.put(URL, {"page": page}, {"page": page})
+        cache.put(URL, {"page": 0}, {"page": 0, "changed": True})
+        assert scandir.call_count == 1
+
+        cache.put(URL, {"page": 3}, {"page": 3})
+
+    assert scandir.call_count == 2
+    assert len(os.listdir(str(tmp_path))) == 3
+
+
+def test_eviction_keeps_recent_entries(tmp_path):
+    cache = ResponseCache(str(tmp_path), max_entries=3)
+    for page in range(5):
+        cache.put(URL, {"page": page}, {"page": page})
+        # разносим время доступа, чтобы порядок вытеснения был детерминированным
+        os.utime(cache._path(cache.make_key(URL, {"page": page})), (page, page))
+
+    cache.evict()
+
+    assert len(os.listdir(str(tmp_path))) == 3
+    assert cache.get(URL, {"page": 0}) is None
+    assert cache.get(URL, {"page": 4}) == mock.ANY
+
+
+if __name__ == "__main__":
+    pytest.main()
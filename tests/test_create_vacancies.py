@@ -1,4 +1,5 @@
 import pytest
+from src.vacancy import Vacancy
 def test_create_vacancies():
     vacancies_data = [
         {
@@ -0,0 +1,156 @@
+import json
+from unittest import mock
+
+import pytest
+
+from src.index import InvertedIndex
+from src.vacancy import Vacancy
+from src.worker import JSONWorker
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = InvertedIndex(str(tmp_path / "vacancies.json.index"))
+    index.add("1", "Python Developer")
+    index.add("2", "Senior Java Developer")
+    index.add("3", "Data Scientist (Python)")
+    return index
+
+
+def test_lookup_matches_substrings_of_words(index):
+    assert index.lookup("python") == {"1", "3"}
+    assert index.lookup("velop") == {"1", "2"}
+    assert index.lookup("java developer") == {"2"}
+    assert index.lookup("golang") == set()
+
+
+def test_query_or_and(index):
+    assert index.query(["java", "data"]) == {"2", "3"}
+    assert index.query(["python", "developer"], mode="and") == {"1"}
+    with pytest.raises(ValueError):
+        index.query(["python"], mode="xor")
+
+
+def test_remove_and_persist(index):
+    index.remove("1", "Python Developer")
+    index.save()
+
+    loaded = InvertedIndex(index.file_path)
+    assert loaded.load()
+    assert loaded.lookup("python") == {"3"}
+    assert loaded.lookup("developer") == {"2"}
+
+
+def test_json_worker_select_vacancies(tmp_path):
+    worker = JSONWorker("vacancies.json", data_path=str(tmp_path))
+    worker.add_vacancies([
+        Vacancy("Python Developer", "https://hh.ru/vacancy/1", 1000, 0, "", "", "Москва"),
+        Vacancy("Java Developer", "https://hh.ru/vacancy/2", 2000, 0, "", "", "Москва"),
+        Vacancy("Data Scientist", "https://hh.ru/vacancy/3", 3000, 0, "", "", "Москва"),
+    ])
+
+    assert [vacancy.url for vacancy in worker.select_vacancy("Develop")] == [
+        "https://hh.ru/vacancy/1", "https://hh.ru/vacancy/2"]
+    assert [vacancy.url for vacancy in worker.select_vacancies(["python", "data"])] == [
+        "https://hh.ru/vacancy/1", "https://hh.ru/vacancy/3"]
+    assert [vacancy.url for vacancy in worker.select_vacancies(["java", "dev"], mode="and")] == [
+        "https://hh.ru/vacancy/2"]
+
+    reloaded = InvertedIndex(worker.index.file_path)
+    assert reloaded.load()
+    assert reloaded.lookup("scientist") == {"https://hh.ru/vacancy/3"}
+
+
+def make_store(tmp_path):
+    worker = JSONWorker("vacancies.json", data_path=str(tmp_path))
+    worker.journal_min_size = 0
+    worker.add_vacancies([Vacancy(f"Python Developer {number}", f"https://hh.ru/vacancy/{number}", 1000, 0, "", "",
+                                  "Москва") for number in range(100)])
+    return worker
+
+
+def test_reopen_uses_saved_index_and_journal(tmp_path):
+    worker = make_store(tmp_path)
+    worker.del_vacancy(Vacancy("", "https://hh.ru/vacancy/0", 0, 0, "", "", ""))
+    worker.add_vacancies([Vacancy("Go Developer", "https://hh.ru/vacancy/500", 1000, 0, "", "", "Москва")])
+
+    with mock.patch.object(InvertedIndex, "rebuild") as rebuild:
+        reopened = JSONWorker("vacancies.json", data_path=str(tmp_path), reset=False)
+        python = reopened.select_vacancy("python")
+        go = reopened.select_vacancy("go")
+
+    rebuild.assert_not_called()
+    assert len(python) == 99 and python[0].url == "https://hh.ru/vacancy/1"
+    assert [vacancy.url for vacancy in go] == ["https://hh.ru/vacancy/500"]
+
+
+def test_saved_index_is_ignored_after_external_rewrite(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.worker.INDEX_SCAN_LIMIT", 0)
+    worker = make_store(tmp_path)
+    with open(worker.file_path, "w", encoding="utf-8") as f:
+        json.dump([Vacancy("Java Developer", "https://hh.ru/vacancy/7", 0, 0, "", "", "").to_dict()], f)
+
+    reopened = JSONWorker("vacancies.json", data_path=str(tmp_path), reset=False)
+
+    assert reopened.select_vacancy("python") == []
+    assert [vacancy.url for vacancy in reopened.select_vacancy("java")] == ["https://hh.ru/vacancy/7"]
+
+
+def test_index_of_titles_only_is_rebuilt(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.worker.INDEX_SCAN_LIMIT", 0)
+    worker = JSONWorker("vacancies.json", data_path=str(tmp_path))
+    worker.add_vacancies([Vacancy("Backend Developer", "https://hh.ru/vacancy/1", 0, 0, "Опыт с Django", "", "")])
+    # Индекс прежнего формата: без версии, только слова названий
+    with open(worker.index.file_path, encoding="utf-8") as f:
+        saved = json.load(f)
+    with open(worker.index.file_path, "w", encoding="utf-8") as f:
+        json.dump({"base": saved["base"], "postings": {"backend": ["https://hh.ru/vacancy/1"],
+                                                       "developer": ["https://hh.ru/vacancy/1"]}}, f)
+
+    reopened = JSONWorker("vacancies.json", data_path=str(tmp_path), reset=False)
+
+    assert [vacancy.url for vacancy in reopened.select_vacancy("django")] == ["https://hh.ru/vacancy/1"]
+
+
+def test_keywords_without_index_tokens_fall_back_to_scan(tmp_path):
+    worker = JSONWorker("vacancies.json", data_path=str(tmp_path))
+    worker.add_vacancies([
+        Vacancy("C++ Developer", "https://hh.ru/vacancy/1", 1000, 0, "", "", "Москва"),
+        Vacancy("Программист 1С:Предприятие", "https://hh.ru/vacancy/2", 2000, 0, "", "", "Москва"),
+        Vacancy("Python Developer", "https://hh.ru/vacancy/3", 3000, 0, "", "", "Москва"),
+    ])
+
+    assert len(worker.select_vacancy("")) == 3
+    assert [vacancy.url for vacancy in worker.select_vacancy("++")] == ["https://hh.ru/vacancy/1"]
+    assert [vacancy.url for vacancy in worker.select_vacancy("c++")] == ["https://hh.ru/vacancy/1"]
+    assert [vacancy.url for vacancy in worker.select_vacancy("1С:")] == ["https://hh.ru/vacancy/2"]
+    assert [vacancy.url for vacancy in worker.select_vacancies(["++", "python"])] == [
+        "https://hh.ru/vacancy/1", "https://hh.ru/vacancy/3"]
+    assert [vacancy.url for vacancy in worker.select_vacancies(["++", "developer"], mode="and")] == [
+        "https://hh.ru/vacancy/1"]
+    assert [vacancy.url for vacancy in worker.query(["++"])] == ["https://hh.ru/vacancy/1"]
+
+
+
+def test_saved_index_is_read_on_first_keyword_search(tmp_path, monkeypatch):
+    make_store(tmp_path)
+
+    with mock.patch.object(InvertedIndex, "load") as load:
+        small = JSONWorker("vacancies.json", data_path=str(tmp_path), reset=False)
+        assert len(small.query(["python"], 500)) == 100
+    load.assert_not_called()
+
+    monkeypatch.setattr("src.worker.INDEX_SCAN_LIMIT", 0)
+    reopened = JSONWorker("vacancies.json", data_path=str(tmp_path), reset=False)
+    reopened.add_vacancies([Vacancy("Go Developer", "https://hh.ru/vacancy/500", 1000, 0, "", "", "Москва")])
+    with mock.patch.object(InvertedIndex, "rebuild") as rebuild:
+        go = reopened.select_vacancy("go")
+        python = reopened.select_vacancy("python")
+
+    rebuild.assert_not_called()
+    assert [vacancy.url for vacancy in go] == ["https://hh.ru/vacancy/500"]
+    assert len(python) == 100
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,193 @@
+import json
+import os
+from unittest import mock
+
+import pytest
+
+from src.worker import JSONWorker
+from tests.conftest import make_vacancy
+
+
+@pytest.fixture
+def worker(tmp_path):
+    return JSONWorker("vacancies.json", data_path=str(tmp_path))
+
+
+def read_file(worker):
+    with open(worker.file_path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_add_vacancies_skips_duplicates(worker):
+    assert worker.add_vacancies([make_vacancy(1), make_vacancy(2)]) == 0
+    assert worker.add_vacancies([make_vacancy(2), make_vacancy(3), make_vacancy(3)]) == 2
+
+    assert [item["url"] for item in read_file(worker)] == [f"https://hh.ru/vacancy/{i}" for i in (1, 2, 3)]
+
+
+def test_upsert_vacancies(worker):
+    worker.add_vacancies([make_vacancy(1), make_vacancy(2)])
+
+    stats = worker.upsert_vacancies([make_vacancy(1), make_vacancy(2, salary_from=5000, title="Go Developer"),
+                                     make_vacancy(3)])
+
+    assert stats == {"inserted": 1, "updated": 1, "skipped": 1}
+    assert [item["salary_from"] for item in read_file(worker)] == [1000, 5000, 1000]
+    assert [vacancy.url for vacancy in worker.select_vacancy("python")] == ["https://hh.ru/vacancy/1",
+                                                                          "https://hh.ru/vacancy/3"]
+    assert [vacancy.url for vacancy in worker.select_vacancy("go")] == ["https://hh.ru/vacancy/2"]
+
+
+def test_del_vacancy_and_delete_many(worker):
+    worker.add_vacancies([make_vacancy(number) for number in range(5)])
+
+    worker.del_vacancy(make_vacancy(0))
+    assert worker.delete_many(["https://hh.ru/vacancy/1", "https://hh.ru/vacancy/3", "missing"]) == 2
+
+    assert [item["url"] for item in read_file(worker)] == ["https://hh.ru/vacancy/2", "https://hh.ru/vacancy/4"]
+    assert len(worker.select_vacancy("python")) == 2
+
+
+def test_external_changes_are_reloaded(worker):
+    worker.add_vacancies([make_vacancy(1)])
+    with open(worker.file_path, "w", encoding="utf-8") as f:
+        json.dump([make_vacancy(7).to_dict(), make_vacancy(8).to_dict()], f)
+
+    assert [vacancy.url for vacancy in worker.return_list_vacancies()] == ["https://hh.ru/vacancy/7",
+                                                                         "https://hh.ru/vacancy/8"]
+    assert len(worker.select_vacancy("python")) == 2
+
+
+def test_transaction_writes_once(worker):
+    with mock.patch("src.worker.os.replace", wraps=os.replace) as replace:
+        with worker.transaction():
+            for number in range(100):
+                worker.add_vacancies([make_vacancy(number)])
+            worker.delete_many([f"https://hh.ru/vacancy/{number}" for number in range(50)])
+            assert read_file(worker) == []
+
+    assert [call.args[1] for call in replace.call_args_list].count(worker.file_path) == 1
+    assert len(read_file(worker)) == 50
+
+
+def test_transaction_rollback_on_error(worker):
+    worker.add_vacancies([make_vacancy(1)])
+
+    with pytest.raises(RuntimeError):
+        with worker.transaction():
+            worker.add_vacancies([make_vacancy(2)])
+            worker.del_vacancy(make_vacancy(1))
+            raise RuntimeError
+
+    assert [item["url"] for item in read_file(worker)] == ["https://hh.ru/vacancy/1"]
+    assert [vacancy.url for vacancy in worker.return_list_vacancies()] == ["https://hh.ru/vacancy/1"]
+    assert not [name for name in os.listdir(os.path.dirname(worker.file_path)) if name.endswith(".tmp")]
+
+
+def test_open_existing_store_without_reset(worker, tmp_path):
+    worker.add_vacancies([make_vacancy(1), make_vacancy(2, title="Go Developer")])
+
+    reopened = JSONWorker("vacancies.json", data_path=str(tmp_path), reset=False)
+
+    assert len(reopened.return_list_vacancies()) == 2
+    assert [vacancy.url for vacancy in reopened.select_vacancy("go")] == ["https://hh.ru/vacancy/2"]
+    assert JSONWorker("vacancies.json", data_path=str(tmp_path)).return_list_vacancies() == []
+
+
+def test_bulk_batch_rebuilds_indexes(worker):
+    worker.add_vacancies([make_vacancy(i, 1000 * (i % 50), title="Java Developer") for i in range(10)])
+    worker.select_by_salary(0)
+
+    worker.upsert_vacancies([make_vacancy(i, 1000 * (i % 50), title="Python Developer") for i in range(1500)])
+
+    assert len(worker.select_vacancy("python")) == 1500
+    assert worker.select_vacancy("java") == []
+    assert [vacancy.salary_from for vacancy in worker.select_by_salary(48000)] == [48000] * 30 + [49000] * 30
+
+
+@pytest.fixture
+def journaled(worker):
+    worker.journal_min_size = 0
+    worker.add_vacancies([make_vacancy(number, 1000 * number) for number in range(200)])
+    return worker
+
+
+def urls(records):
+    return [record["url"] for record in records]
+
+
+def test_single_writes_append_to_journal(journaled, tmp_path):
+    with mock.patch("src.worker.os.replace", wraps=os.replace) as replace:
+        journaled.del_vacancy(make_vacancy(0))
+        journaled.delete_many(["https://hh.ru/vacancy/1", "https://hh.ru/vacancy/2"])
+        journaled.add_vacancies([make_vacancy(500, title="Go Developer")])
+        journaled.upsert_vacancies([make_vacancy(10, salary_from=99999)])
+
+    assert replace.call_count == 0
+    assert len(read_file(journaled)) == 200
+    with open(journaled.journal_path, encoding="utf-8") as f:
+        assert len(f.readlines()) == 5
+
+    reopened = JSONWorker("vacancies.json", data_path=str(tmp_path), reset=False)
+    expected = urls(vacancy.to_dict() for vacancy in journaled.return_list_vacancies())
+    assert urls(vacancy.to_dict() for vacancy in reopened.return_list_vacancies()) == expected
+    assert urls(reopened.iter_file_records()) == expected
+    assert expected[0] == "https://hh.ru/vacancy/3" and expected[-1] == "https://hh.ru/vacancy/500"
+    assert [vacancy.url for vacancy in reopened.select_vacancy("go")] == ["https://hh.ru/vacancy/500"]
+    assert reopened.select_by_salary(99999)[0].url == "https://hh.ru/vacancy/10"
+
+
+def test_streaming_keeps_only_journal_offsets(journaled, tmp_path):
+    journaled.del_vacancy(make_vacancy(5))
+    journaled.upsert_vacancies([make_vacancy(7, salary_from=77777), make_vacancy(300)])
+    journaled.del_vacancy(make_vacancy(300))
+    journaled.add_vacancies([make_vacancy(5, title="Go Developer"), make_vacancy(300)])
+    journaled.upsert_vacancies([make_vacancy(9, salary_from=99999), make_vacancy(7, salary_from=70000)])
+
+    reopened = JSONWorker("vacancies.json", data_path=str(tmp_path), reset=False)
+    with mock.patch("src.worker.read_journal") as read:
+        streamed = list(reopened.iter_file_records())
+
+    read.assert_not_called()
+    assert streamed == list(reopened.iter_records())
+    assert urls(streamed)[-2:] == ["https://hh.ru/vacancy/5", "https://hh.ru/vacancy/300"]
+    salaries = {record["url"]: record["salary_from"] for record in streamed}
+    assert salaries["https://hh.ru/vacancy/7"] == 70000 and salaries["https://hh.ru/vacancy/9"] == 99999
+
+
+def test_journal_is_merged_when_it_grows(journaled, tmp_path):
+    journaled.journal_ratio = 0.1
+    for number in range(150):
+        journaled.del_vacancy(make_vacancy(number))
+
+    assert 50 < len(read_file(journaled)) < 200
+    reopened = JSONWorker("vacancies.json", data_path=str(tmp_path), reset=False)
+    assert len(reopened.return_list_vacancies()) == 50
+
+
+def test_stale_journal_is_not_applied(journaled, tmp_path):
+    journaled.del_vacancy(make_vacancy(0))
+    with open(journaled.file_path, "w", encoding="utf-8") as f:
+        json.dump([make_vacancy(7).to_dict()], f)
+
+    reopened = JSONWorker("vacancies.json", data_path=str(tmp_path), reset=False)
+
+    assert [vacancy.url for vacancy in reopened.return_list_vacancies()] == ["https://hh.ru/vacancy/7"]
+    assert not os.path.exists(reopened.journal_path)
+
+
+def test_torn_journal_line_is_skipped(journaled, tmp_path):
+    journaled.del_vacancy(make_vacancy(0))
+    with open(journaled.journal_path, "a", encoding="utf-8") as f:
+        f.write('{"deleted": ["https://hh.ru/vacancy/1"], "put": [')
+
+    reopened = JSONWorker("vacancies.json", data_path=str(tmp_path), reset=False)
+    reopened.del_vacancy(make_vacancy(2))
+
+    remaining = JSONWorker("vacancies.json", data_path=str(tmp_path), reset=False).return_list_vacancies()
+    assert [vacancy.url for vacancy in remaining][:2] == ["https://hh.ru/vacancy/1", "https://hh.ru/vacancy/3"]
+    assert len(remaining) == 198
+
+
+if __name__ == "__main__":
+    pytest.main()
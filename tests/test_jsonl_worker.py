@@ -0,0 +1,153 @@
+import json
+
+import pytest
+
+from src.jsonl_worker import JSONLWorker
+from src.vacancy import Vacancy
+
+
+def make_vacancies(count, start=0):
+    return [Vacancy(f"Python Developer {i}", f"https://hh.ru/vacancy/{i}", 1000 * i, 0, "", "", "Москва")
+            for i in range(start, start + count)]
+
+
+def test_add_vacancies_appends_lines(tmp_path):
+    worker = JSONLWorker(data_path=str(tmp_path))
+
+    worker.add_vacancies(make_vacancies(2))
+    worker.add_vacancies(make_vacancies(1, start=2))
+
+    with open(worker.file_path, encoding="utf-8") as f:
+        lines = [json.loads(line) for line in f]
+    assert [line["url"] for line in lines] == [f"https://hh.ru/vacancy/{i}" for i in range(3)]
+    assert lines[1]["salary_from"] == 1000
+
+
+def test_del_vacancy_writes_tombstone(tmp_path):
+    worker = JSONLWorker(data_path=str(tmp_path))
+    vacancies = make_vacancies(3)
+    worker.add_vacancies(vacancies)
+
+    worker.del_vacancy(vacancies[1])
+
+    assert [vacancy.url for vacancy in worker.return_list_vacancies()] == [vacancies[0].url, vacancies[2].url]
+    assert worker.dead_lines == 2
+    # состояние восстанавливается при повторном открытии файла
+    assert JSONLWorker(data_path=str(tmp_path)).dead_lines == 2
+
+
+def test_readded_vacancy_survives_earlier_tombstone(tmp_path):
+    worker = JSONLWorker(data_path=str(tmp_path))
+    vacancy = make_vacancies(1)[0]
+    worker.add_vacancies([vacancy])
+    worker.del_vacancy(vacancy)
+    worker.add_vacancies([vacancy])
+
+    assert len(worker.return_list_vacancies()) == 1
+
+
+def test_add_vacancies_skips_known_urls(tmp_path):
+    worker = JSONLWorker(data_path=str(tmp_path))
+    vacancies = make_vacancies(3)
+    worker.add_vacancies(vacancies[:2])
+
+    assert worker.add_vacancies([vacancies[1], vacancies[2], vacancies[2]]) == 2
+
+    assert [vacancy.url for vacancy in worker.return_list_vacancies()] == [vacancy.url for vacancy in vacancies]
+    assert worker.dead_lines == 0
+
+
+def test_duplicate_lines_in_file_are_dead_and_compacted_on_append(tmp_path):
+    worker = JSONLWorker(data_path=str(tmp_path), compact_min_lines=10)
+    # Файл старой версии, которая дописывала повторы
+    with open(worker.file_path, "w", encoding="utf-8") as f:
+        for vacancy in make_vacancies(4) + make_vacancies(2) * 3:
+            f.write(json.dumps(vacancy.to_dict(), ensure_ascii=False) + "\n")
+    reopened = JSONLWorker(data_path=str(tmp_path), compact_min_lines=10)
+
+    assert reopened.dead_lines == 6
+    assert [record["salary_from"] for record in reopened.iter_records()] == [0, 1000, 2000, 3000]
+
+    reopened.add_vacancies(make_vacancies(1, start=4))
+    reopened.wait_compaction()
+
+    with open(reopened.file_path, encoding="utf-8") as f:
+        assert len(f.readlines()) == 5
+    assert reopened.dead_lines == 0
+
+
+def test_compaction_after_threshold(tmp_path):
+    worker = JSONLWorker(data_path=str(tmp_path), compact_ratio=0.5, compact_min_lines=10)
+    vacancies = make_vacancies(10)
+    worker.add_vacancies(vacancies)
+
+    for vacancy in vacancies[:4]:
+        worker.del_vacancy(vacancy)
+    worker.wait_compaction()
+
+    with open(worker.file_path, encoding="utf-8") as f:
+        assert len(f.readlines()) == 6
+    assert worker.dead_lines == 0
+    assert len(worker.select_vacancy("python")) == 6
+
+
+def test_iter_records_reads_one_snapshot_during_compaction(tmp_path):
+    worker = JSONLWorker(data_path=str(tmp_path))
+    vacancies = make_vacancies(5)
+    worker.add_vacancies(vacancies)
+    for vacancy in vacancies[:3]:
+        worker.del_vacancy(vacancy)
+    worker.add_vacancies([vacancies[0]])
+
+    records = worker.iter_records()
+    first = next(records)
+    # Уплотнение и новая запись между первым и вторым проходом не меняют перебор
+    worker.compact()
+    worker.add_vacancies(make_vacancies(1, start=10))
+
+    assert [first["url"]] + [record["url"] for record in records] == \
+        [vacancies[3].url, vacancies[4].url, vacancies[0].url]
+    assert len(worker.return_list_vacancies()) == 4
+
+
+def test_compaction_between_passes_does_not_drop_records(tmp_path, monkeypatch):
+    worker = JSONLWorker(data_path=str(tmp_path))
+    vacancies = make_vacancies(5)
+    worker.add_vacancies(vacancies)
+    for vacancy in vacancies[:3]:
+        worker.del_vacancy(vacancy)
+    worker.add_vacancies([vacancies[0]])
+    with open(worker.file_path, encoding="utf-8") as f:
+        lines = len(f.readlines())
+    loads = json.loads
+    calls = []
+
+    def loads_then_compact(line):
+        calls.append(line)
+        if len(calls) == lines:
+            # Первый проход дочитал файл: уплотнение успевает подменить его до второго прохода
+            monkeypatch.setattr(json, "loads", loads)
+            worker.compact()
+        return loads(line)
+
+    monkeypatch.setattr(json, "loads", loads_then_compact)
+
+    assert [record["url"] for record in worker.iter_records()] == \
+        [vacancies[3].url, vacancies[4].url, vacancies[0].url]
+
+
+def test_migrate_from_json(tmp_path):
+    json_path = tmp_path / "vacancies.json"
+    json_path.write_text(json.dumps([{
+        "title": "Python Developer", "url": "https://hh.ru/vacancy/1", "salary_from": "1000",
+        "salary_to": "0", "requirements": "", "responsibility": "", "city": "Москва"
+    }]), encoding="utf-8")
+    worker = JSONLWorker(data_path=str(tmp_path))
+
+    assert worker.migrate_from_json(str(json_path)) == 1
+    assert worker.migrate_from_json(str(json_path)) == 0
+    assert worker.return_list_vacancies()[0].salary_from == 1000
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,60 @@
+from unittest import mock
+
+from src.matcher import KeywordMatcher, normalize_text, strip_markup
+from src.utils import filter_vacancies
+from src.vacancy import Vacancy
+
+
+def test_strip_markup_and_normalize():
+    assert strip_markup("Опыт с <highlighttext>Python</highlighttext>") == "Опыт с Python"
+    assert normalize_text("<highlighttext>ДЖАНГО</highlighttext> Straße") == "джанго strasse"
+
+
+def test_matcher_finds_overlapping_keywords():
+    matcher = KeywordMatcher(["Go", "golang", "lang", "", "GO"])
+
+    assert matcher.keywords == ["go", "golang", "lang"]
+    assert matcher.found_keywords("пишем на golang") == ["go", "golang", "lang"]
+    assert matcher.matches_any("django")
+    assert not matcher.matches_any("python")
+    assert matcher.matches_all("golang")
+    assert not matcher.matches_all("go")
+
+
+def test_empty_matcher():
+    matcher = KeywordMatcher([" "])
+
+    assert not matcher
+    assert not matcher.matches_any("текст")
+    assert not matcher.matches_all("текст")
+
+
+def test_vacancy_strips_markup_at_ingest():
+    vacancy = Vacancy.create_vacancies([{
+        "name": "Backend Developer", "alternate_url": "https://hh.ru/vacancy/1", "salary": None,
+        "snippet": {"requirement": "Знание <highlighttext>Python</highlighttext>",
+                    "responsibility": "Поддержка <highlighttext>API</highlighttext>"},
+        "area": {"name": "Москва"},
+    }])[0]
+
+    assert vacancy.requirements == "Знание Python"
+    assert vacancy.search_text == "backend developer\nзнание python\nподдержка api"
+    assert vacancy.to_dict()["search_text"] == vacancy.search_text
+    # Сохраненный текст читается как есть, без повторной нормализации
+    with mock.patch("src.vacancy.make_search_text") as make_search_text:
+        assert Vacancy.from_dict(vacancy.to_dict()).search_text == vacancy.search_text
+    make_search_text.assert_not_called()
+    legacy = {key: value for key, value in vacancy.to_dict().items() if key != "search_text"}
+    assert Vacancy.from_dict(legacy).search_text == vacancy.search_text
+
+
+def test_filter_vacancies_searches_all_text_fields():
+    vacancies = [
+        Vacancy("Backend Developer", "url1", 1000, 0, "Опыт с <highlighttext>Django</highlighttext>", "", "Москва"),
+        Vacancy("Аналитик", "url2", 1000, 0, "", "Отчеты в PYTHON", "Москва"),
+        Vacancy("Java Developer", "url3", 1000, 0, "Spring", "Микросервисы", "Москва"),
+    ]
+
+    selected = filter_vacancies(vacancies, ["django", "Python"], 0)
+
+    assert [vacancy.url for vacancy in selected] == ["url1", "url2"]
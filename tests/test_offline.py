@@ -0,0 +1,51 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import main
+from config import ROOT_DIR
+from src.vacancy import Vacancy
+from src.worker import JSONWorker
+
+
+@pytest.fixture
+def store_path(tmp_path):
+    vacancies = [
+        Vacancy("Python Developer", "https://hh.ru/vacancy/1", 150000, 200000, "", "", "Москва"),
+        Vacancy("Python Junior", "https://hh.ru/vacancy/2", 60000, 0, "", "", "Москва"),
+        Vacancy("Java Developer", "https://hh.ru/vacancy/3", 180000, 0, "", "", "Казань"),
+    ]
+    JSONWorker("vacancies.json", str(tmp_path)).add_vacancies(vacancies)
+    return os.path.join(str(tmp_path), "vacancies.json")
+
+
+def test_offline_mode_selects_from_store(store_path, capsys):
+    main.main(["--offline", "--store", store_path, "--keywords", "python", "--salary", "100000"])
+
+    output = capsys.readouterr().out
+    assert "https://hh.ru/vacancy/1" in output
+    assert "https://hh.ru/vacancy/2" not in output
+    assert "https://hh.ru/vacancy/3" not in output
+    assert "Показано 1 вакансий" in output
+
+
+def test_offline_mode_reports_missing_store(tmp_path, capsys):
+    main.main(["--offline", "--store", str(tmp_path / "missing.json")])
+
+    assert "не найдено" in capsys.readouterr().out
+
+
+def test_offline_mode_does_not_import_network_modules(store_path):
+    code = ("import sys, main; main.main(['--offline', '--store', sys.argv[1], '--keywords', 'python']); "
+            "print('imported' if 'requests' in sys.modules or 'src.api' in sys.modules else 'clean')")
+
+    result = subprocess.run([sys.executable, "-c", code, store_path], cwd=ROOT_DIR, capture_output=True,
+                            text=True, check=True)
+
+    assert result.stdout.strip().splitlines()[-1] == "clean"
+
+
+if __name__ == "__main__":
+    pytest.main()
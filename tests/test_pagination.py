@@ -0,0 +1,110 @@
+import time
+from unittest import mock
+
+import pytest
+
+from src.api import HHApi, fetch_all_pages
+from src.hh import HH
+
+
+def make_fetch_page(found, per_page=100, delay=0.0):
+    pages = -(-found // per_page)
+    calls = []
+
+    def fetch_page(page):
+        calls.append(page)
+        time.sleep(delay)
+        items = [{"id": str(page * per_page + i)} for i in range(min(per_page, found - page * per_page))]
+        return {"items": items, "found": found, "pages": pages, "page": page, "per_page": per_page}
+
+    return fetch_page, calls
+
+
+def test_fetch_all_pages_keeps_page_order():
+    fetch_page, calls = make_fetch_page(found=950, delay=0.01)
+
+    pages = fetch_all_pages(fetch_page)
+
+    assert [page["page"] for page in pages] == list(range(10))
+    assert sorted(calls) == list(range(10))
+
+
+def test_fetch_all_pages_single_page():
+    fetch_page, calls = make_fetch_page(found=30)
+
+    pages = fetch_all_pages(fetch_page)
+
+    assert len(pages) == 1
+    assert calls == [0]
+
+
+def test_fetch_all_pages_respects_depth_limit():
+    fetch_page, calls = make_fetch_page(found=10000)
+
+    pages = fetch_all_pages(fetch_page)
+
+    assert len(pages) == 20
+    assert max(calls) == 19
+
+
+def test_fetch_all_pages_runs_concurrently():
+    fetch_page, _ = make_fetch_page(found=2000, delay=0.05)
+
+    start = time.perf_counter()
+    fetch_all_pages(fetch_page, max_workers=19)
+    elapsed = time.perf_counter() - start
+
+    # первая страница + один параллельный раунд, а не 20 последовательных запросов
+    assert elapsed < 0.05 * 20 / 2
+
+
+def test_hh_api_get_vacancies_all_pages():
+    fetch_page, _ = make_fetch_page(found=250)
+
+    def fake_get(url, params=None, **kwargs):
+        response = mock.Mock(status_code=200)
+        response.json.return_value = fetch_page(params["page"])
+        return response
+
+    with mock.patch("src.api.get_session") as get_session:
+        get_session.return_value.get.side_effect = fake_get
+        items = HHApi().get_vacancies("python", all_pages=True)
+
+    assert [item["id"] for item in items] == [str(i) for i in range(250)]
+
+
+def test_hh_api_iter_vacancies_reports_found():
+    fetch_page, _ = make_fetch_page(found=5000)
+
+    def fake_get(url, params=None, **kwargs):
+        response = mock.Mock(status_code=200)
+        response.json.return_value = fetch_page(params["page"])
+        return response
+
+    with mock.patch("src.api.get_session") as get_session:
+        get_session.return_value.get.side_effect = fake_get
+        api = HHApi()
+        items = [item for page in api.iter_vacancies("python") for item in page]
+
+    assert len(items) == 2000
+    assert api.last_found == 5000
+
+
+def test_hh_load_vacancies():
+    fetch_page, _ = make_fetch_page(found=120)
+
+    def fake_get(url, headers=None, params=None, **kwargs):
+        response = mock.Mock(status_code=200)
+        response.json.return_value = fetch_page(params["page"])
+        return response
+
+    with mock.patch("src.api.get_session") as get_session:
+        get_session.return_value.get.side_effect = fake_get
+        parser = HH(file_worker=None)
+        parser.load_vacancies("python")
+
+    assert len(parser.vacancies) == 120
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,85 @@
+import pytest
+
+from src.api import iter_pages
+from src.utils import filter_vacancies, iter_stored_vacancies, top_vacancies
+from src.vacancy import Vacancy
+from src.worker import JSONWorker
+
+
+def make_item(index, salary_from):
+    return {
+        "name": f"Python Developer {index}",
+        "alternate_url": f"https://hh.ru/vacancy/{index}",
+        "salary": {"from": salary_from, "to": None},
+        "snippet": {"requirement": "", "responsibility": ""},
+        "area": {"name": "Москва"},
+    }
+
+
+def test_iter_pages_yields_first_page_before_fetching_others():
+    calls = []
+
+    def fetch_page(page):
+        calls.append(page)
+        return {"items": [], "found": 500, "pages": 5, "page": page}
+
+    pages = iter_pages(fetch_page)
+    first = next(pages)
+
+    assert first["page"] == 0
+    assert calls == [0]
+    assert [page["page"] for page in pages] == [1, 2, 3, 4]
+
+
+def test_iter_create_is_lazy():
+    consumed = []
+
+    def items():
+        for index in range(3):
+            consumed.append(index)
+            yield make_item(index, 1000)
+
+    vacancies = Vacancy.iter_create(items())
+    first = next(vacancies)
+
+    assert first.title == "Python Developer 0"
+    assert consumed == [0]
+
+
+def test_filter_vacancies_by_words_and_salary():
+    vacancies = [
+        Vacancy("Python Developer", "url1", 1000, 0, "", "", "Москва"),
+        Vacancy("Java Developer", "url2", 5000, 0, "", "", "Москва"),
+        Vacancy("Data Scientist", "url3", 3000, 0, "", "", "Москва"),
+    ]
+
+    selected = list(filter_vacancies(vacancies, ["python", "data"], 2000))
+
+    assert [vacancy.url for vacancy in selected] == ["url3"]
+
+
+def test_top_vacancies_matches_full_sort():
+    vacancies = list(Vacancy.iter_create(make_item(i, (i * 37) % 11 * 1000) for i in range(50)))
+
+    result = top_vacancies(iter(vacancies), 5)
+
+    assert result == sorted(vacancies)[:5]
+
+
+def test_stored_pages_stream_to_top_and_write_once(tmp_path, monkeypatch):
+    pages = [[make_item(page * 10 + i, (page * 10 + i) % 7 * 1000) for i in range(10)] for page in range(5)]
+    worker = JSONWorker("vacancies.json", str(tmp_path))
+    flushes = []
+    original = JSONWorker._flush
+    monkeypatch.setattr(JSONWorker, "_flush", lambda self: flushes.append(1) or original(self))
+
+    with worker.transaction():
+        result = top_vacancies(filter_vacancies(iter_stored_vacancies(iter(pages), worker), ["python"], 3000), 3)
+
+    assert [vacancy.salary_from for vacancy in result] == [6000, 6000, 6000]
+    assert len(flushes) == 1
+    assert len(JSONWorker("vacancies.json", str(tmp_path), reset=False).return_list_vacancies()) == 50
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,61 @@
+import time
+
+import pytest
+
+from src.profiling import Histogram, instrumented, metrics, timer
+
+
+@pytest.fixture
+def enabled_metrics():
+    metrics.reset()
+    metrics.enabled = True
+    yield metrics
+    metrics.enabled = False
+    metrics.reset()
+
+
+def test_disabled_metrics_record_nothing():
+    metrics.reset()
+
+    @instrumented("stage")
+    def work():
+        return 42
+
+    with timer("block"):
+        assert work() == 42
+    metrics.count("counter")
+
+    assert metrics.timers == {}
+    assert metrics.counters == {}
+
+
+def test_instrumented_records_calls(enabled_metrics):
+    @instrumented()
+    def sleep_a_bit():
+        time.sleep(0.002)
+
+    for _ in range(3):
+        sleep_a_bit()
+    enabled_metrics.count("pages", 2)
+
+    histogram = enabled_metrics.timers[sleep_a_bit.__qualname__]
+    assert histogram.count == 3
+    assert histogram.total >= 0.006
+    assert enabled_metrics.counters == {"pages": 2}
+    assert sleep_a_bit.__qualname__ in enabled_metrics.report()
+
+
+def test_histogram_percentiles():
+    histogram = Histogram()
+    for _ in range(95):
+        histogram.add(0.001)
+    for _ in range(5):
+        histogram.add(0.5)
+
+    assert histogram.percentile(0.5) < 0.002
+    assert histogram.percentile(0.99) == 0.5
+    assert histogram.maximum == 0.5
+
+
+if __name__ == "__main__":
+    pytest.main()
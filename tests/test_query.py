@@ -0,0 +1,86 @@
+import random
+
+import pytest
+
+from src.binary_worker import BinaryWorker
+from src.jsonl_worker import JSONLWorker
+from src.sqlite_worker import SQLiteWorker
+from src.topn import external_sorted, top_records
+from src.vacancy import Vacancy
+from src.worker import JSONWorker
+
+
+def make_vacancies():
+    cities = ["Москва", "Казань"]
+    titles = ["Python Developer", "Java Developer", "Data Scientist"]
+    return [Vacancy(titles[i % 3], f"https://hh.ru/vacancy/{i}", (i * 7919) % 100 * 1000, 0, "", "",
+                    cities[i % 2]) for i in range(60)]
+
+
+def test_external_sorted_matches_sorted():
+    records = [{"salary_from": random.randint(0, 50), "n": n} for n in range(1000)]
+
+    result = list(external_sorted(iter(records), chunk_size=64))
+
+    assert result == sorted(records, key=lambda record: record["salary_from"], reverse=True)
+
+
+def test_top_records_falls_back_to_external_merge():
+    records = [{"salary_from": n % 97, "n": n} for n in range(500)]
+    expected = sorted(records, key=lambda record: record["salary_from"], reverse=True)[:200]
+
+    assert list(top_records(iter(records), 200, chunk_size=50)) == expected
+    assert list(top_records(iter(records), 10, chunk_size=50)) == expected[:10]
+
+
+@pytest.mark.parametrize("worker_class", [JSONWorker, JSONLWorker, SQLiteWorker])
+def test_query_pushdown(tmp_path, worker_class):
+    worker = worker_class("vacancies.store", data_path=str(tmp_path))
+    vacancies = make_vacancies()
+    worker.add_vacancies(vacancies)
+    expected = sorted((vacancy for vacancy in vacancies
+                       if vacancy.city == "Москва" and vacancy.salary_from >= 30000
+                       and ("python" in vacancy.title.lower() or "data" in vacancy.title.lower())),
+                      key=lambda vacancy: vacancy.salary_from, reverse=True)
+
+    result = worker.query(["Python", "data"], min_salary=30000, city="Москва", limit=5)
+
+    assert [vacancy.salary_from for vacancy in result] == [vacancy.salary_from for vacancy in expected[:5]]
+    assert all(vacancy.city == "Москва" for vacancy in result)
+    assert len(worker.query(["python", "data"], min_salary=30000, city="Москва")) == len(expected)
+
+
+@pytest.mark.parametrize("worker_class", [JSONWorker, JSONLWorker, SQLiteWorker, BinaryWorker])
+def test_query_and_select_by_salary_compare_roubles(tmp_path, worker_class):
+    worker = worker_class("vacancies.store", data_path=str(tmp_path))
+    worker.add_vacancies([
+        Vacancy("Python Developer", "https://hh.ru/vacancy/1", 150000, 0, "", "", "Москва"),
+        Vacancy("Python Developer", "https://hh.ru/vacancy/2", 2000, 0, "", "", "Москва", "USD"),
+        Vacancy("Python Developer", "https://hh.ru/vacancy/3", 50000, 0, "", "", "Москва"),
+        Vacancy("Python Developer", "https://hh.ru/vacancy/4", 0, 0, "", "", "Москва"),
+    ])
+
+    assert [vacancy.url[-1] for vacancy in worker.query(["python"], min_salary=100000)] == ["2", "1"]
+    assert [vacancy.url[-1] for vacancy in worker.query(["python"], min_salary=0)] == ["2", "1", "3", "4"]
+    if hasattr(worker, "select_by_salary"):
+        assert [vacancy.url[-1] for vacancy in worker.select_by_salary(100000)] == ["1", "2"]
+        assert [vacancy.url[-1] for vacancy in worker.select_by_salary(0, 160000)] == ["3", "1"]
+
+
+@pytest.mark.parametrize("worker_class", [JSONWorker, JSONLWorker, SQLiteWorker, BinaryWorker])
+def test_query_matches_requirements_and_responsibility(tmp_path, worker_class):
+    worker = worker_class("vacancies.store", data_path=str(tmp_path))
+    worker.add_vacancies([
+        Vacancy("Backend Developer", "https://hh.ru/vacancy/1", 1000, 0, "Опыт с Django", "", "Москва"),
+        Vacancy("Аналитик", "https://hh.ru/vacancy/2", 2000, 0, "", "Отчеты на PYTHON", "Москва"),
+        Vacancy("Java Developer", "https://hh.ru/vacancy/3", 3000, 0, "Spring", "", "Москва"),
+    ])
+
+    assert [vacancy.url[-1] for vacancy in worker.query(["django", "python"])] == ["2", "1"]
+    if worker_class is not SQLiteWorker:
+        # SQLite ищет по полнотекстовому индексу, остальные - подстроку текста для поиска
+        assert [vacancy.url[-1] for vacancy in worker.select_vacancy("django")] == ["1"]
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,119 @@
+import time
+
+import pytest
+
+from src.binary_worker import BinaryWorker
+from src.cache import QueryCache
+from src.jsonl_worker import JSONLWorker
+from src.sqlite_worker import SQLiteWorker
+from src.worker import JSONWorker
+from tests.conftest import make_vacancy
+
+
+def test_query_cache_lru_and_generations():
+    cache = QueryCache(max_entries=2)
+    cache.put("a", 1, [1])
+    cache.put("b", 1, [2])
+    assert cache.get("a", 1) == [1]
+    cache.put("c", 1, [3])
+
+    assert cache.get("b", 1) is None
+    assert cache.get("a", 2) is None
+    assert cache.get("c", 1) == [3]
+    assert len(cache) == 1
+    assert cache.stats() == {"hits": 2, "misses": 2, "hit_rate": 0.5, "entries": 1}
+
+
+def open_store(kind, tmp_path, reset):
+    if kind == "json":
+        return JSONWorker("vacancies.json", data_path=str(tmp_path), reset=reset)
+    if kind == "jsonl":
+        return JSONLWorker(data_path=str(tmp_path), reset=reset)
+    if kind == "sqlite":
+        return SQLiteWorker(data_path=str(tmp_path), reset=reset)
+    return BinaryWorker(data_path=str(tmp_path), reset=reset)
+
+
+@pytest.fixture(params=["json", "jsonl", "sqlite", "binary"])
+def worker(request, tmp_path):
+    return open_store(request.param, tmp_path, reset=True)
+
+
+def test_repeated_query_is_served_from_cache(worker, monkeypatch):
+    worker.add_vacancies([make_vacancy(1, 100), make_vacancy(2, 300), make_vacancy(3, 200, title="Java Developer")])
+    calls = []
+    original = worker._query
+    monkeypatch.setattr(worker, "_query", lambda *args: calls.append(args) or original(*args))
+
+    first = worker.query(["Python", "data"], 50, None, 10)
+    second = worker.query(["DATA ", "python", "python"], 50, None, 10)
+
+    assert [vacancy.url for vacancy in first] == ["https://hh.ru/vacancy/2", "https://hh.ru/vacancy/1"]
+    assert [vacancy.url for vacancy in second] == [vacancy.url for vacancy in first]
+    assert calls == [(["data", "python"], 50, None, 10)]
+    assert worker.query_cache.stats()["hit_rate"] == 0.5
+
+    second.clear()
+    assert len(worker.query(["python", "data"], 50, None, 10)) == 2
+
+
+def test_equivalent_conditions_share_cache_entry(worker, monkeypatch):
+    worker.add_vacancies([make_vacancy(1, 100), make_vacancy(2, 300)])
+    calls = []
+    original = worker._query
+    monkeypatch.setattr(worker, "_query", lambda *args: calls.append(args) or original(*args))
+
+    assert len(worker.query(["python"], 0, "Москва")) == 2
+    assert len(worker.query(["python"], None, " москва ")) == 2
+    assert worker.query(["python"], None, "Казань") == []
+
+    assert calls == [(["python"], None, "москва", None), (["python"], None, "казань", None)]
+
+
+def test_cached_vacancies_are_copies(worker):
+    worker.add_vacancies([make_vacancy(1, 100)])
+
+    worker.query(["python"])[0].title = "Изменено"
+
+    assert worker.query(["python"])[0].title == "Python Developer"
+    assert worker.query_cache.stats()["hits"] == 1
+
+
+def test_changes_invalidate_cached_results(worker):
+    worker.add_vacancies([make_vacancy(1, 100)])
+    assert len(worker.query(["python"])) == 1
+
+    worker.add_vacancies([make_vacancy(2, 200)])
+    assert [vacancy.salary_from for vacancy in worker.query(["python"])] == [200, 100]
+
+    worker.del_vacancy(make_vacancy(2, 200))
+    assert [vacancy.salary_from for vacancy in worker.query(["python"])] == [100]
+    assert worker.query_cache.stats()["hits"] == 0
+
+
+def test_json_worker_sees_changes_from_another_process(tmp_path):
+    worker = JSONWorker("vacancies.json", data_path=str(tmp_path))
+    worker.add_vacancies([make_vacancy(1, 100)])
+    assert len(worker.query()) == 1
+
+    other = JSONWorker("vacancies.json", data_path=str(tmp_path), reset=False)
+    time.sleep(0.01)
+    other.add_vacancies([make_vacancy(2, 200)])
+
+    assert len(worker.query()) == 2
+
+
+@pytest.mark.parametrize("kind", ["json", "jsonl", "sqlite", "binary"])
+def test_cache_is_invalidated_by_writes_through_another_object(tmp_path, kind):
+    worker = open_store(kind, tmp_path, reset=True)
+    worker.add_vacancies([make_vacancy(1, 100), make_vacancy(2, 200)])
+    assert len(worker.query(["python"])) == 2
+
+    other = open_store(kind, tmp_path, reset=False)
+    time.sleep(0.01)
+    other.add_vacancies([make_vacancy(3, 300)])
+    assert [vacancy.salary_from for vacancy in worker.query(["python"])] == [300, 200, 100]
+
+    time.sleep(0.01)
+    other.del_vacancy(make_vacancy(3, 300))
+    assert [vacancy.salary_from for vacancy in worker.query(["python"])] == [200, 100]
@@ -0,0 +1,135 @@
+import random
+
+import pytest
+
+from src import worker as worker_module
+from src.salary_index import SalaryIndex, normalize_salary
+from src.vacancy import Vacancy
+from src.worker import JSONWorker
+from tests.conftest import make_vacancy
+
+
+def test_normalize_salary():
+    assert normalize_salary(0) is None
+    assert normalize_salary(None, "USD") is None
+    assert normalize_salary(1000, None) == 1000
+    assert normalize_salary(1000, "USD", {"USD": 90.0}) == 90000
+
+
+def brute_force(salaries, low, high):
+    result = set()
+    for key, (salary_from, salary_to) in salaries.items():
+        bounds = [value for value in (salary_from, salary_to) if value]
+        if bounds and (high is None or min(bounds) <= high) and (low is None or max(bounds) >= low):
+            result.add(key)
+    return result
+
+
+def test_overlaps_and_from_range_match_brute_force():
+    rng = random.Random(7)
+    index = SalaryIndex()
+    salaries = {}
+    for step in range(2000):
+        key = f"url{rng.randrange(300)}"
+        if rng.random() < 0.2:
+            index.remove(key)
+            salaries.pop(key, None)
+            continue
+        salary_from = rng.choice([0, rng.randrange(10, 300) * 1000])
+        salary_to = rng.choice([0, (salary_from or 10000) + rng.randrange(0, 200) * 1000])
+        index.add(key, salary_from, salary_to)
+        salaries[key] = (salary_from, salary_to)
+
+    for low, high in [(100000, 150000), (None, 50000), (250000, None), (None, None), (0, 10000)]:
+        assert set(index.overlaps(low, high)) == brute_force(salaries, low, high)
+        expected = {key for key, (salary_from, _) in salaries.items()
+                    if salary_from and (low is None or salary_from >= low) and (high is None or salary_from <= high)}
+        found = index.from_range(low, high)
+        assert set(found) == expected
+        assert [index.ranges[key][0] for key in found] == sorted(index.ranges[key][0] for key in found)
+
+
+def test_salary_index_rebuild_matches_incremental_adds():
+    items = [(f"k{i}", (i * 37) % 11 * 10000, (i * 53) % 7 * 20000, "USD" if i % 5 == 0 else "RUR")
+             for i in range(200)]
+    incremental = SalaryIndex()
+    for item in items:
+        incremental.add(*item)
+    rebuilt = SalaryIndex()
+
+    rebuilt.rebuild(items)
+
+    assert rebuilt.ranges == incremental.ranges
+    assert rebuilt.from_range(50000, 150000) == incremental.from_range(50000, 150000)
+    assert rebuilt.overlaps(100000, 120000) == incremental.overlaps(100000, 120000)
+
+
+def test_currency_is_normalized():
+    index = SalaryIndex({"RUR": 1.0, "USD": 100.0})
+    index.add("rub", 150000, 0, "RUR")
+    index.add("usd", 2000, 3000, "USD")
+    index.add("none", 0, 0, "USD")
+
+    assert index.from_range(160000) == ["usd"]
+    assert index.overlaps(250000, 400000) == ["usd"]
+    assert "none" not in index
+
+
+def test_json_worker_keeps_index_up_to_date(tmp_path):
+    worker = JSONWorker("vacancies.json", data_path=str(tmp_path))
+    worker.add_vacancies([make_vacancy(1, 100000, 150000), make_vacancy(2, 0, 90000),
+                          make_vacancy(3, 2000, 0, "USD"), make_vacancy(4, 0, 0)])
+
+    assert [vacancy.url[-1] for vacancy in worker.select_by_salary(100000)] == ["1", "3"]
+    assert [vacancy.url[-1] for vacancy in worker.select_salary_overlap(80000, 120000)] == ["2", "1"]
+    assert worker.select_by_salary(100000)[1].currency == "USD"
+
+    worker.upsert_vacancies([make_vacancy(1, 50000)])
+    worker.del_vacancy(make_vacancy(3, 0))
+    assert [vacancy.url[-1] for vacancy in worker.select_by_salary(60000)] == []
+
+    with pytest.raises(RuntimeError):
+        with worker.transaction():
+            worker.delete_many(["https://hh.ru/vacancy/1"])
+            raise RuntimeError
+    assert [vacancy.url[-1] for vacancy in JSONWorker("vacancies.json", str(tmp_path), reset=False)
+            .select_salary_overlap(40000)] == ["1", "2"]
+    assert [vacancy.url[-1] for vacancy in worker.select_salary_overlap(40000)] == ["1", "2"]
+
+
+def test_json_worker_query_takes_salary_candidates_from_index(tmp_path, monkeypatch):
+    vacancies = [make_vacancy(number, number * 1000, 0, "USD" if number % 7 == 0 else "RUR") for number in range(200)]
+    worker = JSONWorker("vacancies.json", data_path=str(tmp_path))
+    worker.add_vacancies(vacancies)
+    roubles = {vacancy.url: normalize_salary(vacancy.salary_from, vacancy.currency) or 0 for vacancy in vacancies}
+    selected = {url for url, salary in roubles.items() if salary >= 150000}
+    expected = sorted(selected, key=roubles.get, reverse=True)[:10]
+    checked = []
+    original = worker_module.record_matches
+
+    def spy(record, *args):
+        checked.append(record["url"])
+        return original(record, *args)
+
+    monkeypatch.setattr(worker_module, "record_matches", spy)
+
+    assert [vacancy.url for vacancy in worker.query(None, 150000, None, 10)] == expected
+    # Остальные условия проверяются только у кандидатов из индекса зарплат
+    assert set(checked) == selected
+
+    monkeypatch.setattr("src.worker.INDEX_SCAN_LIMIT", 0)
+    reopened = JSONWorker("vacancies.json", data_path=str(tmp_path), reset=False)
+    assert [vacancy.url for vacancy in reopened.query(["python"], 150000, None, 10)] == expected
+
+
+def test_vacancy_currency_round_trip():
+    vacancy = Vacancy.create_vacancies([{
+        "name": "Go Developer", "alternate_url": "https://hh.ru/vacancy/1",
+        "salary": {"from": 3000, "to": None, "currency": "USD"},
+        "snippet": {"requirement": "", "responsibility": ""}, "area": {"name": "Алматы"},
+    }])[0]
+
+    assert vacancy.currency == "USD"
+    assert Vacancy.from_dict(vacancy.to_dict()).currency == "USD"
+    assert Vacancy.from_dict({key: value for key, value in vacancy.to_dict().items()
+                              if key != "currency"}).currency == "RUR"
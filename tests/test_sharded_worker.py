@@ -0,0 +1,148 @@
+import os
+
+import pytest
+
+from src.sharded_worker import ShardedWorker
+from src.vacancy import Vacancy
+from src.worker import JSONWorker
+
+
+def make_vacancies():
+    cities = ["Москва", "Казань", "Томск"]
+    titles = ["Python Developer", "Java Developer", "Data Scientist"]
+    return [Vacancy(titles[i % 3], f"https://hh.ru/vacancy/{i}", (i * 7919) % 100 * 1000, 0, "", "",
+                    cities[i % 3 if i % 4 else 0]) for i in range(90)]
+
+
+@pytest.fixture(params=[1, 2], ids=["serial", "pool"])
+def stores(request, tmp_path):
+    vacancies = make_vacancies()
+    reference = JSONWorker("vacancies.json", str(tmp_path))
+    reference.add_vacancies(vacancies)
+    sharded = ShardedWorker(data_path=str(tmp_path), max_workers=request.param)
+    sharded.add_vacancies(vacancies)
+    yield reference, sharded
+    sharded.close()
+
+
+def urls(vacancies):
+    return [vacancy.url for vacancy in vacancies]
+
+
+def test_city_partition_creates_shard_per_city(stores):
+    _, sharded = stores
+
+    assert len(sharded.shard_paths()) == 3
+    assert sorted(urls(sharded.return_list_vacancies())) == sorted(urls(make_vacancies()))
+
+
+def test_parallel_scans_match_single_file(stores):
+    reference, sharded = stores
+
+    assert sorted(urls(sharded.select_vacancy("python"))) == sorted(urls(reference.select_vacancy("python")))
+    assert urls(sharded.select_by_salary(50000, 80000)) == urls(reference.select_by_salary(50000, 80000))
+    assert urls(sharded.query(["python", "data"], 30000, None, 10)) == \
+        urls(reference.query(["python", "data"], 30000, None, 10))
+
+
+def test_query_with_city_reads_only_its_shard(stores, monkeypatch):
+    reference, sharded = stores
+    scanned = []
+    original = ShardedWorker._scan
+
+    def spy(self, func, paths, *args):
+        scanned.append(paths)
+        return original(self, func, paths, *args)
+
+    monkeypatch.setattr(ShardedWorker, "_scan", spy)
+
+    result = sharded.query(None, None, "Казань", None)
+
+    assert scanned == [[os.path.join(sharded.dir_path, ShardedWorker.city_shard_name("Казань"))]]
+    assert urls(result) == urls(reference.query(None, None, "Казань", None))
+    assert urls(sharded.query(None, None, " казань", None)) == urls(result)
+    assert sharded.query(None, None, "Омск", None) == []
+
+
+def test_hash_partition_spreads_records(tmp_path):
+    vacancies = make_vacancies()
+    reference = JSONWorker("vacancies.json", str(tmp_path))
+    reference.add_vacancies(vacancies)
+    with ShardedWorker(data_path=str(tmp_path), partition="hash", shards=4, max_workers=2) as sharded:
+        sharded.add_vacancies(vacancies)
+
+        assert len(sharded.shard_paths()) == 4
+        assert sorted(urls(sharded.return_list_vacancies())) == sorted(urls(vacancies))
+        assert urls(sharded.query(None, None, "Томск", 5)) == urls(reference.query(None, None, "Томск", 5))
+
+
+def test_add_delete_and_upsert_moving_city(tmp_path):
+    sharded = ShardedWorker(data_path=str(tmp_path), max_workers=1)
+    vacancy = Vacancy("Python Developer", "https://hh.ru/vacancy/1", 100000, 0, "", "", "Москва")
+
+    assert sharded.add_vacancies([vacancy, vacancy]) == 1
+    moved = Vacancy("Python Developer", "https://hh.ru/vacancy/1", 120000, 0, "", "", "Казань")
+    assert sharded.upsert_vacancies([moved]) == {"inserted": 0, "updated": 1, "skipped": 0}
+    assert [(item.city, item.salary_from) for item in sharded.return_list_vacancies()] == [("Казань", 120000)]
+
+    sharded.del_vacancy(moved)
+    assert sharded.return_list_vacancies() == []
+    assert sharded.delete_many(["https://hh.ru/vacancy/1"]) == 0
+
+
+def test_moved_vacancy_is_found_by_url(tmp_path, monkeypatch):
+    ShardedWorker(data_path=str(tmp_path), max_workers=1).add_vacancies(make_vacancies())
+    sharded = ShardedWorker(data_path=str(tmp_path), reset=False, max_workers=1)
+    deleted_from = []
+    original = JSONWorker.delete_many
+
+    def spy(self, urls):
+        urls = list(urls)
+        deleted_from.append((os.path.basename(self.file_path), urls))
+        return original(self, urls)
+
+    monkeypatch.setattr(JSONWorker, "delete_many", spy)
+    moved = Vacancy("Python Developer", "https://hh.ru/vacancy/1", 1000, 0, "", "", "Омск")
+
+    assert sharded.add_vacancies([moved]) == 1
+    assert sharded.upsert_vacancies([moved]) == {"inserted": 0, "updated": 1, "skipped": 0}
+    assert deleted_from == [(ShardedWorker.city_shard_name("Казань"), ["https://hh.ru/vacancy/1"])]
+
+    # Объект с прежним городом удаляет вакансию из части ее нового города
+    sharded.del_vacancy(Vacancy("", "https://hh.ru/vacancy/1", 0, 0, "", "", "Казань"))
+    assert "https://hh.ru/vacancy/1" not in urls(sharded.return_list_vacancies())
+    assert deleted_from[-1] == (ShardedWorker.city_shard_name("Омск"), ["https://hh.ru/vacancy/1"])
+    assert len(sharded.return_list_vacancies()) == 89
+
+
+def test_url_map_follows_other_writers(tmp_path):
+    sharded = ShardedWorker(data_path=str(tmp_path), max_workers=1)
+    sharded.add_vacancies(make_vacancies()[:10])
+    assert sharded.delete_many(["https://hh.ru/vacancy/0"]) == 1
+
+    other = ShardedWorker(data_path=str(tmp_path), reset=False, max_workers=1)
+    other.upsert_vacancies([Vacancy("Python Developer", "https://hh.ru/vacancy/1", 1000, 0, "", "", "Омск")])
+
+    assert sharded.delete_many(["https://hh.ru/vacancy/1"]) == 1
+    assert len(other.return_list_vacancies()) == 8
+
+
+def test_query_cache_sees_changes_and_reopen(tmp_path):
+    sharded = ShardedWorker(data_path=str(tmp_path), max_workers=1)
+    sharded.add_vacancies(make_vacancies()[:10])
+    first = sharded.query(["python"])
+
+    sharded.add_vacancies([Vacancy("Python Lead", "https://hh.ru/vacancy/999", 1, 0, "", "", "Москва")])
+
+    assert len(sharded.query(["python"])) == len(first) + 1
+    reopened = ShardedWorker(data_path=str(tmp_path), reset=False, max_workers=1)
+    assert len(reopened.return_list_vacancies()) == 11
+
+
+def test_unknown_partition_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        ShardedWorker(data_path=str(tmp_path), partition="region")
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,64 @@
+import pytest
+
+from src.sqlite_worker import SQLiteWorker
+from src.vacancy import Vacancy
+
+
+@pytest.fixture
+def worker(tmp_path):
+    worker = SQLiteWorker(data_path=str(tmp_path))
+    worker.add_vacancies([
+        Vacancy("Python Developer", "https://hh.ru/vacancy/1", 150000, 200000, "Опыт с Django",
+                "Разработка веб-приложений", "Москва"),
+        Vacancy("Java Developer", "https://hh.ru/vacancy/2", 180000, 0, "Spring", "Разработка сервисов", "Казань"),
+        Vacancy("Data Scientist", "https://hh.ru/vacancy/3", 0, 0, "Python, pandas", "Анализ данных", "Москва"),
+    ])
+    yield worker
+    worker.close()
+
+
+def test_journal_mode_is_wal(worker):
+    assert worker.connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_select_vacancy_by_title(worker):
+    assert [vacancy.url for vacancy in worker.select_vacancy("python")] == ["https://hh.ru/vacancy/1"]
+    assert len(worker.select_vacancy("develop")) == 2
+
+
+def test_search_all_text_fields_with_filters(worker):
+    assert {vacancy.url for vacancy in worker.search("python")} == {"https://hh.ru/vacancy/1",
+                                                                   "https://hh.ru/vacancy/3"}
+    assert [vacancy.url for vacancy in worker.search("python", city="Москва", min_salary=1)] == [
+        "https://hh.ru/vacancy/1"]
+    assert [vacancy.salary_from for vacancy in worker.search(limit=2)] == [180000, 150000]
+
+
+def test_select_by_salary_uses_index(worker):
+    plan = worker.connection.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM vacancies WHERE salary_from >= 100000").fetchall()
+
+    assert "idx_vacancies_salary_from" in " ".join(str(row) for row in plan)
+    assert [vacancy.salary_from for vacancy in worker.select_by_salary(100000)] == [150000, 180000]
+
+
+def test_del_vacancy_updates_fts(worker):
+    worker.del_vacancy(Vacancy("Python Developer", "https://hh.ru/vacancy/1", 0, 0, "", "", ""))
+
+    assert worker.count() == 2
+    assert worker.select_vacancy("python") == []
+    assert [vacancy.url for vacancy in worker.search("django")] == []
+
+
+def test_add_vacancies_skips_known_urls(worker):
+    duplicate = Vacancy("Python Developer", "https://hh.ru/vacancy/1", 1, 0, "", "", "Москва")
+    new = Vacancy("Go Developer", "https://hh.ru/vacancy/4", 0, 0, "", "", "Москва")
+
+    assert worker.add_vacancies([duplicate, new, new]) == 2
+    assert worker.count() == 4
+    assert worker.select_by_salary(150000)[0].salary_from == 150000
+    assert [vacancy.url for vacancy in worker.select_vacancy("go")] == ["https://hh.ru/vacancy/4"]
+
+
+if __name__ == "__main__":
+    pytest.main()
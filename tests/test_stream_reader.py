@@ -0,0 +1,69 @@
+import json
+
+import pytest
+
+from src.stream_reader import iter_json_array
+from src.vacancy import Vacancy
+from src.worker import JSONWorker
+
+
+def write_json(path, data, indent=None):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=indent)
+    return str(path)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 64, 65536])
+@pytest.mark.parametrize("indent", [None, 4])
+def test_iter_json_array_matches_json_load(tmp_path, chunk_size, indent):
+    data = [{"title": "Разработчик [Python], {senior}", "salary": {"from": 100000, "to": None}},
+            12345, -1.5e3, "строка, с ]", True, None, [1, [2, 3]], {}]
+    path = write_json(tmp_path / "data.json", data, indent)
+
+    assert list(iter_json_array(path, chunk_size)) == data
+
+
+def test_iter_json_array_empty(tmp_path):
+    assert list(iter_json_array(write_json(tmp_path / "data.json", []), 2)) == []
+
+
+def test_iter_json_array_truncated_file(tmp_path):
+    path = tmp_path / "data.json"
+    path.write_text('[{"a": 1}, {"b": ', encoding="utf-8")
+
+    with pytest.raises(ValueError):
+        list(iter_json_array(str(path), 4))
+
+
+def test_iter_json_array_not_an_array(tmp_path):
+    with pytest.raises(ValueError):
+        list(iter_json_array(write_json(tmp_path / "data.json", {"a": 1})))
+
+
+@pytest.fixture
+def worker(tmp_path):
+    worker = JSONWorker("vacancies.json", data_path=str(tmp_path))
+    worker.add_vacancies([Vacancy(title, f"https://hh.ru/vacancy/{number}", 1000 * number, 0, "", "", "Москва")
+                          for number, title in enumerate(["Python Developer", "Java Developer", "python junior"])])
+    return worker
+
+
+def test_iter_vacancies(worker):
+    assert [vacancy.url for vacancy in worker.iter_vacancies()] == [f"https://hh.ru/vacancy/{i}" for i in range(3)]
+
+
+def test_iter_select(worker):
+    assert [vacancy.salary_from for vacancy in worker.iter_select("PYTHON")] == [0, 2000]
+
+
+def test_iter_select_stops_early(worker):
+    vacancies = worker.iter_select("developer")
+
+    assert next(vacancies).title == "Python Developer"
+    vacancies.close()
+
+
+def test_iter_vacancies_sees_pending_transaction(worker):
+    with worker.transaction():
+        worker.delete_many(["https://hh.ru/vacancy/0"])
+        assert [vacancy.title for vacancy in worker.iter_select("python")] == ["python junior"]
@@ -0,0 +1,124 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.sync import SyncState, sync_query
+from src.worker import JSONWorker
+
+NOW = datetime(2024, 5, 10, 12, 0, tzinfo=timezone.utc)
+
+
+def make_item(number, salary_from=1000):
+    return {
+        "id": str(number),
+        "name": f"Python Developer {number}",
+        "alternate_url": f"https://hh.ru/vacancy/{number}",
+        "salary": {"from": salary_from, "to": None},
+        "snippet": {"requirement": "", "responsibility": ""},
+        "area": {"name": "Москва"},
+    }
+
+
+class FakeApi:
+    def __init__(self):
+        self.items = []
+        self.calls = []
+        self.found = None
+        self.last_found = None
+
+    def iter_vacancies(self, keyword, extra_params=None):
+        self.calls.append(extra_params)
+        self.last_found = len(self.items) if self.found is None else self.found
+        yield list(self.items)
+
+
+@pytest.fixture
+def env(tmp_path):
+    return FakeApi(), JSONWorker("vacancies.json", data_path=str(tmp_path)), SyncState(str(tmp_path / "state.json"))
+
+
+def urls(store):
+    return sorted(vacancy.url for vacancy in store.return_list_vacancies())
+
+
+def test_first_sync_is_full_then_delta(env):
+    api, store, state = env
+    api.items = [make_item(1), make_item(2)]
+
+    first = sync_query("python", api, store, state, now=NOW)
+    api.items = [make_item(3), make_item(2, salary_from=5000)]
+    second = sync_query("python", api, store, state, now=NOW + timedelta(days=1))
+
+    assert first["mode"] == "full" and first["inserted"] == 2
+    assert api.calls[0] is None
+    assert api.calls[1] == {"date_from": "2024-05-10T11:50:00+0000"}
+    assert (second["mode"], second["inserted"], second["updated"], second["expired"]) == ("delta", 1, 1, 0)
+    assert urls(store) == ["https://hh.ru/vacancy/1", "https://hh.ru/vacancy/2", "https://hh.ru/vacancy/3"]
+
+
+def test_wiped_store_forces_full_sync(env, tmp_path):
+    api, store, state = env
+    api.items = [make_item(1), make_item(2)]
+    sync_query("python", api, store, state, now=NOW)
+
+    # Диалоговый режим открывает общее хранилище с очисткой
+    wiped = JSONWorker("vacancies.json", data_path=str(tmp_path))
+    stats = sync_query("python", api, wiped, state, now=NOW + timedelta(days=1))
+
+    assert (stats["mode"], stats["missing"], stats["inserted"]) == ("full", 2, 2)
+    assert api.calls[1] is None
+    assert urls(wiped) == ["https://hh.ru/vacancy/1", "https://hh.ru/vacancy/2"]
+    assert sync_query("python", api, wiped, state, now=NOW + timedelta(days=2))["mode"] == "delta"
+
+
+def test_full_sync_expires_missing_vacancies(env):
+    api, store, state = env
+    api.items = [make_item(1), make_item(2)]
+    sync_query("python", api, store, state, now=NOW)
+
+    api.items = [make_item(2)]
+    stats = sync_query("python", api, store, state, now=NOW + timedelta(days=8))
+
+    assert stats["mode"] == "full"
+    assert stats["expired"] == 1
+    assert urls(store) == ["https://hh.ru/vacancy/2"]
+
+
+def test_truncated_full_sync_expires_only_by_age(env):
+    api, store, state = env
+    api.items = [make_item(1), make_item(2)]
+    sync_query("python", api, store, state, now=NOW)
+
+    # Найдено больше, чем hh.ru отдает: вакансия 1 не попала в выдачу, но может быть жива
+    api.items, api.found = [make_item(2)], 5000
+    stats = sync_query("python", api, store, state, now=NOW + timedelta(days=8))
+
+    assert (stats["mode"], stats["truncated"], stats["expired"]) == ("full", True, 0)
+    assert urls(store) == ["https://hh.ru/vacancy/1", "https://hh.ru/vacancy/2"]
+    stats = sync_query("python", api, store, state, now=NOW + timedelta(days=31))
+    assert (stats["mode"], stats["expired"]) == ("full", 1)
+    assert urls(store) == ["https://hh.ru/vacancy/2"]
+
+
+def test_delta_sync_expires_old_vacancies_not_seen_by_other_queries(env):
+    api, store, state = env
+    api.items = [make_item(1), make_item(2)]
+    sync_query("python", api, store, state, now=NOW)
+    sync_query("django", api, store, state, now=NOW)
+    api.items = [make_item(1)]
+    sync_query("django", api, store, state, now=NOW + timedelta(days=7))
+
+    api.items = []
+    stats = sync_query("python", api, store, state, now=NOW + timedelta(days=5, hours=12), max_age=timedelta(days=5))
+
+    assert stats["mode"] == "delta"
+    # вакансия 1 еще есть в выдаче запроса django, поэтому удаляется только вакансия 2
+    assert stats["expired"] == 1
+    assert urls(store) == ["https://hh.ru/vacancy/1"]
+    reloaded = SyncState(state.file_path)
+    assert set(reloaded.get("python")["seen"]) == set()
+    assert set(reloaded.get("django")["seen"]) == {"https://hh.ru/vacancy/1"}
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,64 @@
+import pytest
+
+from src import vacancy_batch
+from src.vacancy import Vacancy
+from src.vacancy_batch import VacancyBatch
+
+
+@pytest.fixture(params=["numpy", "pure"])
+def batch(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(vacancy_batch, "numpy", None)
+    return VacancyBatch.from_vacancies([
+        Vacancy("Python Developer", "url1", 150000, 200000, "Django", "Backend", "Москва"),
+        Vacancy("Java Developer", "url2", 90000, 0, "Spring", "Services", "Казань"),
+        Vacancy("Data Scientist", "url3", 0, 0, "", "Analysis", "Москва"),
+        Vacancy("Go Developer", "url4", 250000, 0, "", "", "Москва"),
+    ])
+
+
+def test_vacancy_has_no_dict():
+    vacancy = Vacancy("Python Developer", "url1", 1, 2, "", "", "Москва")
+
+    assert not hasattr(vacancy, "__dict__")
+
+
+def test_cities_are_interned(batch):
+    assert batch.cities == ["Москва", "Казань"]
+    assert list(batch.city_codes) == [0, 1, 0, 0]
+
+
+def test_masks_and_positions(batch):
+    salary = batch.salary_mask(min_salary=100000)
+    city = batch.city_mask("Москва")
+
+    assert batch.positions(salary) == [0, 3]
+    assert batch.positions(batch.combine(salary, city)) == [0, 3]
+    assert batch.positions(batch.salary_mask(min_salary=50000, max_salary=200000)) == [0, 1]
+    assert batch.positions(batch.city_mask("Сочи")) == []
+
+
+def test_argsort_and_take(batch):
+    positions = batch.argsort(batch.positions(batch.city_mask("Москва")))
+
+    assert [vacancy.url for vacancy in batch.take(positions)] == ["url4", "url1", "url3"]
+    assert batch[1].city == "Казань"
+
+
+
+def test_currency_round_trip_and_rouble_masks(batch):
+    usd = Vacancy("Rust Developer", "url5", 1000, 2000, "<highlighttext>Rust</highlighttext>", "", "Алматы", "USD")
+    batch.append(usd)
+
+    assert batch[4].to_dict() == usd.to_dict()
+    assert batch[4].currency == "USD"
+    assert batch.currencies == ["RUR", "USD"]
+    # 1000 USD - 90000 рублей
+    assert batch.positions(batch.salary_mask(min_salary=50000, max_salary=100000)) == [1, 4]
+    assert [batch.urls[position] for position in batch.argsort()] == ["url4", "url1", "url2", "url5", "url3"]
+
+
+if __name__ == "__main__":
+    pytest.main()